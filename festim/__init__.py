@@ -27,8 +27,17 @@ from .helpers import (
     as_constant,
     as_expression,
     as_constant_or_expression,
+    is_time_dependent,
+    freeze_expressions,
+    canonical_ccode,
+    parameter_as_constant,
+    set_parameter,
 )
 
+from .spec import Specifiable, ComponentSpec, ModelSpec
+
+from .nonlinear_solver import create_nonlinear_solver, FieldSplitNewtonSolver
+
 from .meshing.mesh import Mesh
 from .meshing.mesh_1d import Mesh1D
 from .meshing.mesh_from_refinements import MeshFromRefinements
@@ -58,6 +67,7 @@ from .boundary_conditions.fluxes.flux_custom import CustomFlux
 from .boundary_conditions.fluxes.mass_flux import MassFlux
 from .boundary_conditions.fluxes.surface_kinetics import SurfaceKinetics
 
+from .exports.projector import Projector
 from .exports.exports import Exports
 from .exports.export import Export
 from .exports.xdmf_export import XDMFExport
@@ -86,6 +96,7 @@ from .exports.derived_quantities.average_surface import AverageSurface
 from .exports.derived_quantities.point_value import PointValue
 from .exports.derived_quantities.adsorbed_hydrogen import AdsorbedHydrogen
 
+from .exports.derived_quantities.column_store import ColumnStore
 from .exports.derived_quantities.derived_quantities import DerivedQuantities
 
 from .exports.txt_export import TXTExport, TXTExports
@@ -113,6 +124,9 @@ from .concentration.traps.extrinsic_trap import ExtrinsicTrapBase
 from .concentration.traps.extrinsic_trap import ExtrinsicTrap
 from .concentration.traps.neutron_induced_trap import NeutronInducedTrap
 
+from .operator_splitting import OperatorSplittingSolver
 from .h_transport_problem import HTransportProblem
 
 from .generic_simulation import Simulation
+from .sweep import SweepResults, sweep_samples, run_sample, run_sweep
+from .cache import ResultCache
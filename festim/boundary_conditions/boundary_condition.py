@@ -1,4 +1,7 @@
-class BoundaryCondition:
+from festim import Specifiable
+
+
+class BoundaryCondition(Specifiable):
     """Base BoundaryCondition class
 
     Args:
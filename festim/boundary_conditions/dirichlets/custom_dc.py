@@ -1,7 +1,13 @@
-from festim import DirichletBC, BoundaryConditionExpression
+from festim import DirichletBC, BoundaryConditionExpression, as_expression
 import fenics as f
 import sympy as sp
 
+try:
+    from ufl.log import UFLException
+except ImportError:
+    # recent versions of UFL raise ValueError
+    UFLException = ValueError
+
 
 class CustomDirichlet(DirichletBC):
     """
@@ -33,18 +39,50 @@ class CustomDirichlet(DirichletBC):
         self.convert_prms()
 
     def create_expression(self, T):
-        value_BC = BoundaryConditionExpression(
-            T,
-            self.function,
-            **self.prms,
-        )
-        self.expression = value_BC
+        value = self.symbolic_function()
+        if value is None:
+            # the function cannot be compiled, it is evaluated in Python
+            self.expression = BoundaryConditionExpression(
+                T,
+                self.function,
+                **self.prms,
+            )
+        else:
+            self.create_expression_of_T(value, T, **self.prms)
         self.sub_expressions = self.prms.values()
 
+    def symbolic_function(self):
+        """Evaluates the custom function with sympy symbols, so that it can
+        be compiled. This is only possible if the function is made of
+        arithmetic operations and sympy-compatible functions.
+
+        Returns:
+            sympy.Expr: the value of the function, None if the function
+                cannot be evaluated with sympy symbols
+        """
+        T_symbol = sp.Symbol("T")
+        prms_symbols = {key: sp.Symbol(key) for key in self.prms.keys()}
+        try:
+            value = sp.sympify(self.function(T_symbol, **prms_symbols))
+            if not value.free_symbols <= {T_symbol, *prms_symbols.values()}:
+                return None
+            # checks that the value can be compiled
+            sp.printing.ccode(value)
+        except (
+            TypeError,
+            ValueError,
+            AttributeError,
+            sp.SympifyError,
+            UFLException,
+        ):
+            # eg. fenics or numpy functions, or conditions on the arguments
+            return None
+        return value
+
     def convert_prms(self):
         """Creates Expressions or Constant for all parameters"""
         for key, value in self.prms.items():
             if isinstance(value, (int, float)):
                 self.prms[key] = f.Constant(value)
             else:
-                self.prms[key] = f.Expression(sp.printing.ccode(value), t=0, degree=1)
+                self.prms[key] = as_expression(value, degree=1)
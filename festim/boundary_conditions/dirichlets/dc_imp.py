@@ -1,4 +1,4 @@
-from festim import DirichletBC, BoundaryConditionExpression, k_B
+from festim import DirichletBC, k_B, as_expression
 import fenics as f
 import sympy as sp
 
@@ -69,27 +69,29 @@ class ImplantationDirichlet(DirichletBC):
         self.P = P
 
     def create_expression(self, T):
-        phi = f.Expression(sp.printing.ccode(self.phi), t=0, degree=1)
-        R_p = f.Expression(sp.printing.ccode(self.R_p), t=0, degree=1)
+        phi = as_expression(self.phi, degree=1)
+        R_p = as_expression(self.R_p, degree=1)
         sub_expressions = [phi, R_p]
         if self.P is not None:
-            P = f.Expression(sp.printing.ccode(self.P), t=0, degree=1)
+            P = as_expression(self.P, degree=1)
             sub_expressions.append(P)
         else:
             P = self.P
 
-        value_BC = BoundaryConditionExpression(
-            T,
-            dc_imp,
-            phi=phi,
-            R_p=R_p,
-            D_0=self.D_0,
-            E_D=self.E_D,
-            Kr_0=self.Kr_0,
-            E_Kr=self.E_Kr,
-            Kd_0=self.Kd_0,
-            E_Kd=self.E_Kd,
-            P=P,
-        )
-        self.expression = value_BC
+        # symbolic expression of dc_imp
+        symbols = sp.symbols("T phi R_p D_0 E_D Kr_0 E_Kr Kd_0 E_Kd P k_B")
+        T_, phi_, R_p_, D_0, E_D, Kr_0, E_Kr, Kd_0, E_Kd, P_, k_B_ = symbols
+        value = phi_ * R_p_ / (D_0 * sp.exp(-E_D / k_B_ / T_))
+        prms = {"phi": phi, "R_p": R_p, "D_0": self.D_0, "E_D": self.E_D}
+        if self.Kr_0 is not None:
+            Kr = Kr_0 * sp.exp(-E_Kr / k_B_ / T_)
+            prms.update({"Kr_0": self.Kr_0, "E_Kr": self.E_Kr})
+            if self.Kd_0 is not None:
+                Kd = Kd_0 * sp.exp(-E_Kd / k_B_ / T_)
+                prms.update({"Kd_0": self.Kd_0, "E_Kd": self.E_Kd, "P": P})
+                value += sp.sqrt((phi_ + Kd * P_) / Kr)
+            else:
+                value += sp.sqrt(phi_ / Kr)
+
+        self.create_expression_of_T(value, T, k_B=k_B, **prms)
         self.sub_expressions = sub_expressions
@@ -1,5 +1,6 @@
-from festim import BoundaryCondition, k_B
+from festim import BoundaryCondition, k_B, as_expression
 import fenics as f
+import numpy as np
 import sympy as sp
 
 
@@ -13,12 +14,22 @@ class DirichletBC(BoundaryCondition):
         field (int or str): the field the boundary condition is
             applied to. 0 and "solute" stand for the mobile
             concentration, "T" for temperature
+
+    Attributes:
+        expression (fenics.Expression): the value of the BC
+        boundary_values (fenics.Function): the values of the BC at the dofs
+            of its surfaces when they depend on the temperature or on the
+            solubility (see compute_values), else None and self.expression
+            is applied directly
     """
 
     def __init__(self, surfaces, value, field) -> None:
         super().__init__(surfaces, field=field)
         self.value = value
         self.dirichlet_bc = []
+        self.boundary_values = None
+        self._value_function = None
+        self._solubility = None
 
     def create_expression(self, T):
         """Assigns a value to self.expression
@@ -26,30 +37,47 @@ class DirichletBC(BoundaryCondition):
         Args:
             T (fenics.Function): temperature
         """
-        value_BC = sp.printing.ccode(self.value)
-        value_BC = f.Expression(value_BC, t=0, degree=4)
         # TODO : why degree 4?
+        value_BC = as_expression(self.value, degree=4)
 
         self.expression = value_BC
 
+    def create_expression_of_T(self, value, T, **prms):
+        """Creates self.expression, a compiled fenics.Expression of a function
+        of the temperature and of parameters. The values applied at the dofs
+        of the surfaces are computed from the same function once per time
+        step (see compute_values), so that the temperature is not evaluated
+        by locating each dof in the mesh when the BC is applied.
+
+        Args:
+            value (sympy.Expr): the value of the BC, function of the symbol T
+                and of symbols named after the parameters
+            T (fenics.Constant or fenics.Expression or fenics.Function): the
+                temperature
+            **prms (float, fenics.Constant or fenics.Expression): the
+                parameters
+        """
+        prms = {"T": T, **prms}
+        self.expression = f.Expression(sp.printing.ccode(value), t=0, degree=2, **prms)
+        symbols = [sp.Symbol(key) for key in prms]
+        self._value_function = (sp.lambdify(symbols, value, "numpy"), prms)
+
     def normalise_by_solubility(self, materials, volume_markers, T):
-        """Normalise self.expression by the solubility
+        """Normalise the BC by the solubility
         theta = c/S
 
+        The values are normalised at the dofs of the surfaces with the
+        material of the adjacent cells (see compute_values), self.expression
+        is the non normalised value c.
+
         Args:
             materials (festim.Materials): the materials
             volume_markers (fenics.MeshFunction): the volume markers
             T (fenics.Function): the temperature
         """
-        # TODO this requires changes for Henry's law
-
-        # Store the non modified BC to be updated
-        self.sub_expressions.append(self.expression)
-        # create modified BC based on solubility
-        expression_BC = BoundaryConditionTheta(
-            self.expression, materials, volume_markers, T
-        )
-        self.expression = expression_BC
+        if self._value_function is None:
+            self._value_function = (lambda c: c, {"c": self.expression})
+        self._solubility = (materials, volume_markers, T)
 
     def create_dirichletbc(
         self,
@@ -76,6 +104,9 @@ class DirichletBC(BoundaryCondition):
                 only needed when chemical_pot is True. Defaults to None.
         """
         self.dirichlet_bc = []
+        self.boundary_values = None
+        self._value_function = None
+        self._solubility = None
         self.create_expression(T)
         # TODO: this should be more generic
         mobile_fields = [0, "0", "solute"]
@@ -87,10 +118,114 @@ class DirichletBC(BoundaryCondition):
             funspace = V
         else:  # if only one field, use subspace
             funspace = V.sub(self.field)
+        value = self.expression
+        if self._value_function is not None:
+            if V.num_sub_spaces() == 0:
+                self.create_boundary_values(funspace, surface_markers)
+            else:
+                self.create_boundary_values(funspace.collapse(), surface_markers)
+            value = self.boundary_values
         for surface in self.surfaces:
-            bci = f.DirichletBC(funspace, self.expression, surface_markers, surface)
+            bci = f.DirichletBC(funspace, value, surface_markers, surface)
             self.dirichlet_bc.append(bci)
 
+    def create_boundary_values(self, V, surface_markers):
+        """Creates self.boundary_values, finds the dofs of the surfaces and,
+        with conservation of chemical potential, the material of the cell
+        adjacent to the facets of each dof. The values are then computed.
+
+        Args:
+            V (fenics.FunctionSpace): the (collapsed) function space of the
+                BC
+            surface_markers (fenics.MeshFunction): the surface markers
+        """
+        self.boundary_values = f.Function(V)
+        nb_owned = self.boundary_values.vector().local_size()
+
+        dofs = set()
+        for surface in self.surfaces:
+            bc = f.DirichletBC(V, f.Constant(0), surface_markers, surface)
+            dofs.update(bc.get_boundary_values().keys())
+        # ghost dofs are updated by their owner
+        self._dofs = np.array(sorted(dof for dof in dofs if dof < nb_owned), dtype=int)
+        self._dof_coordinates = V.tabulate_dof_coordinates()[self._dofs]
+
+        if self._solubility is not None:
+            materials, volume_markers, _ = self._solubility
+            mesh = volume_markers.mesh()
+            tdim = mesh.topology().dim()
+            mesh.init(tdim - 1, tdim)
+            facets = np.flatnonzero(np.isin(surface_markers.array(), self.surfaces))
+            material_index = {id(mat): i for i, mat in enumerate(materials)}
+            facets_of_material = {}
+            for facet in facets.tolist():
+                cell = f.Facet(mesh, facet).entities(tdim)[0]
+                material = materials.find_material_from_id(volume_markers[cell])
+                i = material_index[id(material)]
+                facets_of_material.setdefault(i, []).append(facet)
+            dof_materials = np.zeros(nb_owned, dtype=int)
+            for i, facets_i in facets_of_material.items():
+                dofs_i = np.array(
+                    V.dofmap().entity_closure_dofs(mesh, tdim - 1, facets_i),
+                    dtype=int,
+                )
+                dof_materials[dofs_i[dofs_i < nb_owned]] = i
+            self._dof_materials = dof_materials[self._dofs]
+
+        self.compute_values()
+
+    def evaluate_at_boundary(self, function):
+        """Evaluates a function at the dofs of the surfaces only. The values
+        of a function of the function space of the BC are read from its
+        vector, other functions and expressions are evaluated at the
+        coordinates of the dofs.
+
+        Args:
+            function (float, fenics.Constant, fenics.Expression or
+                fenics.Function): the function
+
+        Returns:
+            float or numpy.ndarray: the values
+        """
+        if isinstance(function, (int, float)):
+            return function
+        if isinstance(function, f.Constant):
+            return float(function)
+        V = self.boundary_values.function_space()
+        if isinstance(function, f.Function) and function.function_space() == V:
+            return function.vector()[self._dofs]
+        return np.array([function(x) for x in self._dof_coordinates], dtype=float)
+
+    def compute_values(self):
+        """Computes the values of the BC at the dofs of its surfaces from the
+        current temperature and parameters and assigns them to
+        self.boundary_values. Has to be called when the temperature or the
+        time change. Does nothing if self.expression is applied directly.
+        """
+        if self.boundary_values is None:
+            return
+        function, prms = self._value_function
+        values = function(*[self.evaluate_at_boundary(prm) for prm in prms.values()])
+        # the value is a float if all the parameters are constant
+        values = np.full(self._dofs.shape, values, dtype=float)
+        if self._solubility is not None:
+            materials, _, T = self._solubility
+            properties = np.array(
+                [
+                    (mat.S_0, mat.E_S, mat.solubility_law == "henry")
+                    for mat in materials
+                ],
+                dtype=float,
+            )[self._dof_materials]
+            S_0, E_S, henry = properties.T
+            S = S_0 * np.exp(-E_S / k_B / self.evaluate_at_boundary(T))
+            values = values / S
+            henry = henry > 0.5
+            values[henry] = np.sqrt(values[henry] + f.DOLFIN_EPS)
+
+        self.boundary_values.vector()[self._dofs] = values
+        self.boundary_values.vector().apply("insert")
+
 
 class BoundaryConditionTheta(f.UserExpression):
     """Creates an Expression for converting dirichlet bcs in the case
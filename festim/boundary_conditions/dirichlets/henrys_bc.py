@@ -1,4 +1,4 @@
-from festim import DirichletBC, BoundaryConditionExpression, k_B
+from festim import DirichletBC, k_B, as_expression
 import fenics as f
 import sympy as sp
 
@@ -25,13 +25,14 @@ class HenrysBC(DirichletBC):
         self.pressure = pressure
 
     def create_expression(self, T):
-        pressure = f.Expression(sp.printing.ccode(self.pressure), t=0, degree=1)
-        value_BC = BoundaryConditionExpression(
+        pressure = as_expression(self.pressure, degree=1)
+        T_, H_0, E_H, k_B_, pressure_ = sp.symbols("T H_0 E_H k_B pressure")
+        self.create_expression_of_T(
+            H_0 * sp.exp(-E_H / k_B_ / T_) * pressure_,
             T,
-            henrys_law,
             H_0=self.H_0,
             E_H=self.E_H,
+            k_B=k_B,
             pressure=pressure,
         )
-        self.expression = value_BC
         self.sub_expressions = [pressure]
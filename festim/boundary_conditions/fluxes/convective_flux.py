@@ -1,4 +1,4 @@
-from festim import FluxBC
+from festim import FluxBC, as_expression
 import fenics as f
 import sympy as sp
 
@@ -20,8 +20,8 @@ class ConvectiveFlux(FluxBC):
         super().__init__(surfaces=surfaces, field="T")
 
     def create_form(self, T, solute):
-        h_coeff = f.Expression(sp.printing.ccode(self.h_coeff), t=0, degree=1)
-        T_ext = f.Expression(sp.printing.ccode(self.T_ext), t=0, degree=1)
+        h_coeff = as_expression(self.h_coeff, degree=1)
+        T_ext = as_expression(self.T_ext, degree=1)
 
         self.form = -h_coeff * (T - T_ext)
         self.sub_expressions = [h_coeff, T_ext]
@@ -1,4 +1,4 @@
-from festim import FluxBC, k_B
+from festim import FluxBC, k_B, as_expression
 import fenics as f
 import sympy as sp
 
@@ -24,9 +24,9 @@ class DissociationFlux(FluxBC):
         super().__init__(surfaces=surfaces, field=0)
 
     def create_form(self, T, solute):
-        Kd_0_expr = f.Expression(sp.printing.ccode(self.Kd_0), t=0, degree=1)
-        E_Kd_expr = f.Expression(sp.printing.ccode(self.E_Kd), t=0, degree=1)
-        P_expr = f.Expression(sp.printing.ccode(self.P), t=0, degree=1)
+        Kd_0_expr = as_expression(self.Kd_0, degree=1)
+        E_Kd_expr = as_expression(self.E_Kd, degree=1)
+        P_expr = as_expression(self.P, degree=1)
 
         Kd = Kd_0_expr * f.exp(-E_Kd_expr / k_B / T)
         self.form = Kd * P_expr
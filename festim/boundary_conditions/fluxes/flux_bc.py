@@ -1,4 +1,4 @@
-from festim import BoundaryCondition
+from festim import BoundaryCondition, as_expression
 import sympy as sp
 import fenics as f
 
@@ -27,6 +27,5 @@ class FluxBC(BoundaryCondition):
             T (f.Function or f.Expression): Temperature
             solute (f.Function): mobile concentration of hydrogen
         """
-        form = sp.printing.ccode(self.value)
-        self.form = f.Expression(form, t=0, degree=2)
+        self.form = as_expression(self.value, degree=2)
         self.sub_expressions.append(self.form)
@@ -1,5 +1,4 @@
-from festim import FluxBC
-import sympy as sp
+from festim import FluxBC, as_expression
 import fenics as f
 
 
@@ -39,4 +38,4 @@ class CustomFlux(FluxBC):
             if isinstance(value, (int, float)):
                 self.prms[key] = f.Constant(value)
             else:
-                self.prms[key] = f.Expression(sp.printing.ccode(value), t=0, degree=1)
+                self.prms[key] = as_expression(value, degree=1)
@@ -1,4 +1,4 @@
-from festim import FluxBC, k_B
+from festim import FluxBC, k_B, as_expression
 import fenics as f
 import sympy as sp
 
@@ -24,8 +24,8 @@ class RecombinationFlux(FluxBC):
         super().__init__(surfaces=surfaces, field=0)
 
     def create_form(self, T, solute):
-        Kr_0_expr = f.Expression(sp.printing.ccode(self.Kr_0), t=0, degree=1)
-        E_Kr_expr = f.Expression(sp.printing.ccode(self.E_Kr), t=0, degree=1)
+        Kr_0_expr = as_expression(self.Kr_0, degree=1)
+        E_Kr_expr = as_expression(self.E_Kr, degree=1)
 
         Kr = Kr_0_expr * f.exp(-E_Kr_expr / k_B / T)
         self.form = -Kr * solute**self.order
@@ -1,6 +1,5 @@
-from festim import FluxBC
+from festim import FluxBC, as_expression
 from fenics import *
-import sympy as sp
 
 
 class SurfaceKinetics(FluxBC):
@@ -181,4 +180,4 @@ class SurfaceKinetics(FluxBC):
             if isinstance(value, (int, float)):
                 self.prms[key] = Constant(value)
             else:
-                self.prms[key] = Expression(sp.printing.ccode(value), t=0, degree=1)
+                self.prms[key] = as_expression(value, degree=1)
@@ -0,0 +1,252 @@
+import festim
+import fenics as f
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+
+
+class ResultCache:
+    """On-disk cache of the results of complete simulations.
+
+    The results are stored in a directory named after a digest of the
+    festim.ModelSpec of the simulation, the content of its input files
+    (XDMF meshes, temperatures, initial conditions) and the FESTIM version.
+    A simulation with the same digest is not solved again: the data of its
+    festim.DerivedQuantities and its exported files are restored instead.
+
+    When the cache is larger than max_size, the least recently used results
+    are removed.
+
+    Usage:
+        my_model.cache = festim.ResultCache("cache_folder", max_size=1e9)
+        my_model.initialise()
+        my_model.run()
+
+    Args:
+        directory (str): the folder where the results are stored
+        max_size (float, optional): the maximum size of the cache in bytes.
+            If None, the size is not limited. Defaults to None.
+
+    Attributes:
+        directory (str): the folder where the results are stored
+        max_size (float): the maximum size of the cache in bytes
+    """
+
+    results_filename = "results.pkl"
+
+    def __init__(self, directory, max_size=None) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, simulation):
+        """Computes the key of the results of a simulation
+
+        Args:
+            simulation (festim.Simulation): the simulation
+
+        Raises:
+            TypeError: if the simulation cannot be described by a
+                festim.ModelSpec
+
+        Returns:
+            str: the key
+        """
+        digest = hashlib.sha256()
+        digest.update(festim.__version__.encode())
+        digest.update(festim.ModelSpec.from_simulation(simulation).digest().encode())
+        for filename in input_files(simulation):
+            digest.update(filename.encode())
+            with open(filename, "rb") as file:
+                for block in iter(lambda: file.read(2**20), b""):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def entries(self):
+        """Returns the keys of the stored results, the least recently used
+        first
+
+        Returns:
+            list of str: the keys
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for key in os.listdir(self.directory):
+            if key.startswith("."):
+                # results being written
+                continue
+            results = os.path.join(self.directory, key, self.results_filename)
+            if os.path.isfile(results):
+                entries.append((os.path.getmtime(results), key))
+        return [key for _, key in sorted(entries)]
+
+    def entry_size(self, key):
+        """Returns the size of the stored results in bytes
+
+        Args:
+            key (str): the key of the results
+
+        Returns:
+            int: the size in bytes
+        """
+        size = 0
+        for folder, _, filenames in os.walk(os.path.join(self.directory, key)):
+            for filename in filenames:
+                size += os.path.getsize(os.path.join(folder, filename))
+        return size
+
+    def size(self):
+        """Returns the size of the cache in bytes
+
+        Returns:
+            int: the size in bytes
+        """
+        return sum(self.entry_size(key) for key in self.entries())
+
+    def load(self, key, simulation):
+        """Restores the stored results of a simulation: the data of its
+        festim.DerivedQuantities, its exported files and its final time
+
+        Args:
+            key (str): the key of the results
+            simulation (festim.Simulation): the simulation
+
+        Returns:
+            bool: True if the results were found, else False
+        """
+        folder = os.path.join(self.directory, key)
+        results_file = os.path.join(folder, self.results_filename)
+        try:
+            with open(results_file, "rb") as file:
+                results = pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False
+
+        if f.MPI.comm_world.rank == 0:
+            for i, filename in enumerate(results["files"]):
+                dirname = os.path.dirname(filename)
+                if dirname:
+                    os.makedirs(dirname, exist_ok=True)
+                shutil.copyfile(os.path.join(folder, "files", str(i)), filename)
+            # mark the results as recently used
+            os.utime(results_file)
+
+        for i, export in enumerate(simulation.exports):
+            if i in results["derived_quantities"]:
+                export.data = results["derived_quantities"][i]
+        simulation.t = results["t"]
+        return True
+
+    def store(self, key, simulation):
+        """Stores the results of a simulation that has been run and removes
+        the least recently used results if the cache is too large
+
+        Args:
+            key (str): the key of the results
+            simulation (festim.Simulation): the simulation
+        """
+        if f.MPI.comm_world.rank != 0:
+            return
+        results = {"t": simulation.t, "derived_quantities": {}, "files": []}
+        for i, export in enumerate(simulation.exports):
+            if isinstance(export, festim.DerivedQuantities):
+                results["derived_quantities"][i] = export.data
+        files = [
+            filename
+            for filename in output_files(simulation)
+            if os.path.isfile(filename)
+        ]
+
+        os.makedirs(self.directory, exist_ok=True)
+        # write in a temporary folder so that incomplete results are never read
+        folder = tempfile.mkdtemp(dir=self.directory, prefix=".tmp")
+        os.makedirs(os.path.join(folder, "files"))
+        for i, filename in enumerate(files):
+            shutil.copyfile(filename, os.path.join(folder, "files", str(i)))
+            results["files"].append(filename)
+        with open(os.path.join(folder, self.results_filename), "wb") as file:
+            pickle.dump(results, file)
+        try:
+            os.rename(folder, os.path.join(self.directory, key))
+        except OSError:
+            # already stored by another process
+            shutil.rmtree(folder, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used results until the size of the
+        cache is below max_size"""
+        if self.max_size is None:
+            return
+        entries = self.entries()
+        sizes = {key: self.entry_size(key) for key in entries}
+        size = sum(sizes.values())
+        for key in entries:
+            if size <= self.max_size:
+                break
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            size -= sizes[key]
+
+    def clear(self):
+        """Removes all the stored results"""
+        for key in self.entries():
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+
+
+def input_files(simulation):
+    """Returns the files a simulation reads (XDMF meshes, temperatures and
+    initial conditions)
+
+    Args:
+        simulation (festim.Simulation): the simulation
+
+    Returns:
+        list of str: the filenames
+    """
+    filenames = []
+    if isinstance(simulation.mesh, festim.MeshFromXDMF):
+        filenames += [simulation.mesh.volume_file, simulation.mesh.boundary_file]
+    if isinstance(simulation.T, festim.TemperatureFromXDMF):
+        filenames.append(simulation.T.filename)
+    initial_conditions = list(simulation.initial_conditions or [])
+    if isinstance(simulation.T, festim.HeatTransferProblem):
+        if simulation.T.initial_condition is not None:
+            initial_conditions.append(simulation.T.initial_condition)
+    for initial_condition in initial_conditions:
+        if isinstance(initial_condition.value, str):
+            filenames.append(initial_condition.value)
+    # the data of XDMF files is in HDF5 files
+    for filename in list(filenames):
+        if filename.endswith(".xdmf"):
+            h5_filename = filename[: -len(".xdmf")] + ".h5"
+            if os.path.isfile(h5_filename):
+                filenames.append(h5_filename)
+    return filenames
+
+
+def output_files(simulation):
+    """Returns the files written by the exports of a simulation
+
+    Args:
+        simulation (festim.Simulation): the simulation
+
+    Returns:
+        list of str: the filenames
+    """
+    filenames = []
+    for export in simulation.exports:
+        if isinstance(export, festim.DerivedQuantities):
+            if export.filename is not None:
+                filenames.append(export.filename)
+        elif isinstance(export, festim.XDMFExport):
+            if export.folder is None:
+                filename = export.filename
+            else:
+                filename = "{}/{}".format(export.folder, export.filename)
+            filenames += [filename, filename[: -len(".xdmf")] + ".h5"]
+        elif isinstance(export, festim.TXTExport):
+            filenames.append(export.filename)
+    return filenames
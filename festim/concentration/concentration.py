@@ -1,5 +1,5 @@
 from fenics import *
-import sympy as sp
+from festim import as_expression
 
 
 class Concentration:
@@ -13,12 +13,17 @@ class Concentration:
         previous_solution (fenics.Function or ufl.Indexed): Solution for
             "previous" timestep
         test_function (fenics.TestFunction or ufl.Indexed): test function
+
+    Attributes:
+        older_solution (fenics.Function or ufl.Indexed): Solution two
+            timesteps before, only needed for multistep time schemes
     """
 
     def __init__(self, solution=None, previous_solution=None, test_function=None):
         self.solution = solution
         self.previous_solution = previous_solution
         self.test_function = test_function
+        self.older_solution = None
         self.sub_expressions = []
         self.F = None
         self.post_processing_solution = None  # used for post treatment
@@ -46,6 +51,5 @@ class Concentration:
             with XDMFFile(value) as f:
                 f.read_checkpoint(comp, label, time_step)
         else:
-            value = sp.printing.ccode(value)
-            comp = Expression(value, degree=3, t=0)
+            comp = as_expression(value, degree=3)
         return comp
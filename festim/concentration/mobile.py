@@ -1,4 +1,11 @@
-from festim import Concentration, FluxBC, k_B, RadioactiveDecay, SurfaceKinetics
+from festim import (
+    Concentration,
+    FluxBC,
+    k_B,
+    RadioactiveDecay,
+    SurfaceKinetics,
+    parameter_as_constant,
+)
 from fenics import *
 
 
@@ -21,7 +28,9 @@ class Mobile(Concentration):
         self.sources = []
         self.boundary_conditions = []
 
-    def create_form(self, materials, mesh, T, dt=None, traps=None, soret=False):
+    def create_form(
+        self, materials, mesh, T, dt=None, traps=None, soret=False, dx_trapping=None
+    ):
         """Creates the variational formulation.
 
         Args:
@@ -34,14 +43,24 @@ class Mobile(Concentration):
                 potential is assumed. Defaults to False.
             soret (bool, optional): If True, Soret effect is assumed. Defaults
                 to False.
+            dx_trapping (fenics.Measure, optional): the measure used for the
+                trapping terms. If None, mesh.dx is used. Defaults to None.
         """
         self.F = 0
-        self.create_diffusion_form(materials, mesh, T, dt=dt, traps=traps, soret=soret)
+        self.create_diffusion_form(
+            materials,
+            mesh,
+            T,
+            dt=dt,
+            traps=traps,
+            soret=soret,
+            dx_trapping=dx_trapping,
+        )
         self.create_source_form(mesh.dx)
         self.create_fluxes_form(T, mesh.ds, dt)
 
     def create_diffusion_form(
-        self, materials, mesh, T, dt=None, traps=None, soret=False
+        self, materials, mesh, T, dt=None, traps=None, soret=False, dx_trapping=None
     ):
         """Creates the variational formulation for the diffusive part.
 
@@ -55,12 +74,16 @@ class Mobile(Concentration):
                 potential is assumed. Defaults to False.
             soret (bool, optional): If True, Soret effect is assumed. Defaults
                 to False.
+            dx_trapping (fenics.Measure, optional): the measure used for the
+                trapping terms. If None, mesh.dx is used. Defaults to None.
         """
+        if dx_trapping is None:
+            dx_trapping = mesh.dx
 
         F = 0
         for material in materials:
-            D_0 = material.D_0
-            E_D = material.E_D
+            D_0 = parameter_as_constant(material, "D_0")
+            E_D = parameter_as_constant(material, "E_D")
             c_0, c_0_n = self.get_concentration_for_a_given_material(material, T)
 
             subdomains = material.id  # list of subdomains with this material
@@ -72,7 +95,11 @@ class Mobile(Concentration):
                 dx = mesh.dx(subdomain)
                 # transient form
                 if dt is not None:
-                    F += ((c_0 - c_0_n) / dt.value) * self.test_function * dx
+                    F += (
+                        dt.time_derivative(c_0, c_0_n, self.older_solution)
+                        * self.test_function
+                        * dx
+                    )
                 D = D_0 * exp(-E_D / k_B / T.T)
                 if mesh.type == "cartesian":
                     F += dot(D * grad(c_0), grad(self.test_function)) * dx
@@ -80,6 +107,8 @@ class Mobile(Concentration):
                         Q = material.Q
                         if callable(Q):
                             Q = Q(T.T)
+                        else:
+                            Q = parameter_as_constant(material, "Q")
                         F += (
                             dot(
                                 D * Q * c_0 / (k_B * T.T**2) * grad(T.T),
@@ -97,6 +126,8 @@ class Mobile(Concentration):
                         Q = material.Q
                         if callable(Q):
                             Q = Q(T.T)
+                        else:
+                            Q = parameter_as_constant(material, "Q")
                         F += (
                             r
                             * dot(
@@ -120,6 +151,8 @@ class Mobile(Concentration):
                         Q = material.Q
                         if callable(Q):
                             Q = Q(T.T)
+                        else:
+                            Q = parameter_as_constant(material, "Q")
                         F += (
                             D
                             * r
@@ -155,14 +188,14 @@ class Mobile(Concentration):
                         * c_m
                         * (density - trap.solution)
                         * self.test_function
-                        * dx(mat.id)
+                        * dx_trapping(mat.id)
                     )
                     F_trapping += (
                         p_0
                         * exp(-E_p / k_B / T.T)
                         * trap.solution
                         * self.test_function
-                        * dx(mat.id)
+                        * dx_trapping(mat.id)
                     )
         F += -F_trapping
 
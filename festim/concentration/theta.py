@@ -1,4 +1,4 @@
-from festim import Mobile, k_B
+from festim import Mobile, k_B, parameter_as_constant
 import fenics as f
 
 
@@ -12,6 +12,7 @@ class Theta(Mobile):
         super().__init__()
         self.S = None
         self.F = None
+        self._post_processing_solver = None
 
     def initialise(self, V, value, label=None, time_step=None):
         """Assign a value to self.previous_solution
@@ -31,7 +32,9 @@ class Theta(Mobile):
         dx = f.Measure("dx", subdomain_data=self.volume_markers)
         F = 0
         for mat in self.materials:
-            S = mat.S_0 * f.exp(-mat.E_S / k_B / self.T.T)
+            S_0 = parameter_as_constant(mat, "S_0")
+            E_S = parameter_as_constant(mat, "E_S")
+            S = S_0 * f.exp(-E_S / k_B / self.T.T)
             F += -prev_sol * v * dx(mat.id)
             if mat.solubility_law == "sievert":
                 F += comp / S * v * dx(mat.id)
@@ -54,8 +57,8 @@ class Theta(Mobile):
             fenics.Product, fenics.Product: the current concentration and
                 previous concentration
         """
-        E_S = material.E_S
-        S_0 = material.S_0
+        E_S = parameter_as_constant(material, "E_S")
+        S_0 = parameter_as_constant(material, "S_0")
         S = S_0 * f.exp(-E_S / k_B / T.T)
         S_n = S_0 * f.exp(-E_S / k_B / T.T_n)
         if material.solubility_law == "sievert":
@@ -85,17 +88,19 @@ class Theta(Mobile):
         """Converts the post_processing_solution from theta to mobile
         concentration.
         c = theta * S.
-        The attribute post_processing_solution is fenics.Product (if self.S is
-        festim.ArheniusCoeff)
+        The attribute post_processing_solution is projected from the UFL
+        product of theta and the solubility
         """
-        problem = f.LinearVariationalProblem(
-            a=f.lhs(self.form_post_processing),
-            L=f.rhs(self.form_post_processing),
-            u=self.post_processing_solution,
-            bcs=[],
-        )
-        solver = f.LinearVariationalSolver(problem)
-        solver.solve()
+        # the solver is created once and reused at each time step
+        if self._post_processing_solver is None:
+            problem = f.LinearVariationalProblem(
+                a=f.lhs(self.form_post_processing),
+                L=f.rhs(self.form_post_processing),
+                u=self.post_processing_solution,
+                bcs=[],
+            )
+            self._post_processing_solver = f.LinearVariationalSolver(problem)
+        self._post_processing_solver.solve()
 
     def create_form_post_processing(self, V, materials, dx):
         """Creates a variational formulation for c = theta * S or theta**2 * S
@@ -120,3 +125,4 @@ class Theta(Mobile):
 
         self.form_post_processing = F
         self.post_processing_solution = f.Function(V)
+        self._post_processing_solver = None
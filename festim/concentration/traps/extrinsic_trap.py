@@ -1,5 +1,5 @@
-from festim import Trap, as_constant_or_expression
-from fenics import NewtonSolver, MPI
+from festim import Trap, as_constant_or_expression, create_nonlinear_solver
+from fenics import NewtonSolver, PETScSNESSolver
 
 
 class ExtrinsicTrapBase(Trap):
@@ -16,6 +16,10 @@ class ExtrinsicTrapBase(Trap):
         maximum_iterations=30,
         linear_solver=None,
         preconditioner="default",
+        nonlinear_solver="newton",
+        line_search="bt",
+        inexact_newton=False,
+        snes_options=None,
         **kwargs,
     ):
         """Inits ExtrinsicTrap
@@ -41,6 +45,16 @@ class ExtrinsicTrapBase(Trap):
             preconditioner (str, optional): preconditioning method for the newton solver,
                 options can be viewed by print(list_krylov_solver_preconditioners()).
                 Defaults to "default".
+            nonlinear_solver (str, optional): the nonlinear solver. "newton" for
+                fenics.NewtonSolver or "snes" for a PETSc SNES solver with line
+                search (fenics.PETScSNESSolver). Defaults to "newton".
+            line_search (str, optional): line search method of the SNES solver
+                ("basic", "bt", "cp", "l2", "nleqerr"). Defaults to "bt".
+            inexact_newton (bool, optional): if True, Eisenstat-Walker forcing
+                terms are used for the Krylov solves of the SNES solver.
+                Defaults to False.
+            snes_options (dict, optional): additional PETSc options passed to the
+                SNES solver, without the leading "-". Defaults to None.
         """
         super().__init__(k_0, E_k, p_0, E_p, materials, density=None, id=id)
         self.absolute_tolerance = absolute_tolerance
@@ -48,12 +62,18 @@ class ExtrinsicTrapBase(Trap):
         self.maximum_iterations = maximum_iterations
         self.linear_solver = linear_solver
         self.preconditioner = preconditioner
+        self.nonlinear_solver = nonlinear_solver
+        self.line_search = line_search
+        self.inexact_newton = inexact_newton
+        self.snes_options = snes_options
 
         self.newton_solver = None
         for name, val in kwargs.items():
             setattr(self, name, as_constant_or_expression(val))
         self.density_previous_solution = None
+        self.density_older_solution = None
         self.density_test_function = None
+        self.density_problem = None
 
     @property
     def newton_solver(self):
@@ -63,22 +83,31 @@ class ExtrinsicTrapBase(Trap):
     def newton_solver(self, value):
         if value is None:
             self._newton_solver = value
-        elif isinstance(value, NewtonSolver):
+        elif isinstance(value, (NewtonSolver, PETScSNESSolver)):
             if self._newton_solver:
                 print("Settings for the Newton solver will be overwritten")
             self._newton_solver = value
         else:
-            raise TypeError("accepted type for newton_solver is fenics.NewtonSolver")
+            raise TypeError(
+                "accepted type for newton_solver is fenics.NewtonSolver or fenics.PETScSNESSolver"
+            )
 
     def define_newton_solver(self):
-        """Creates the Newton solver and sets its parameters"""
-        self.newton_solver = NewtonSolver(MPI.comm_world)
-        self.newton_solver.parameters["error_on_nonconvergence"] = True
-        self.newton_solver.parameters["absolute_tolerance"] = self.absolute_tolerance
-        self.newton_solver.parameters["relative_tolerance"] = self.relative_tolerance
-        self.newton_solver.parameters["maximum_iterations"] = self.maximum_iterations
-        self.newton_solver.parameters["linear_solver"] = self.linear_solver
-        self.newton_solver.parameters["preconditioner"] = self.preconditioner
+        """Creates the Newton solver (or the SNES solver if
+        self.nonlinear_solver is "snes") and sets its parameters"""
+        self.newton_solver = create_nonlinear_solver(
+            nonlinear_solver=self.nonlinear_solver,
+            absolute_tolerance=self.absolute_tolerance,
+            relative_tolerance=self.relative_tolerance,
+            maximum_iterations=self.maximum_iterations,
+            linear_solver=self.linear_solver,
+            preconditioner=self.preconditioner,
+            error_on_nonconvergence=True,
+            line_search=self.line_search,
+            inexact_newton=self.inexact_newton,
+            snes_options=self.snes_options,
+            options_prefix="trap_{}_".format(self.id),
+        )
 
 
 class ExtrinsicTrap(ExtrinsicTrapBase):
@@ -145,7 +174,9 @@ class ExtrinsicTrap(ExtrinsicTrapBase):
         """
         density = self.density[0]
         F = (
-            ((density - self.density_previous_solution) / dt.value)
+            dt.time_derivative(
+                density, self.density_previous_solution, self.density_older_solution
+            )
             * self.density_test_function
             * dx
         )
@@ -72,7 +72,9 @@ class NeutronInducedTrap(ExtrinsicTrapBase):
         T = T.T
 
         F = (
-            ((density - self.density_previous_solution) / dt.value)
+            dt.time_derivative(
+                density, self.density_previous_solution, self.density_older_solution
+            )
             * self.density_test_function
             * dx
         )
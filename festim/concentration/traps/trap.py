@@ -1,9 +1,18 @@
-from festim import Concentration, k_B, Material, Theta, RadioactiveDecay
+from festim import (
+    Concentration,
+    k_B,
+    Material,
+    Theta,
+    RadioactiveDecay,
+    as_expression,
+    parameter_as_constant,
+    Specifiable,
+)
 from fenics import *
 import sympy as sp
 
 
-class Trap(Concentration):
+class Trap(Specifiable, Concentration):
     """
     Args:
         k_0 (float, list): trapping pre-exponential factor (m3 s-1)
@@ -91,19 +100,12 @@ class Trap(Concentration):
         for i, density in enumerate(densities):
             if density is not None:
                 # if density is already a fenics Expression, use it as is
-                if isinstance(density, (Expression, UserExpression)):
-                    self.density.append(density)
                 # else assume it's a sympy expression
-                else:
-                    density_expr = sp.printing.ccode(density)
-                    self.density.append(
-                        Expression(
-                            density_expr,
-                            degree=2,
-                            t=0,
-                            name="density_{}_{}".format(self.id, i),
-                        )
+                self.density.append(
+                    as_expression(
+                        density, degree=2, name="density_{}_{}".format(self.id, i)
                     )
+                )
 
     def create_form(self, mobile, materials, T, dx, dt=None):
         """Creates the general form associated with the trap
@@ -145,7 +147,11 @@ class Trap(Concentration):
 
         if dt is not None:
             # d(c_t)/dt in trapping equation
-            F_trapping += ((solution - prev_solution) / dt.value) * test_function * dx
+            F_trapping += (
+                dt.time_derivative(solution, prev_solution, self.older_solution)
+                * test_function
+                * dx
+            )
         else:
             # if the sim is steady state and
             # if a trap is not defined in one subdomain
@@ -156,17 +162,15 @@ class Trap(Concentration):
 
         for i, mat in enumerate(self.materials):
             if type(self.k_0) is list:
-                k_0 = self.k_0[i]
-                E_k = self.E_k[i]
-                p_0 = self.p_0[i]
-                E_p = self.E_p[i]
+                index = i
                 density = self.density[i]
             else:
-                k_0 = self.k_0
-                E_k = self.E_k
-                p_0 = self.p_0
-                E_p = self.E_p
+                index = None
                 density = self.density[0]
+            k_0 = parameter_as_constant(self, "k_0", index)
+            E_k = parameter_as_constant(self, "E_k", index)
+            p_0 = parameter_as_constant(self, "p_0", index)
+            E_p = parameter_as_constant(self, "E_p", index)
 
             # add the density to the list of
             # expressions to be updated
@@ -3,7 +3,7 @@ import fenics as f
 import warnings
 
 
-class Traps(list):
+class Traps(festim.Specifiable, list):
     """
     A list of festim.Trap objects
     """
@@ -91,6 +91,7 @@ class Traps(list):
                 trap.density = [f.Function(V)]
                 trap.density_test_function = f.TestFunction(V)
                 trap.density_previous_solution = f.project(f.Constant(0), V)
+                trap.density_older_solution = f.project(f.Constant(0), V)
 
     def define_variational_problem_extrinsic_traps(self, dx, dt, T):
         """
@@ -117,9 +118,12 @@ class Traps(list):
     def solve_extrinsic_traps(self):
         for trap in self:
             if isinstance(trap, festim.ExtrinsicTrapBase):
-                du_t = f.TrialFunction(trap.density[0].function_space())
-                J_t = f.derivative(trap.form_density, trap.density[0], du_t)
-                problem = festim.Problem(J_t, trap.form_density, [])
+                problem = trap.density_problem
+                if problem is None or problem.residual_form is not trap.form_density:
+                    du_t = f.TrialFunction(trap.density[0].function_space())
+                    J_t = f.derivative(trap.form_density, trap.density[0], du_t)
+                    problem = festim.Problem(J_t, trap.form_density, [])
+                    trap.density_problem = problem
 
                 f.begin(
                     "Solving nonlinear variational problem."
@@ -130,4 +134,5 @@ class Traps(list):
     def update_extrinsic_traps_density(self):
         for trap in self:
             if isinstance(trap, festim.ExtrinsicTrapBase):
+                trap.density_older_solution.assign(trap.density_previous_solution)
                 trap.density_previous_solution.assign(trap.density[0])
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class ColumnStore:
+    """Growable table of floats stored by columns in a preallocated numpy
+    array. The columns are returned as views (no copy).
+
+    Args:
+        titles (list of str): the titles of the columns
+        capacity (int, optional): the number of rows allocated. Doubled
+            when full. Defaults to 64.
+
+    Attributes:
+        titles (list of str): the titles of the columns
+        nb_rows (int): the number of rows
+    """
+
+    def __init__(self, titles, capacity=64) -> None:
+        self.titles = list(titles)
+        self.nb_rows = 0
+        self._array = np.empty((len(self.titles), max(capacity, 1)))
+
+    def __len__(self):
+        return self.nb_rows
+
+    @property
+    def capacity(self):
+        return self._array.shape[1]
+
+    def append(self, row):
+        """Adds a row
+
+        Args:
+            row (list): the values of each column
+        """
+        if len(row) != len(self.titles):
+            raise ValueError(
+                "expected {} values, got {}".format(len(self.titles), len(row))
+            )
+        if self.nb_rows == self.capacity:
+            array = np.empty((len(self.titles), 2 * self.capacity))
+            array[:, : self.nb_rows] = self._array
+            self._array = array
+        self._array[:, self.nb_rows] = row
+        self.nb_rows += 1
+
+    def column(self, index):
+        """Returns a column
+
+        Args:
+            index (int): the index of the column
+
+        Returns:
+            numpy.ndarray: a view of the column. It is not updated when
+                rows are added.
+        """
+        return self._array[index, : self.nb_rows]
+
+    def rows(self, start=0):
+        """Returns the rows from start
+
+        Args:
+            start (int, optional): the index of the first row. Defaults to 0.
+
+        Returns:
+            numpy.ndarray: a view of the rows, of shape
+                (nb_rows - start, nb_columns)
+        """
+        return self._array[:, start : self.nb_rows].T
+
+    def clear(self):
+        """Removes all the rows (the memory is kept)"""
+        self.nb_rows = 0
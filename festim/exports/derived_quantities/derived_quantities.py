@@ -1,7 +1,9 @@
 from festim import (
+    Specifiable,
     MinimumVolume,
     MaximumVolume,
     DerivedQuantity,
+    ColumnStore,
 )
 import fenics as f
 import os
@@ -10,13 +12,14 @@ from typing import Union
 import warnings
 
 
-class DerivedQuantities(list):
+class DerivedQuantities(Specifiable, list):
     """
     A list of festim.DerivedQuantity objects
 
     Args:
-        filename (str, optional): the filename (must end with .csv).
-            If None, the data will not be exported. Defaults to None.
+        filename (str, optional): the filename (must end with .csv, or
+            .npy for a binary file). If None, the data will not be
+            exported. Defaults to None.
         nb_iterations_between_compute (int, optional): number of
             iterations between each derived quantities computation.
             Defaults to 1.
@@ -35,8 +38,18 @@ class DerivedQuantities(list):
             exported at the last timestep.
         show_units (bool): will show the units of each
             derived quantity in the title in export
-        data (list): the data to be exported
-        t (list): the time steps
+        store (festim.ColumnStore): the computed data, one column for the
+            time and one per derived quantity. The data and t attributes of
+            the derived quantities are views of its columns. None if
+            nothing has been computed.
+        data (list): the data to be exported as rows, the first row being
+            the header (built from store)
+        t (numpy.ndarray or list): the time steps
+
+    The file is kept open between exports and only the rows computed since
+    the previous export are written. With a .npy file, the data is stored
+    as a numpy structured array with one field per column (eg.
+    np.load(filename)["t(s)"]).
     """
 
     def __init__(
@@ -60,8 +73,39 @@ class DerivedQuantities(list):
         self.nb_iterations_between_exports = nb_iterations_between_exports
         self.show_units = show_units
 
-        self.data = []
-        self.t = []
+        self.store = None
+
+        self._file = None
+        self._file_name = None
+        self._file_store = None
+        self._nb_rows_written = 0
+        self._dtype = None
+
+    @property
+    def data(self):
+        if self.store is None or len(self.store) == 0:
+            return []
+        return [list(self.store.titles)] + self.store.rows().tolist()
+
+    @data.setter
+    def data(self, value):
+        """Replaces the data by rows, the first row being the header"""
+        for quantity in self:
+            if quantity.store is not None and quantity.store is self.store:
+                quantity.detach()
+        if len(value) == 0:
+            self.store = None
+        else:
+            self.store = ColumnStore(value[0], capacity=len(value) - 1)
+            for row in value[1:]:
+                self.store.append(row)
+        self.attach_quantities()
+
+    @property
+    def t(self):
+        if self.store is None:
+            return []
+        return self.store.column(0)
 
     @property
     def derived_quantities(self):
@@ -117,8 +161,8 @@ class DerivedQuantities(list):
         if value is not None:
             if not isinstance(value, str):
                 raise TypeError("filename must be a string")
-            if not value.endswith(".csv"):
-                raise ValueError("filename must end with .csv")
+            if not value.endswith((".csv", ".npy")):
+                raise ValueError("filename must end with .csv or .npy")
         self._filename = value
 
     def make_header(self):
@@ -153,6 +197,33 @@ class DerivedQuantities(list):
             quantity.thermal_cond = materials.thermal_cond
             quantity.Q = materials.Q
 
+    def reset(self):
+        """Clears the data of the derived quantities"""
+        self.close()
+        self.store = None
+        for quantity in self:
+            quantity.t = []
+            quantity.data = []
+
+    def attach_quantities(self):
+        """Makes the data of the derived quantities views of the columns of
+        self.store (if it has one column per derived quantity)"""
+        if self.store is None or len(self.store.titles) != len(self) + 1:
+            return
+        for i, quantity in enumerate(self):
+            quantity.store = self.store
+            quantity.column = i + 1
+
+    def is_attached(self):
+        """Checks if the derived quantities are the columns of self.store
+
+        Returns:
+            bool: True if they are, else False
+        """
+        if self.store is None or len(self.store.titles) != len(self) + 1:
+            return False
+        return all(quantity.store is self.store for quantity in self)
+
     def compute(self, t):
         row = [t]
         for quantity in self:
@@ -160,29 +231,89 @@ class DerivedQuantities(list):
                 value = quantity.compute(self.volume_markers)
             else:
                 value = quantity.compute()
-
-            # check if first time writing data
-            if len(self.data) == 0:
-                self.data = [self.make_header()]
-
-            quantity.data.append(value)
-            quantity.t.append(t)
             row.append(value)
-        self.data.append(row)
-        self.t.append(t)
+
+        # check if first time writing data
+        if not self.is_attached():
+            self.store = ColumnStore(self.make_header())
+            self.attach_quantities()
+        self.store.append(row)
 
     def write(self):
+        """Writes the rows computed since the previous call to the file and
+        flushes it. The file is (re)created if it is not open yet.
+
+        Returns:
+            bool: True
+        """
         if self.filename is not None:
-            # if the directory doesn't exist
-            # create it
-            dirname = os.path.dirname(self.filename)
-            if not os.path.exists(dirname):
-                os.makedirs(dirname, exist_ok=True)
-
-            # save the data to csv
-            np.savetxt(self.filename, np.array(self.data), fmt="%s", delimiter=",")
+            nb_rows = len(self.store) if self.store is not None else 0
+            if (
+                self._file is None
+                or self._file_name != self.filename
+                or self._file_store is not self.store
+                or self._nb_rows_written > nb_rows
+            ):
+                self.open()
+            if self.store is not None:
+                rows = self.store.rows(self._nb_rows_written)
+                if self.filename.endswith(".npy"):
+                    self.write_binary_rows(rows)
+                else:
+                    for row in rows.tolist():
+                        self._file.write(",".join("{}".format(v) for v in row) + "\n")
+                self._nb_rows_written += len(rows)
+            self._file.flush()
         return True
 
+    def open(self):
+        """Creates the file (and its folder if needed) and keeps it open"""
+        self.close()
+        # if the directory doesn't exist
+        # create it
+        dirname = os.path.dirname(self.filename)
+        if not os.path.exists(dirname):
+            os.makedirs(dirname, exist_ok=True)
+
+        if self.filename.endswith(".npy"):
+            self._file = open(self.filename, "wb")
+        else:
+            self._file = open(self.filename, "w")
+        self._file_name = self.filename
+        self._file_store = self.store
+        self._nb_rows_written = 0
+        if self.store is None:
+            return
+        if self.filename.endswith(".npy"):
+            # the titles are the names of the fields
+            self._dtype = np.dtype([(str(title), "<f8") for title in self.store.titles])
+            self._file.write(npy_header(self._dtype, 0))
+        else:
+            self._file.write(",".join(self.store.titles) + "\n")
+
+    def close(self):
+        """Closes the file. The next call to write() rewrites all the data."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._file_name = None
+        self._file_store = None
+        self._nb_rows_written = 0
+
+    def write_binary_rows(self, rows):
+        """Appends rows to the .npy file and updates its header
+
+        Args:
+            rows (numpy.ndarray): the rows of self.store to write
+        """
+        self._file.write(np.ascontiguousarray(rows, dtype="<f8").tobytes())
+
+        # the header has a fixed length so that it can be rewritten in place
+        nb_rows = self._nb_rows_written + len(rows)
+        self._file.seek(0)
+        self._file.write(npy_header(self._dtype, nb_rows))
+        self._file.seek(0, os.SEEK_END)
+
     def is_export(self, t, final_time, nb_iterations):
         """Checks if the derived quantities should be exported or not based on
         the current time, the final time of simulation and the current number
@@ -300,3 +431,30 @@ class DerivedQuantities(list):
         if len(quantities) == 1:
             quantities = quantities[0]
         return quantities
+
+
+def npy_header(dtype, nb_rows):
+    """Returns the header of a .npy file (version 3.0) of a 1D array. Its
+    length does not depend on nb_rows so that it can be rewritten when
+    rows are appended.
+
+    Args:
+        dtype (numpy.dtype): the dtype of the array
+        nb_rows (int): the length of the array
+
+    Returns:
+        bytes: the header
+    """
+
+    def header_dict(shape):
+        header = "{{'descr': {!r}, 'fortran_order': False, 'shape': {!r}, }}".format(
+            np.lib.format.dtype_to_descr(dtype), shape
+        )
+        return header.encode("utf8")
+
+    magic = np.lib.format.magic(3, 0)
+    # room for the largest number of rows
+    length = len(header_dict((np.iinfo(np.int64).max,))) + 1
+    length += -(len(magic) + 4 + length) % 64  # align the data on 64 bytes
+    header = header_dict((nb_rows,)).ljust(length - 1) + b"\n"
+    return magic + len(header).to_bytes(4, "little") + header
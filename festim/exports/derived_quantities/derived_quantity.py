@@ -22,8 +22,13 @@ class DerivedQuantity(Export):
         S (fenics.Function): the source term
         thermal_cond (fenics.Function): the thermal conductivity
         Q (fenics.Function): the heat source term
-        data (list): the data of the derived quantity
-        t (list): the time values of the data
+        data (list or numpy.ndarray): the data of the derived quantity. A
+            view of a column of the festim.ColumnStore of the
+            festim.DerivedQuantities it belongs to once computed.
+        t (list or numpy.ndarray): the time values of the data
+        store (festim.ColumnStore): the store of the data, None if the data
+            is a list
+        column (int): the column of the data in store
         allowed_meshes (list): the allowed meshes for the derived quantity
     """
 
@@ -37,10 +42,42 @@ class DerivedQuantity(Export):
         self.thermal_cond = None
         self.Q = None
         self.T = None
+        self.store = None
+        self.column = None
         self.data = []
         self.t = []
         self.show_units = False
 
+    @property
+    def data(self):
+        if self.store is not None:
+            return self.store.column(self.column)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self.detach()
+        self._data = value
+
+    @property
+    def t(self):
+        if self.store is not None:
+            return self.store.column(0)
+        return self._t
+
+    @t.setter
+    def t(self, value):
+        self.detach()
+        self._t = value
+
+    def detach(self):
+        """Copies the data out of the store to lists"""
+        if self.store is not None:
+            self._data = self.store.column(self.column).tolist()
+            self._t = self.store.column(0).tolist()
+        self.store = None
+        self.column = None
+
     @property
     def allowed_meshes(self):
         # by default, all meshes are allowed
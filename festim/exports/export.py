@@ -1,4 +1,7 @@
-class Export:
+from festim import Specifiable
+
+
+class Export(Specifiable):
     def __init__(self, field=None) -> None:
         self.field = field
         self.function = None
@@ -3,7 +3,7 @@ import fenics as f
 import warnings
 
 
-class Exports(list):
+class Exports(festim.Specifiable, list):
     """
     A list of festim.Export objects
     """
@@ -21,6 +21,9 @@ class Exports(list):
         self.V_DG1 = None
         self.final_time = None
         self.nb_iterations = 0
+        self._projections = {}
+        self._projected_fields = set()
+        self._projector = None
 
     @property
     def exports(self):
@@ -90,8 +93,8 @@ class Exports(list):
                             if not isinstance(
                                 label_to_function[quantity.field], f.Function
                             ):
-                                label_to_function[quantity.field] = f.project(
-                                    label_to_function[quantity.field], self.V_DG1
+                                label_to_function[quantity.field] = self.project(
+                                    quantity.field, label_to_function[quantity.field]
                                 )
                         if isinstance(quantity, festim.AdsorbedHydrogen):
                             for surf_funcs in label_to_function[quantity.field]:
@@ -112,8 +115,8 @@ class Exports(list):
                     if export.field == "retention":
                         # if not a Function, project it onto V_DG1
                         if not isinstance(label_to_function["retention"], f.Function):
-                            label_to_function["retention"] = f.project(
-                                label_to_function["retention"], self.V_DG1
+                            label_to_function["retention"] = self.project(
+                                "retention", label_to_function["retention"]
                             )
                     export.function = label_to_function[export.field]
                     if isinstance(export, festim.TrapDensityXDMF):
@@ -123,16 +126,49 @@ class Exports(list):
                     export.append = True
 
             elif isinstance(export, festim.TXTExport):
-                # if not a Function, project it onto V_DG1
-                if not isinstance(label_to_function[export.field], f.Function):
-                    label_to_function[export.field] = f.project(
-                        label_to_function[export.field], self.V_DG1
+                if export.is_it_time_to_export(self.t):
+                    # project onto V_DG1 (once per time step for each field)
+                    export.function = self.project(
+                        export.field, label_to_function[export.field]
                     )
-                export.function = label_to_function[export.field]
-                steady = self.final_time == None
-                export.write(self.t, steady)
+                    steady = self.final_time == None
+                    export.write(self.t, steady, self.final_time)
         self.nb_iterations += 1
 
+    def project(self, field, function):
+        """Projects a field onto self.V_DG1. Each field is projected at most
+        once per time step: the projection is reused until
+        invalidate_projections() is called. The projected fenics.Function
+        of each field is created once and reused at each time step.
+
+        The projection is solved cell by cell with a festim.Projector.
+
+        Args:
+            field (str or int): the field
+            function (ufl.Expr): the expression to project
+
+        Returns:
+            fenics.Function: the projected field
+        """
+        target = self._projections.get(field)
+        if target is None or target.function_space() != self.V_DG1:
+            target = f.Function(self.V_DG1)
+            self._projections[field] = target
+        elif field in self._projected_fields:
+            return target
+
+        if self._projector is None or self._projector.V != self.V_DG1:
+            self._projector = festim.Projector(self.V_DG1)
+        self._projector.project(function, function=target)
+        self._projected_fields.add(field)
+        return target
+
+    def invalidate_projections(self):
+        """Marks the projected fields as outdated, so that they are projected
+        again at the next call of project(). Has to be called when the
+        solution changes (ie. at each time step)."""
+        self._projected_fields.clear()
+
     def initialise_derived_quantities(self, dx, ds, materials):
         """If derived quantities in exports, creates header and adds measures
         and properties
@@ -144,11 +180,30 @@ class Exports(list):
         """
         for export in self:
             if isinstance(export, festim.DerivedQuantities):
-                # reset the data of the derived quantities
-                export.data = []
-                export.t = []
-                for quantity in export:
-                    quantity.t = []
-                    quantity.data = []
+                export.reset()
                 export.assign_measures_to_quantities(dx, ds)
                 export.assign_properties_to_quantities(materials)
+
+    def close(self):
+        """Closes the files kept open by the exports and writes the columns
+        of the TXT exports kept in memory"""
+        for export in self:
+            if isinstance(export, festim.DerivedQuantities):
+                export.close()
+            elif isinstance(export, festim.TXTExport):
+                export.flush()
+
+    def reset(self):
+        """Resets the exports before a new run: clears the data of the
+        derived quantities and overwrites the XDMF and TXT files at the
+        next export"""
+        self.t = None
+        self.nb_iterations = 0
+        self.invalidate_projections()
+        for export in self:
+            if isinstance(export, festim.DerivedQuantities):
+                export.reset()
+            elif isinstance(export, festim.XDMFExport):
+                export.append = False
+            elif isinstance(export, festim.TXTExport):
+                export._first_time = True
@@ -0,0 +1,66 @@
+import fenics as f
+
+
+class Projector:
+    """Projects expressions onto a function space, reusing the
+    factorisation of the mass matrix for all the projections.
+
+    On a discontinuous (DG) function space the mass matrix is block
+    diagonal: the projection is solved cell by cell with a
+    fenics.LocalSolver and the local matrices are factorised once. On other
+    function spaces the global mass matrix is assembled and factorised once.
+
+    Args:
+        V (fenics.FunctionSpace): the function space
+
+    Attributes:
+        V (fenics.FunctionSpace): the function space
+        local (bool): True if the projection is solved cell by cell
+    """
+
+    def __init__(self, V) -> None:
+        self.V = V
+        self.local = V.ufl_element().family() == "Discontinuous Lagrange"
+        u = f.TrialFunction(V)
+        self._v = f.TestFunction(V)
+        # the right-hand side vector is reused for all the projections
+        self._b = f.PETScVector(V.mesh().mpi_comm())
+        a = f.inner(u, self._v) * f.dx(domain=V.mesh())
+        if self.local:
+            self._solver = f.LocalSolver(
+                a, solver_type=f.LocalSolver.SolverType.Cholesky
+            )
+            self._solver.factorize()
+        else:
+            self._solver = f.LUSolver(f.assemble(a))
+
+    def project(self, expression, function=None, dx=None):
+        """Projects an expression
+
+        Args:
+            expression (ufl.Expr): the expression to project
+            function (fenics.Function, optional): the function in which the
+                projection is stored. If None, a new function is created.
+                Defaults to None.
+            dx (fenics.Measure or list of fenics.Measure, optional): the
+                measure(s) where the expression is integrated (eg. to
+                project an expression defined on some subdomains only,
+                zero elsewhere). If None, the whole domain is used.
+                Defaults to None.
+
+        Returns:
+            fenics.Function: the projection
+        """
+        if function is None:
+            function = f.Function(self.V)
+        if dx is None:
+            dx = f.dx(domain=self.V.mesh())
+        if not isinstance(dx, (list, tuple)):
+            dx = [dx]
+        L = sum(f.inner(expression, self._v) * measure for measure in dx)
+        f.assemble(L, tensor=self._b)
+        if self.local:
+            self._solver.solve_local(function.vector(), self._b, self.V.dofmap())
+        else:
+            self._solver.solve(function.vector(), self._b)
+        return function
@@ -1,4 +1,5 @@
 from festim.exports.xdmf_export import XDMFExport
+import festim
 import fenics as f
 
 
@@ -15,6 +16,9 @@ class TrapDensityXDMF(XDMFExport):
         )  # field is "1" just to make the code not crash
 
         self.trap = trap
+        self._projector = None
+        self._density = None
+        self._function_space = None
 
     def write(self, t, dx):
         """Writes to file
@@ -23,15 +27,22 @@ class TrapDensityXDMF(XDMFExport):
             t (float): the time
             dx (fenics.Measure): the measure for dx
         """
-        functionspace = self.function.function_space().collapse()
-        u = f.Function(functionspace)
-        v = f.TestFunction(functionspace)
-        F = f.inner(u, v) * dx
-
-        for mat in self.trap.materials:
-            F -= f.inner(self.trap.density[0], v) * dx(mat.id)
-
-        f.solve(F == 0, u, bcs=[])
-        self.function = u
+        # the density function and its projector are created once per
+        # function space (eg. a new one is created when the simulation is
+        # initialised again)
+        functionspace = self.function.function_space()
+        if self._projector is None or self._function_space != functionspace:
+            self._function_space = functionspace
+            collapsed_functionspace = functionspace.collapse()
+            self._projector = festim.Projector(collapsed_functionspace)
+            self._density = f.Function(collapsed_functionspace)
+
+        # the density is zero outside of the trap materials
+        self._projector.project(
+            self.trap.density[0],
+            function=self._density,
+            dx=[dx(mat.id) for mat in self.trap.materials],
+        )
+        self.function = self._density
 
         super().write(t)
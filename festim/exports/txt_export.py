@@ -18,6 +18,9 @@ class TXTExport(festim.Export):
             timesteps. Defaults to None.
         header_format (str, optional): the format of column headers.
             Defautls to ".2e".
+
+    The exported columns are kept in memory: the file is written at the
+    first and at the last export, or when flush() is called.
     """
 
     def __init__(self, field, filename, times=None, header_format=".2e") -> None:
@@ -29,6 +32,13 @@ class TXTExport(festim.Export):
         self.filename = filename
         self.header_format = header_format
         self._first_time = True
+        self._V_DG1 = None
+        self._solution = None
+        self._projector = None
+        self._x_column = None
+        self._x_space = None
+        self._columns = []
+        self._header = []
 
     @property
     def filename(self):
@@ -59,42 +69,107 @@ class TXTExport(festim.Export):
                 return time
         return None
 
-    def write(self, current_time, steady):
-        # create a DG1 functionspace
-        V_DG1 = f.FunctionSpace(self.function.function_space().mesh(), "DG", 1)
+    def is_last_export(self, current_time, final_time):
+        """Checks if current_time is the last time the field is exported
+
+        Args:
+            current_time (float): the current time
+            final_time (float): the final time of the simulation. If None,
+                only the export times are considered.
 
-        solution = f.project(self.function, V_DG1)
+        Returns:
+            bool: True if it is the last export, else False
+        """
+        if self.times is not None and np.isclose(current_time, self.times[-1], atol=0):
+            return True
+        if final_time is not None:
+            return current_time >= final_time or np.isclose(
+                current_time, final_time, atol=0
+            )
+        return False
+
+    def write(self, current_time, steady, final_time=None):
+        """Adds a column with the field at the current time. The columns are
+        kept in memory and the file is only written at the first and at the
+        last export (see flush()).
+
+        Args:
+            current_time (float): the current time
+            steady (bool): True if the simulation is steady state
+            final_time (float, optional): the final time of the simulation.
+                Defaults to None.
+        """
+        if not self.is_it_time_to_export(current_time):
+            return
+        V = self.function.function_space()
+        if is_DG1(V):
+            # already projected (eg. by festim.Exports)
+            V_DG1 = V
+            solution = self.function
+        else:
+            mesh = V.mesh()
+            # the DG1 functionspace and the projected solution are created once
+            if self._V_DG1 is None or self._V_DG1.mesh().id() != mesh.id():
+                self._V_DG1 = f.FunctionSpace(mesh, "DG", 1)
+                self._solution = f.Function(self._V_DG1)
+                self._projector = festim.Projector(self._V_DG1)
+            V_DG1 = self._V_DG1
+            solution = self._projector.project(self.function, function=self._solution)
+        if self._x_space is None or self._x_space != V_DG1:
+            x = f.interpolate(f.Expression("x[0]", degree=1), V_DG1)
+            self._x_column = np.transpose([x.vector()[:]])
+            self._x_space = V_DG1
         solution_column = np.transpose(solution.vector()[:])
-        if self.is_it_time_to_export(current_time):
-            # if the directory doesn't exist
-            # create it
-            dirname = os.path.dirname(self.filename)
-            if not os.path.exists(dirname):
-                os.makedirs(dirname, exist_ok=True)
-
-            # if steady or it is the first time to export
-            # write data
-            # else append new column to the existing file
-            if steady or self._first_time:
-                if steady:
-                    header = "x,t=steady"
-                else:
-                    header = f"x,t={format(current_time, self.header_format)}s"
-                x = f.interpolate(f.Expression("x[0]", degree=1), V_DG1)
-                x_column = np.transpose([x.vector()[:]])
-                data = np.column_stack([x_column, solution_column])
-                self._first_time = False
-            else:
-                # Update the header
-                old_file = open(self.filename)
-                old_header = old_file.readline().split("\n")[0]
-                old_file.close()
-                header = old_header + f",t={format(current_time, self.header_format)}s"
-                # Append new column
-                old_columns = np.loadtxt(self.filename, delimiter=",", skiprows=1)
-                data = np.column_stack([old_columns, solution_column])
-
-            np.savetxt(self.filename, data, header=header, delimiter=",", comments="")
+
+        # if steady or it is the first time to export
+        # start new columns
+        # else add a column to the existing ones
+        first_time = steady or self._first_time
+        if first_time:
+            self._columns = [self._x_column]
+            self._header = ["x"]
+            self._first_time = False
+        if steady:
+            self._header.append("t=steady")
+        else:
+            self._header.append(f"t={format(current_time, self.header_format)}s")
+        self._columns.append(solution_column)
+
+        if first_time or self.is_last_export(current_time, final_time):
+            self.flush()
+
+    def flush(self):
+        """Writes all the exported columns to the file"""
+        if not self._columns:
+            return
+        # if the directory doesn't exist
+        # create it
+        dirname = os.path.dirname(self.filename)
+        if not os.path.exists(dirname):
+            os.makedirs(dirname, exist_ok=True)
+
+        data = np.column_stack(self._columns)
+        header = ",".join(self._header)
+        np.savetxt(self.filename, data, header=header, delimiter=",", comments="")
+
+
+def is_DG1(V):
+    """Checks if a function space is a scalar DG1 function space (not a
+    subspace)
+
+    Args:
+        V (fenics.FunctionSpace): the function space
+
+    Returns:
+        bool: True if V is a scalar DG1 function space, else False
+    """
+    element = V.ufl_element()
+    return (
+        element.family() == "Discontinuous Lagrange"
+        and element.degree() == 1
+        and V.num_sub_spaces() == 0
+        and len(V.component()) == 0
+    )
 
 
 class TXTExports:
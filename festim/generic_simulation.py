@@ -43,6 +43,9 @@ class Simulation:
             PROGRESS  = 16, what's happening (broadly)
             TRACE     = 13,  what's happening (in detail)
             DBG       = 10  sundry
+        cache (festim.ResultCache, optional): if not None, the results of
+            complete runs are stored in the cache and a run with the same
+            model is not solved again. Defaults to None.
 
     Attributes:
         log_level (int): set what kind of FEniCS messsages are
@@ -72,6 +75,8 @@ class Simulation:
         mobile (festim.Mobile): the mobile concentration (c_m or theta)
         t (fenics.Constant): the current time of simulation
         timer (fenics.timer): the elapsed time of simulation
+        cache (festim.ResultCache): the cache of the results of complete
+            runs
     """
 
     def __init__(
@@ -87,8 +92,10 @@ class Simulation:
         initial_conditions=[],
         exports=None,
         log_level=40,
+        cache=None,
     ):
         self.log_level = log_level
+        self.cache = cache
 
         self.settings = settings
         self.dt = dt
@@ -406,6 +413,74 @@ class Simulation:
                         q.soret = self.settings.soret
                         q.T = self.T.T
 
+    def reset(self):
+        """Resets the model to t = 0 so that it can be run again without
+        being initialised. The mesh, function spaces, forms, BCs and solvers
+        are kept; the concentrations and the temperature are set back to
+        their initial conditions, the stepsize to its initial value and the
+        data of the exports is cleared.
+
+        Usage:
+            my_model.initialise()
+            my_model.run()
+            my_model.set_parameters("tungsten", D_0=2e-7)
+            my_model.reset()
+            my_model.run()
+
+        The initial conditions of the concentrations, the final time and the
+        parameters modified with set_parameters() are taken into account.
+        Changes to the mesh, materials, traps, boundary conditions, sources or
+        the other settings require initialise() to be called again.
+
+        Raises:
+            AttributeError: if the model hasn't been initialised
+        """
+        if self.h_transport_problem is None:
+            raise AttributeError("the model must be initialised before being reset")
+        self.t = 0
+        self.T.reset()
+        if self.dt is not None:
+            self.dt.reset()
+        self.h_transport_problem.initial_conditions = self.initial_conditions
+        self.h_transport_problem.reset()
+        self.exports.reset()
+
+    def set_parameters(self, target, **parameters):
+        """Modifies the parameters of a material or a trap. The parameters
+        appear as fenics.Constant in the variational forms so the model
+        doesn't need to be initialised (and the forms recompiled) again.
+
+        Usage:
+            my_model.set_parameters("tungsten", D_0=2e-7, E_D=0.3)
+            my_model.set_parameters(my_trap, k_0=1e-16)
+
+        Only the numerical parameters are updated in place (D_0, E_D, S_0,
+        E_S, Q, thermal_cond, heat_capacity, rho, k_0, E_k, p_0, E_p).
+
+        Args:
+            target (festim.Material, festim.Trap, int, str): the material (or
+                its id or name) or the trap
+            **parameters: the new values of the parameters
+
+        Raises:
+            AttributeError: if target has no such parameter
+        """
+        if not isinstance(target, festim.Trap):
+            target = self.materials.find_material(target)
+        for name, value in parameters.items():
+            festim.set_parameter(target, name, value)
+
+        if self.h_transport_problem is not None:
+            # the properties of the post-processing and the solubility of the
+            # chemical potential are DG0 fields updated in place, so that the
+            # forms using them (eg. the conversion of theta to the
+            # concentration) stay valid
+            self.materials.update_properties()
+            if self.settings.chemical_pot:
+                if self.T.is_steady_state():
+                    self.materials.solubility_as_function(self.mesh, self.T.T)
+                self.h_transport_problem.compute_dirichlet_bcs_values()
+
     def run(self, completion_tone=False):
         """Runs the model.
 
@@ -418,10 +493,25 @@ class Simulation:
         """
         self.timer = Timer()  # start timer
 
-        if self.settings.transient:
-            self.run_transient()
+        cache_key = None
+        if self.cache is not None and self.t == 0:
+            try:
+                cache_key = self.cache.key(self)
+            except TypeError as error:
+                warnings.warn("the results cannot be cached: {}".format(error))
+        if cache_key is not None and self.cache.load(cache_key, self):
+            print("Results loaded from cache")
         else:
-            self.run_steady()
+            try:
+                if self.settings.transient:
+                    self.run_transient()
+                else:
+                    self.run_steady()
+            finally:
+                # the exported data is written even if the run fails
+                self.exports.close()
+            if cache_key is not None:
+                self.cache.store(cache_key, self)
 
         self.timer.stop()
 
@@ -433,10 +523,6 @@ class Simulation:
         # add final_time to Exports
         self.exports.final_time = self.settings.final_time
 
-        # compute Jacobian before iterating if required
-        if not self.settings.update_jacobian:
-            self.h_transport_problem.compute_jacobian()
-
         #  Time-stepping
         print("Time stepping...")
         while self.t < self.settings.final_time and not np.isclose(
@@ -467,10 +553,11 @@ class Simulation:
         """Advance the model by one iteration"""
         # Update current time
         self.t += float(self.dt.value)
+        self.dt.update_time_scheme()
         # update temperature
         self.T.update(self.t)
         # update H problem
-        self.h_transport_problem.update(self.t, self.dt)
+        self.t = self.h_transport_problem.update(self.t, self.dt)
 
         # Display time
         self.display_time()
@@ -500,6 +587,8 @@ class Simulation:
 
     def run_post_processing(self):
         """Create post processing functions and compute/write the exports"""
+        # the solution may have changed since the last projections
+        self.exports.invalidate_projections()
         self.update_post_processing_solutions()
 
         self.exports.t = self.t
@@ -1,4 +1,5 @@
 from fenics import *
+import numpy as np
 import festim
 
 
@@ -22,7 +23,20 @@ class HTransportProblem:
             ct2, ...)
         v (fenics.TestFunction): the test function
         u_n (fenics.Function): the "previous" function
-        newton_solver (fenics.NewtonSolver): Newton solver for solving the nonlinear problem
+        u_rollback (fenics.Function): the state restored when a time step
+            is retried, allocated once
+        u_nm1 (fenics.Function): the function two steps before, only used
+            with multistep time schemes, error control and predictors
+        u_nm2 (fenics.Function): the function three steps before, only
+            created with the quadratic predictor
+        newton_solver (fenics.NewtonSolver or fenics.PETScSNESSolver): Newton
+            solver for solving the nonlinear problem
+        problem (festim.Problem): the nonlinear problem (and its assembler)
+            reused across time steps as long as the forms and the BCs are
+            unchanged
+        splitting_solver (festim.OperatorSplittingSolver): the solver used
+            for transient problems with traps if
+            self.settings.operator_splitting is True, else None
         bcs (list): list of fenics.DirichletBC for H transport
     """
 
@@ -37,7 +51,17 @@ class HTransportProblem:
         self.u = None
         self.v = None
         self.u_n = None
+        self.u_rollback = None
+        self._post_processing_split = None
+        self.u_nm1 = None
+        self.u_nm2 = None
+        self._older_dt_value = None
         self.newton_solver = None
+        self.problem = None
+        self.splitting_solver = None
+        self._jacobian_residual_form = None
+        self._previous_dt_value = None
+        self._error_tolerances = None
 
         self.boundary_conditions = []
         self.bcs = None
@@ -53,12 +77,14 @@ class HTransportProblem:
     def newton_solver(self, value):
         if value is None:
             self._newton_solver = value
-        elif isinstance(value, NewtonSolver):
+        elif isinstance(value, (NewtonSolver, PETScSNESSolver)):
             if self._newton_solver:
                 print("Settings for the Newton solver will be overwritten")
             self._newton_solver = value
         else:
-            raise TypeError("accepted type for newton_solver is fenics.NewtonSolver")
+            raise TypeError(
+                "accepted type for newton_solver is fenics.NewtonSolver or fenics.PETScSNESSolver"
+            )
 
     @property
     def _all_surf_kinetics(self):
@@ -86,10 +112,16 @@ class HTransportProblem:
         self.attribute_flux_boundary_conditions()
 
         self.traps.assign_traps_ids()
+        if dt is not None:
+            self.check_time_scheme(dt)
+        if self.settings.predictor not in [None, "linear", "quadratic"]:
+            raise ValueError(
+                "accepted values for predictor are None, 'linear' and 'quadratic'"
+            )
 
         # Define functions
         self.define_function_space(mesh)
-        self.initialise_concentrations()
+        self.initialise_concentrations(dt)
         self.traps.make_traps_materials(materials)
         self.traps.initialise_extrinsic_traps(self.V_CG1)
 
@@ -104,10 +136,71 @@ class HTransportProblem:
         # Boundary conditions
         print("Defining boundary conditions")
         self.create_dirichlet_bcs(materials, mesh)
+        # time-independent expressions are interpolated once
+        self.F, self.expressions = festim.freeze_expressions(
+            self.F, self.expressions, mesh.mesh
+        )
+        self.define_nonlinear_problem()
         if self.settings.transient:
+            if self.settings.operator_splitting and len(self.traps) > 0:
+                self.splitting_solver = festim.OperatorSplittingSolver(self)
+                self.splitting_solver.initialise(materials, mesh, dt)
             self.traps.define_variational_problem_extrinsic_traps(mesh.dx, dt, self.T)
             self.traps.define_newton_solver_extrinsic_traps()
 
+    def reset(self):
+        """Resets the concentrations to the initial conditions and forgets
+        the previous time steps. The function spaces, forms, BCs and solvers
+        are kept so the problem can be solved again without being
+        initialised. The temperature has to be reset beforehand.
+        """
+        for function in [self.u, self.u_n, self.u_nm1, self.u_nm2, self.u_rollback]:
+            if function is not None:
+                function.vector().zero()
+        self.assign_initial_conditions()
+        for trap in self.traps:
+            if isinstance(trap, festim.ExtrinsicTrapBase):
+                for function in [
+                    trap.density[0],
+                    trap.density_previous_solution,
+                    trap.density_older_solution,
+                ]:
+                    function.vector().zero()
+        festim.update_expressions(self.expressions, 0)
+        self.compute_dirichlet_bcs_values()
+        self._previous_dt_value = None
+        self._older_dt_value = None
+        self.refresh_jacobian()
+
+    def check_time_scheme(self, dt):
+        """Checks that the time scheme of the stepsize is compatible with
+        the problem
+
+        Args:
+            dt (festim.Stepsize): the stepsize
+
+        Raises:
+            NotImplementedError: if a multistep time scheme is used with
+                conservation of chemical potential, SurfaceKinetics or
+                operator splitting
+        """
+        if dt.time_scheme == "backward_euler":
+            return
+        if self.settings.chemical_pot:
+            raise NotImplementedError(
+                "{} is not implemented with conservation of chemical potential".format(
+                    dt.time_scheme
+                )
+            )
+        if len(self._all_surf_kinetics) > 0:
+            raise NotImplementedError(
+                "{} is not implemented with SurfaceKinetics".format(dt.time_scheme)
+            )
+        if self.settings.operator_splitting:
+            raise NotImplementedError(
+                "{} is not implemented with operator splitting".format(dt.time_scheme)
+            )
+
     def define_function_space(self, mesh):
         """Creates a suitable function space for H transport problem
 
@@ -138,24 +231,44 @@ class HTransportProblem:
         self.V_CG1 = FunctionSpace(mesh.mesh, "CG", 1)
         self.V_DG1 = FunctionSpace(mesh.mesh, "DG", 1)
 
-    def initialise_concentrations(self):
+    def initialise_concentrations(self, dt=None):
         """Creates the main fenics.Function (holding all the concentrations),
         eventually split it and assign it to Trap and Mobile.
         Then initialise self.u_n based on self.initial_conditions
 
         Args:
-            materials (festim.Materials): the materials
+            dt (festim.Stepsize, optional): the stepsize. self.u_nm1 is only
+                created with BDF2, error control or a predictor. Defaults to
+                None.
         """
         # TODO rename u and u_n to c and c_n
         self.u = Function(self.V, name="c")  # Function for concentrations
         self.v = TestFunction(self.V)  # TestFunction for concentrations
         self.u_n = Function(self.V, name="c_n")
+        self.u_rollback = Function(self.V)
+        if self.settings.predictor is not None or (
+            dt is not None
+            and (dt.time_scheme == "BDF2" or dt.error_control is not None)
+        ):
+            self.u_nm1 = Function(self.V, name="c_nm1")
+        if self.settings.predictor == "quadratic":
+            self.u_nm2 = Function(self.V, name="c_nm2")
 
         if self.V.num_sub_spaces() == 0:
             self.mobile.solution = self.u
             self.mobile.previous_solution = self.u_n
+            self.mobile.older_solution = self.u_nm1
             self.mobile.test_function = self.v
-        else:
+
+        self.assign_initial_conditions()
+
+    def assign_initial_conditions(self):
+        """Assigns the initial conditions to self.u_n (and the initial guess
+        of self.u with conservation of chemical potential). The concentrations
+        are temporarily attached to the sub-functions of self.u and self.u_n
+        and then to their components for the formulation.
+        """
+        if self.V.num_sub_spaces() != 0:
             conc_list = [self.mobile]
             if self.traps:
                 conc_list += [*self.traps]
@@ -241,6 +354,8 @@ class HTransportProblem:
                 else:
                     concentration.solution = list(split(self.u))[index]
                     concentration.previous_solution = list(split(self.u_n))[index]
+                    if self.u_nm1 is not None:
+                        concentration.older_solution = list(split(self.u_nm1))[index]
                     index += 1
 
     def define_variational_problem(self, materials, mesh, dt=None):
@@ -259,34 +374,82 @@ class HTransportProblem:
 
         # diffusion + transient terms
 
+        if self.settings.static_condensation:
+            # trapping terms are integrated at the vertices so that each trap
+            # dof is only coupled to itself and the co-located mobile dof
+            dx_trapping = mesh.dx(scheme="vertex", degree=1)
+        else:
+            dx_trapping = mesh.dx
+
         self.mobile.create_form(
-            materials, mesh, self.T, dt, traps=self.traps, soret=self.settings.soret
+            materials,
+            mesh,
+            self.T,
+            dt,
+            traps=self.traps,
+            soret=self.settings.soret,
+            dx_trapping=dx_trapping,
         )
         F += self.mobile.F
         expressions += self.mobile.sub_expressions
 
         # Add traps
-        self.traps.create_forms(self.mobile, materials, self.T, mesh.dx, dt)
+        self.traps.create_forms(self.mobile, materials, self.T, dx_trapping, dt)
         F += self.traps.F
         expressions += self.traps.sub_expressions
         self.F = F
         self.expressions = expressions
 
     def define_newton_solver(self):
-        """Creates the Newton solver and sets its parameters"""
-        self.newton_solver = NewtonSolver(MPI.comm_world)
-        self.newton_solver.parameters["error_on_nonconvergence"] = False
-        self.newton_solver.parameters["absolute_tolerance"] = (
-            self.settings.absolute_tolerance
-        )
-        self.newton_solver.parameters["relative_tolerance"] = (
-            self.settings.relative_tolerance
-        )
-        self.newton_solver.parameters["maximum_iterations"] = (
-            self.settings.maximum_iterations
+        """Creates the Newton solver (or the SNES solver if
+        self.settings.nonlinear_solver is "snes") and sets its parameters.
+        If self.settings.preconditioner is "fieldsplit" or if
+        self.settings.static_condensation is True, a
+        festim.FieldSplitNewtonSolver is created.
+
+        Raises:
+            ValueError: if the fieldsplit preconditioner is used without
+                traps or with the SNES solver
+        """
+        condensation = self.settings.static_condensation and len(self.traps) > 0
+        if self.settings.preconditioner == "fieldsplit" or condensation:
+            if len(self.traps) == 0:
+                raise ValueError("fieldsplit preconditioner requires traps")
+            if self.settings.nonlinear_solver != "newton":
+                raise ValueError(
+                    "fieldsplit preconditioner is only available with the 'newton' nonlinear solver"
+                )
+            fieldsplit_options = {}
+            if condensation:
+                fieldsplit_options.update(
+                    festim.FieldSplitNewtonSolver.static_condensation_options
+                )
+            if self.settings.fieldsplit_options is not None:
+                fieldsplit_options.update(self.settings.fieldsplit_options)
+            self.newton_solver = festim.FieldSplitNewtonSolver(
+                self.V,
+                nb_traps=len(self.traps),
+                absolute_tolerance=self.settings.absolute_tolerance,
+                relative_tolerance=self.settings.relative_tolerance,
+                maximum_iterations=self.settings.maximum_iterations,
+                error_on_nonconvergence=False,
+                fieldsplit_options=fieldsplit_options,
+                options_prefix="h_transport_fieldsplit_",
+            )
+            return
+        self.newton_solver = festim.create_nonlinear_solver(
+            nonlinear_solver=self.settings.nonlinear_solver,
+            absolute_tolerance=self.settings.absolute_tolerance,
+            relative_tolerance=self.settings.relative_tolerance,
+            maximum_iterations=self.settings.maximum_iterations,
+            linear_solver=self.settings.linear_solver,
+            preconditioner=self.settings.preconditioner,
+            error_on_nonconvergence=False,
+            line_search=self.settings.line_search,
+            inexact_newton=self.settings.inexact_newton,
+            snes_options=self.settings.snes_options,
+            options_prefix="h_transport_",
         )
-        self.newton_solver.parameters["linear_solver"] = self.settings.linear_solver
-        self.newton_solver.parameters["preconditioner"] = self.settings.preconditioner
 
     def attribute_flux_boundary_conditions(self):
         """Iterates through self.boundary_conditions, checks if it's a FluxBC
@@ -315,33 +478,257 @@ class HTransportProblem:
                 self.expressions += bc.sub_expressions
                 self.expressions.append(bc.expression)
 
+    def compute_dirichlet_bcs_values(self):
+        """Computes the values of the Dirichlet BCs that depend on the
+        temperature or on the solubility at the dofs of their surfaces (see
+        festim.DirichletBC.compute_values). Has to be called after the
+        temperature and the expressions have been updated.
+        """
+        for bc in self.boundary_conditions:
+            if bc.field != "T" and isinstance(bc, festim.DirichletBC):
+                bc.compute_values()
+
     def compute_jacobian(self):
         du = TrialFunction(self.u.function_space())
         self.J = derivative(self.F, self.u, du)
+        self._jacobian_residual_form = self.F
+
+    def define_nonlinear_problem(self):
+        """Creates the festim.Problem (and its fenics.SystemAssembler) from
+        self.F, self.J and self.bcs and stores it in self.problem.
+        The Jacobian form is computed if self.J is None or if it was computed
+        from a residual form that has since been replaced.
+        """
+        jacobian_outdated = (
+            self._jacobian_residual_form is not None
+            and self._jacobian_residual_form is not self.F
+        )
+        if self.J is None or jacobian_outdated:
+            self.compute_jacobian()
+        self.problem = festim.Problem(self.J, self.F, self.bcs)
+        self.problem.reuse_jacobian = self.settings.modified_newton
+
+    def is_nonlinear_problem_outdated(self):
+        """Checks if self.problem needs to be recreated, ie. if it hasn't
+        been created yet or if the forms or the BCs have changed since
+
+        Returns:
+            bool: True if self.problem needs to be recreated, else False
+        """
+        if self.problem is None:
+            return True
+        return (
+            self.problem.residual_form is not self.F
+            or self.problem.bcs is not self.bcs
+            or self.problem.jacobian_form is not self.J
+        )
+
+    def refresh_jacobian(self):
+        """Forces the Jacobian matrix to be reassembled at the next Newton
+        iteration. Only relevant if self.settings.modified_newton is True.
+        """
+        if self.problem is not None:
+            self.problem.jacobian_up_to_date = False
+        if self.splitting_solver is not None:
+            self.splitting_solver.problem.jacobian_up_to_date = False
 
     def update(self, t, dt):
-        """Updates the H transport problem.
+        """Updates the H transport problem. The temperature has to be
+        updated at t beforehand. If the step is retried with a smaller
+        stepsize, the temperature is updated again at the new time.
 
         Args:
             t (float): the current time (s)
             dt (festim.Stepsize): the stepsize
+
+        Returns:
+            float: the time reached (s). It differs from t if the step has
+                been retried with a smaller stepsize.
         """
-        festim.update_expressions(self.expressions, t)
+        t_start = t - float(dt.value)
 
         converged = False
-        u_ = Function(self.u.function_space())
-        u_.assign(self.u)
+        if self.u_rollback is None:
+            self.u_rollback = Function(self.u.function_space())
+        self.u_rollback.assign(self.u)
         while converged is False:
-            self.u.assign(u_)
-            nb_it, converged = self.solve_once()
-            if dt.adaptive_stepsize is not None or dt.milestones is not None:
-                dt.adapt(t, nb_it, converged)
+            festim.update_expressions(self.expressions, t)
+            self.compute_dirichlet_bcs_values()
+            self.u.assign(self.u_rollback)
+            if self.settings.predictor is not None:
+                self.apply_predictor(dt)
+            time_scheme_changed = dt.update_time_scheme()
+            step_value = float(dt.value)
+            # with modified Newton, the Jacobian depends on dt
+            if step_value != self._previous_dt_value or time_scheme_changed:
+                self.refresh_jacobian()
+                self._previous_dt_value = step_value
+            if self.splitting_solver is not None:
+                nb_it, converged = self.splitting_solver.solve(dt)
+            else:
+                nb_it, converged = self.solve_once()
+            if dt.error_control is not None:
+                error = self.estimate_error(dt) if converged else None
+                accepted = converged and (error is None or error <= 1)
+                next_start = t if accepted else t_start
+                converged = dt.adapt_to_error(next_start, error, converged)
+            elif dt.adaptive_stepsize is not None or dt.milestones is not None:
+                dt.adapt(t if converged else t_start, nb_it, converged)
+            if converged is False:
+                # retry the step from t_start with the new stepsize
+                t = t_start + float(dt.value)
+                # the temperature was updated at the time of the failed step
+                # and with the time scheme of its stepsize
+                if dt.update_time_scheme():
+                    self.refresh_jacobian()
+                self.T.rollback()
+                self.T.update(t)
+        self._older_dt_value = dt.previous_value
+        dt.previous_value = step_value
 
         # Update previous solutions
         self.update_previous_solutions()
 
         # Solve extrinsic traps formulation
         self.traps.solve_extrinsic_traps()
+        return t
+
+    def extrapolate(self, dt, order):
+        """Extrapolates the previous solutions to the end of the current
+        step with Lagrange polynomials accounting for variable stepsizes.
+
+        Args:
+            dt (festim.Stepsize): the stepsize
+            order (int): 1 for a linear extrapolation from u_n and u_nm1, 2
+                for a quadratic extrapolation from u_n, u_nm1 and u_nm2
+
+        Returns:
+            numpy.ndarray: the local values of the extrapolation, None if
+                there isn't enough history
+        """
+        step_value = float(dt.value)
+        h_1 = dt.previous_value
+        if h_1 is None or self.u_nm1 is None:
+            return None
+        u_n = self.u_n.vector().get_local()
+        u_nm1 = self.u_nm1.vector().get_local()
+        h_2 = self._older_dt_value
+        if order == 1 or h_2 is None or self.u_nm2 is None:
+            return u_n + step_value / h_1 * (u_n - u_nm1)
+
+        u_nm2 = self.u_nm2.vector().get_local()
+        l_0 = (step_value + h_1) * (step_value + h_1 + h_2) / (h_1 * (h_1 + h_2))
+        l_1 = -step_value * (step_value + h_1 + h_2) / (h_1 * h_2)
+        l_2 = step_value * (step_value + h_1) / ((h_1 + h_2) * h_2)
+        return l_0 * u_n + l_1 * u_nm1 + l_2 * u_nm2
+
+    def apply_predictor(self, dt):
+        """Sets the initial guess of the Newton solver (self.u) to the
+        extrapolation of the previous solutions (see
+        self.settings.predictor). self.u is unchanged if there isn't enough
+        history or with operator splitting.
+
+        Args:
+            dt (festim.Stepsize): the stepsize
+        """
+        if self.splitting_solver is not None:
+            return
+        order = {"linear": 1, "quadratic": 2}[self.settings.predictor]
+        prediction = self.extrapolate(dt, order)
+        if prediction is not None:
+            self.u.vector().set_local(prediction)
+            self.u.vector().apply("insert")
+
+    def estimate_error(self, dt):
+        """Estimates the local time error of the current step from the
+        difference between self.u and a linear extrapolation of the two
+        previous steps:
+
+        error = dt/(dt + dt_n) * (u - u_n - dt/dt_n * (u_n - u_nm1))
+
+        which is the local error of backward Euler (and an overestimate for
+        BDF2). The error is weighted by atol + rtol*max(|u|, |u_n|) for each
+        field and its root mean square is returned.
+
+        Args:
+            dt (festim.Stepsize): the stepsize with error_control parameters
+
+        Returns:
+            float: the weighted norm of the error (the step is accepted if
+                it is below 1), None if there isn't enough history yet
+        """
+        if dt.previous_value is None or self.u_nm1 is None:
+            return None
+        step_value = float(dt.value)
+
+        rtol, atol, controlled = self.error_tolerances(dt)
+        comm = self.u.function_space().mesh().mpi_comm()
+        nb_dofs = MPI.sum(comm, float(len(controlled)))
+        if nb_dofs == 0:
+            return None
+
+        u = self.u.vector().get_local()[controlled]
+        u_n = self.u_n.vector().get_local()[controlled]
+        prediction = self.extrapolate(dt, order=1)[controlled]
+        local_error = step_value / (step_value + dt.previous_value) * (u - prediction)
+
+        tolerance = atol + rtol * np.maximum(np.abs(u), np.abs(u_n))
+        squared_sum = MPI.sum(comm, float(np.sum((local_error / tolerance) ** 2)))
+        return np.sqrt(squared_sum / nb_dofs)
+
+    def error_tolerances(self, dt):
+        """Returns the relative and absolute tolerances of the local dofs of
+        self.u controlled by dt.error_control (ie. with a non zero
+        tolerance) and the indices of these dofs. They only depend on the
+        function space and on dt.error_control, so they are computed once.
+
+        Args:
+            dt (festim.Stepsize): the stepsize with error_control parameters
+
+        Returns:
+            numpy.ndarray, numpy.ndarray, numpy.ndarray: the relative and
+                absolute tolerances of the controlled dofs, their indices
+        """
+        key = [self.V]
+        for tolerances in [dt.error_control["rtol"], dt.error_control["atol"]]:
+            if isinstance(tolerances, dict):
+                tolerances = dict(tolerances)
+            key.append(tolerances)
+        if self._error_tolerances is not None:
+            cached_key, cached_tolerances = self._error_tolerances
+            if cached_key[0] is key[0] and cached_key[1:] == key[1:]:
+                return cached_tolerances
+
+        nb_local_dofs = self.u.vector().local_size()
+        rtol = np.zeros(nb_local_dofs)
+        atol = np.zeros(nb_local_dofs)
+        if self.V.num_sub_spaces() == 0:
+            components = {0: np.arange(nb_local_dofs)}
+        else:
+            first_dof = self.u.vector().local_range()[0]
+            components = {
+                i: self.V.sub(i).dofmap().dofs() - first_dof
+                for i in range(self.V.num_sub_spaces())
+            }
+
+        fields = {0: [0, "0", "solute"]}
+        for i, trap in enumerate(self.traps, 1):
+            fields[i] = [trap.id, str(trap.id)]
+
+        for values, tolerances in [
+            (rtol, dt.error_control["rtol"]),
+            (atol, dt.error_control["atol"]),
+        ]:
+            for component, dofs in components.items():
+                if not isinstance(tolerances, dict):
+                    values[dofs] = tolerances
+                    continue
+                for field in fields.get(component, []):
+                    if field in tolerances:
+                        values[dofs] = tolerances[field]
+        controlled = np.flatnonzero(rtol + atol > 0)
+        self._error_tolerances = (key, (rtol[controlled], atol[controlled], controlled))
+        return self._error_tolerances[1]
 
     def solve_once(self):
         """Solves non linear problem
@@ -350,28 +737,40 @@ class HTransportProblem:
             int, bool: number of iterations for reaching convergence, True if
                 converged else False
         """
-        if self.J is None:  # Define the Jacobian
-            du = TrialFunction(self.u.function_space())
-            J = derivative(self.F, self.u, du)
-        else:
-            J = self.J
-        problem = festim.Problem(J, self.F, self.bcs)
+        if self.is_nonlinear_problem_outdated():
+            self.define_nonlinear_problem()
 
         begin("Solving nonlinear variational problem.")  # Add message to fenics logs
-        nb_it, converged = self.newton_solver.solve(problem, self.u.vector())
+        nb_it, converged = self.newton_solver.solve(self.problem, self.u.vector())
         end()
 
+        if self.settings.modified_newton:
+            # refresh the Jacobian if convergence slowed down or failed
+            if not converged or nb_it > self.settings.jacobian_update_threshold:
+                self.refresh_jacobian()
+
         return nb_it, converged
 
     def update_previous_solutions(self):
+        if self.u_nm2 is not None:
+            self.u_nm2.assign(self.u_nm1)
+        if self.u_nm1 is not None:
+            self.u_nm1.assign(self.u_n)
         self.u_n.assign(self.u)
         self.traps.update_extrinsic_traps_density()
 
     def update_post_processing_solutions(self, exports):
-        if self.u.function_space().num_sub_spaces() == 0:
-            res = [self.u]
-        else:
-            res = list(self.u.split())
+        # the sub-functions share the vector of self.u so they are only
+        # created once
+        if self._post_processing_split is None or (
+            self._post_processing_split[0] is not self.u
+        ):
+            if self.u.function_space().num_sub_spaces() == 0:
+                res = [self.u]
+            else:
+                res = list(self.u.split())
+            self._post_processing_split = (self.u, res)
+        res = self._post_processing_split[1]
 
         for i, trap in enumerate(self.traps, 1):
             trap.post_processing_solution = res[i]
@@ -1,6 +1,10 @@
 import festim
 import xml.etree.ElementTree as ET
-from fenics import Expression, UserExpression, Constant
+from functools import lru_cache
+from numbers import Real
+from fenics import Expression, UserExpression, Constant, FunctionSpace, interpolate
+from ufl import Form, replace
+from ufl.algorithms import extract_coefficients
 import sympy as sp
 
 
@@ -17,14 +21,133 @@ def update_expressions(expressions, t):
     return expressions
 
 
-def as_expression(expr):
+def as_expression(expr, degree=2, **kwargs):
+    """Converts a sympy expression to a fenics.Expression. Whether the
+    expression depends on time is recorded (see is_time_dependent).
+
+    The numbers of the expression are passed as parameters of the
+    fenics.Expression (see canonical_ccode) so that expressions that only
+    differ by their numbers are JIT compiled once.
+
+    Args:
+        expr (sympy.Expr, float, fenics.Expression): the expression. If
+            already a fenics.Expression, it is returned as is.
+        degree (int, optional): the degree of the fenics.Expression.
+            Defaults to 2.
+
+    Returns:
+        fenics.Expression: the expression
+    """
     # if expr is already a fenics Expression, use it as is
     if isinstance(expr, (Expression, UserExpression)):
         return expr
     # else assume it's a sympy expression
     else:
-        expr_ccode = sp.printing.ccode(expr)
-        return Expression(expr_ccode, degree=2, t=0)
+        expr = sp.sympify(expr)
+        expr_ccode, parameters = canonical_ccode(expr)
+        expression = Expression(
+            expr_ccode, degree=degree, t=0, **dict(parameters), **kwargs
+        )
+        expression._time_dependent = festim.t in expr.free_symbols
+        return expression
+
+
+# numbers that define the structure of an expression rather than its
+# values (eg. -x, x**2, sqrt(x))
+_structural_numbers = [
+    sp.S.Zero,
+    sp.S.One,
+    sp.S.NegativeOne,
+    sp.Integer(2),
+    sp.Integer(-2),
+    sp.S.Half,
+    -sp.S.Half,
+]
+
+
+@lru_cache(maxsize=None)
+def canonical_ccode(expr):
+    """Returns the C++ code of a sympy expression where the numbers are
+    replaced by parameters prm_0, prm_1... The code only depends on the
+    structure of the expression, so that fenics.Expression made from
+    expressions that only differ by their numbers share the same JIT
+    compiled class. The results are cached.
+
+    Args:
+        expr (sympy.Expr): the expression
+
+    Returns:
+        str, tuple: the C++ code, the (name, value) pairs of the parameters
+    """
+    parameters = []
+
+    def replace_numbers(expr):
+        if expr.is_Number and not any(expr == n for n in _structural_numbers):
+            name = "prm_{}".format(len(parameters))
+            parameters.append((name, float(expr)))
+            return sp.Symbol(name)
+        if not expr.args:
+            return expr
+        args = [replace_numbers(arg) for arg in expr.args]
+        try:
+            return expr.func(*args, evaluate=False)
+        except TypeError:
+            return expr.func(*args)
+
+    code = sp.printing.ccode(replace_numbers(sp.sympify(expr)))
+    return code, tuple(parameters)
+
+
+def is_time_dependent(expression):
+    """Checks if an expression depends on time
+
+    Args:
+        expression (fenics.Expression): the expression
+
+    Returns:
+        bool: False if the expression was created by as_expression from a
+            sympy expression that doesn't depend on festim.t, else True
+    """
+    return getattr(expression, "_time_dependent", True)
+
+
+def freeze_expressions(form, expressions, mesh):
+    """Interpolates the time-independent expressions of a form on
+    functions once, so that they are not evaluated at each assembly, and
+    removes them and the duplicates from the list of expressions to update
+
+    Args:
+        form (ufl.Form): the form
+        expressions (list): the expressions to be updated at each time step
+        mesh (fenics.Mesh): the mesh
+
+    Returns:
+        ufl.Form, list: the form with the time-independent expressions
+            replaced, the expressions that still need updating
+    """
+    if isinstance(form, Form):
+        coefficients = [id(c) for c in extract_coefficients(form)]
+    else:
+        coefficients = []
+    frozen = {}
+    function_spaces = {}
+    time_dependent_expressions = []
+    for expression in expressions:
+        if any(expression is other for other in time_dependent_expressions):
+            continue
+        if is_time_dependent(expression):
+            time_dependent_expressions.append(expression)
+        elif id(expression) in coefficients and id(expression) not in frozen:
+            # an Expression is interpolated in its element when assembled
+            element = expression.ufl_element()
+            key = (element.family(), element.degree())
+            if key not in function_spaces:
+                function_spaces[key] = FunctionSpace(mesh, *key)
+            function = interpolate(expression, function_spaces[key])
+            frozen[id(expression)] = (expression, function)
+    if frozen:
+        form = replace(form, dict(frozen.values()))
+    return form, time_dependent_expressions
 
 
 def as_constant(constant):
@@ -40,8 +163,58 @@ def as_constant_or_expression(val):
     elif isinstance(val, (int, float)):
         return Constant(val)
     else:
-        expr_ccode = sp.printing.ccode(val)
-        return Expression(expr_ccode, degree=2, t=0)
+        return as_expression(val)
+
+
+def parameter_as_constant(obj, name, index=None):
+    """Returns a parameter of a FESTIM object (eg. the D_0 attribute of a
+    festim.Material) as a fenics.Constant. Forms using the constant don't
+    depend on its value so they are not recompiled when it changes (see
+    set_parameter). The constant is created once and stored in the
+    parameter_constants attribute of the object.
+
+    Args:
+        obj (object): the object (eg. festim.Material, festim.Trap)
+        name (str): the name of the parameter
+        index (int, optional): the index of the value if the parameter is a
+            list (eg. one value per material). Defaults to None.
+
+    Returns:
+        fenics.Constant: the parameter. Values that are not numbers (None,
+            functions, expressions...) are returned as is.
+    """
+    value = getattr(obj, name)
+    if index is not None:
+        value = value[index]
+    if not isinstance(value, Real) or isinstance(value, bool):
+        return value
+    constants = obj.__dict__.setdefault("parameter_constants", {})
+    if (name, index) not in constants:
+        constants[(name, index)] = Constant(value, name=name)
+    else:
+        # the attribute may have been modified directly
+        constants[(name, index)].assign(value)
+    return constants[(name, index)]
+
+
+def set_parameter(obj, name, value):
+    """Sets a parameter of a FESTIM object and updates the values of its
+    constants (see parameter_as_constant) in place
+
+    Args:
+        obj (object): the object (eg. festim.Material, festim.Trap)
+        name (str): the name of the parameter
+        value (float or list): the new value of the parameter
+
+    Raises:
+        AttributeError: if obj has no attribute name
+    """
+    if not hasattr(obj, name):
+        raise AttributeError("{} has no parameter {}".format(type(obj).__name__, name))
+    setattr(obj, name, value)
+    for (key, index), constant in obj.__dict__.get("parameter_constants", {}).items():
+        if key == name:
+            constant.assign(value if index is None else value[index])
 
 
 def kJmol_to_eV(energy):
@@ -1,4 +1,7 @@
-class InitialCondition:
+from festim import Specifiable
+
+
+class InitialCondition(Specifiable):
     """
     Args:
         field (int, str, optional): the field
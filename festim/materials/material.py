@@ -1,4 +1,7 @@
-class Material:
+from festim import Specifiable
+
+
+class Material(Specifiable):
     """
     Args:
         id (int, list): the id of the material. If a list is provided, the
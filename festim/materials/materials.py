@@ -1,14 +1,16 @@
 from operator import itemgetter
+from bisect import bisect_right
+from itertools import accumulate
 import warnings
 import numpy as np
-from festim import k_B, Material, HeatTransferProblem
+from festim import k_B, Material, HeatTransferProblem, Specifiable
 import festim
 import fenics as f
 from typing import Union
 import warnings
 
 
-class Materials(list):
+class Materials(Specifiable, list):
     """
     A list of festim.Material objects
     """
@@ -28,6 +30,12 @@ class Materials(list):
         self.heat_capacity = None
         self.density = None
         self.Q = None
+        # DG0 fields of the properties, updated by update_properties
+        self._property_fields = []
+
+        # lookup indexes, built on first use and reset when the list changes
+        self._id_index = None
+        self._borders_index = None
 
     @property
     def materials(self):
@@ -47,23 +55,65 @@ class Materials(list):
             if not all(isinstance(t, festim.Material) for t in value):
                 raise TypeError("materials must be a list of festim.Material")
             super().__init__(value)
+            self.reset_indexes()
         else:
             raise TypeError("materials must be a list")
 
     def __setitem__(self, index, item):
         super().__setitem__(index, self._validate_material(item))
+        self.reset_indexes()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.reset_indexes()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
 
     def insert(self, index, item):
         super().insert(index, self._validate_material(item))
+        self.reset_indexes()
 
     def append(self, item):
         super().append(self._validate_material(item))
+        self.reset_indexes()
 
     def extend(self, other):
         if isinstance(other, type(self)):
             super().extend(other)
         else:
             super().extend(self._validate_material(item) for item in other)
+        self.reset_indexes()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self.reset_indexes()
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self.reset_indexes()
+
+    def clear(self):
+        super().clear()
+        self.reset_indexes()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.reset_indexes()
+
+    def reverse(self):
+        super().reverse()
+        self.reset_indexes()
+
+    def reset_indexes(self):
+        """Resets the lookup indexes of find_material_from_id and
+        find_subdomain_from_x_coordinate, they will be rebuilt on next use.
+        This is done automatically when the list is modified but has to be
+        called if the borders of a material are modified."""
+        self._id_index = None
+        self._borders_index = None
 
     def _validate_material(self, value):
         if isinstance(value, festim.Material):
@@ -219,13 +269,25 @@ class Materials(list):
         Returns:
             festim.Material: the material that has the id mat_id
         """
+        if self._id_index is None:
+            self._build_id_index()
+        material = self._id_index.get(mat_id)
+        # the ids of the materials may have been modified since the index
+        # was built
+        if material is None or mat_id not in _as_list(material.id):
+            self._build_id_index()
+            material = self._id_index.get(mat_id)
+        if material is None:
+            raise ValueError("Couldn't find ID " + str(mat_id) + " in materials list")
+        return material
+
+    def _build_id_index(self):
+        """Builds the id -> material index"""
+        self._id_index = {}
         for material in self:
-            mat_ids = material.id
-            if type(mat_ids) is not list:
-                mat_ids = [mat_ids]
-            if mat_id in mat_ids:
-                return material
-        raise ValueError("Couldn't find ID " + str(mat_id) + " in materials list")
+            for mat_id in _as_list(material.id):
+                # the first material with this id is kept
+                self._id_index.setdefault(mat_id, material)
 
     def find_material_from_name(self, name):
         """Returns the material with the correct name
@@ -272,51 +334,211 @@ class Materials(list):
         Returns:
             int: the corresponding subdomain id
         """
-        for material in self:
+        if self._borders_index is None:
+            self._build_borders_index()
+        lower_bounds, max_upper_bounds, intervals, default = self._borders_index
+
+        # the intervals containing x start before x. They are scanned
+        # backwards until all the previous intervals end before x, so that
+        # overlapping or nested borders are found too
+        candidates = [default] if default is not None else []
+        position = bisect_right(lower_bounds, x) - 1
+        while position >= 0 and max_upper_bounds[position] >= x:
+            lower, upper, order, subdomain = intervals[position]
+            if lower <= x <= upper:
+                candidates.append((order, subdomain))
+            position -= 1
+        if not candidates:
+            # if no subdomain was found, return 0
+            return 0
+        # the first material of the list has priority
+        return min(candidates, key=itemgetter(0))[1]
+
+    def _build_borders_index(self):
+        """Builds the index of the borders of the materials: the intervals
+        sorted by lower bound, the running maximum of their upper bounds and
+        the first material without borders"""
+        intervals = []
+        default = None
+        for order, material in enumerate(self):
             # if no borders are provided, assume only one subdomain
             if material.borders is None:
-                return material.id
-            # else find the correct material
+                default = (order, material.id)
+                break
+            if isinstance(material.borders[0], list) and len(material.borders) > 1:
+                list_of_borders = material.borders
             else:
-                if isinstance(material.borders[0], list) and len(material.borders) > 1:
-                    list_of_borders = material.borders
-                else:
-                    list_of_borders = [material.borders]
-                if isinstance(material.id, list):
-                    subdomains = material.id
-                else:
-                    subdomains = [material.id for _ in range(len(list_of_borders))]
-
-                for borders, subdomain in zip(list_of_borders, subdomains):
-                    if borders[0] <= x <= borders[1]:
-                        return subdomain
-        # if no subdomain was found, return 0
-        return 0
+                list_of_borders = [material.borders]
+            if isinstance(material.id, list):
+                subdomains = material.id
+            else:
+                subdomains = [material.id for _ in range(len(list_of_borders))]
+
+            for borders, subdomain in zip(list_of_borders, subdomains):
+                intervals.append((borders[0], borders[1], order, subdomain))
+        intervals.sort(key=itemgetter(0, 2))
+        lower_bounds = [interval[0] for interval in intervals]
+        max_upper_bounds = list(
+            accumulate((interval[1] for interval in intervals), max)
+        )
+        self._borders_index = (lower_bounds, max_upper_bounds, intervals, default)
 
     def create_properties(self, vm, T):
-        """Creates the properties fields needed for post processing
+        """Creates the properties fields needed for post processing.
+        The properties are UFL expressions of T and of piecewise constant
+        (DG0) fields holding the parameters of each material, so that they
+        are compiled with the forms they are used in.
 
         Arguments:
             vm {fenics.MeshFunction()} -- volume markers
             T {fenics.Function()} -- temperature
         """
-        self.D = ArheniusCoeff(self, vm, T, "D_0", "E_D", degree=2)
+        V_DG0 = f.FunctionSpace(vm.mesh(), "DG", 0)
+        self._property_fields = []
+
+        def piecewise(values):
+            return self.create_property_field(vm, values, V=V_DG0)
+
+        self.D = self._arrhenius_property(piecewise, T, "D_0", "E_D")
         # all materials have the same properties so only checking the first is enough
         if self[0].S_0 is not None:
-            self.S = ArheniusCoeff(self, vm, T, "S_0", "E_S", degree=2)
+            self.S = self._arrhenius_property(piecewise, T, "S_0", "E_S")
         if self[0].thermal_cond is not None:
-            self.thermal_cond = ThermalProp(self, vm, T, "thermal_cond", degree=2)
-            self.heat_capacity = ThermalProp(self, vm, T, "heat_capacity", degree=2)
-            self.density = ThermalProp(self, vm, T, "rho", degree=2)
+            self.thermal_cond = self._thermal_property(piecewise, T, "thermal_cond")
+            self.heat_capacity = self._thermal_property(piecewise, T, "heat_capacity")
+            self.density = self._thermal_property(piecewise, T, "rho")
         if self[0].Q is not None:
-            self.Q = ThermalProp(self, vm, T, "Q", degree=2)
+            self.Q = self._thermal_property(piecewise, T, "Q")
+
+    def create_cell_field(self, vm, values, V=None):
+        """Creates a DG0 function equal to a given value in the subdomains of
+        each material and zero elsewhere
+
+        Args:
+            vm (fenics.MeshFunction): the volume markers
+            values (list): (festim.Material, float) pairs
+            V (fenics.FunctionSpace, optional): the DG0 function space. If
+                None, it is created. Defaults to None.
+
+        Returns:
+            fenics.Function: the piecewise constant field
+        """
+        if V is None:
+            V = f.FunctionSpace(vm.mesh(), "DG", 0)
+        field = f.Function(V)
+        self.fill_cell_field(field, vm, values)
+        return field
+
+    def fill_cell_field(self, field, vm, values):
+        """Sets the values of a DG0 field in the subdomains of each material
+        (zero elsewhere)
+
+        Args:
+            field (fenics.Function): the DG0 field
+            vm (fenics.MeshFunction): the volume markers
+            values (list): (festim.Material, float) pairs
+        """
+        V = field.function_space()
+        # dof of each cell
+        cell_dofs = np.asarray(
+            V.dofmap().entity_dofs(vm.mesh(), vm.dim()), dtype=np.int64
+        )
+        markers = vm.array()
+
+        array = np.zeros(field.vector().local_size())
+        # ghost cells have dofs that are not owned by this process
+        owned = cell_dofs < array.size
+        for material, value in values:
+            mat_ids = material.id if isinstance(material.id, list) else [material.id]
+            in_material = owned & np.isin(markers, mat_ids)
+            array[cell_dofs[in_material]] = value
+        field.vector().set_local(array)
+        field.vector().apply("insert")
+
+    def create_property_field(self, vm, values, V=None):
+        """Creates a DG0 field (see create_cell_field) that is updated in
+        place by update_properties()
+
+        Args:
+            vm (fenics.MeshFunction): the volume markers
+            values (callable): returns the (festim.Material, float) pairs
+            V (fenics.FunctionSpace, optional): the DG0 function space. If
+                None, it is created. Defaults to None.
+
+        Returns:
+            fenics.Function: the piecewise constant field
+        """
+        field = self.create_cell_field(vm, values(), V=V)
+        self._property_fields.append((field, vm, values))
+        return field
+
+    def update_properties(self):
+        """Updates the DG0 fields of the properties with the current
+        parameters of the materials. The fields are modified in place so
+        that the forms and the expressions using them are up to date without
+        being created again.
+        """
+        for field, vm, values in self._property_fields:
+            self.fill_cell_field(field, vm, values())
+
+    def _arrhenius_property(self, piecewise, T, pre_exp, E):
+        """Creates the property pre_exp * exp(-E/k_B/T)
+
+        Args:
+            piecewise (callable): creates a DG0 field from a function
+                returning (material, value) pairs
+            T (fenics.Function): the temperature
+            pre_exp (str): the name of the pre-exponential factor attribute
+            E (str): the name of the activation energy attribute
+
+        Returns:
+            ufl.core.expr.Expr: the property
+        """
+        pre_exp_field = piecewise(
+            lambda: [(mat, getattr(mat, pre_exp)) for mat in self]
+        )
+        E_field = piecewise(lambda: [(mat, getattr(mat, E)) for mat in self])
+        return pre_exp_field * f.exp(-E_field / k_B / T)
+
+    def _thermal_property(self, piecewise, T, key):
+        """Creates a property that can be a constant or a function of T in
+        each material
+
+        Args:
+            piecewise (callable): creates a DG0 field from a function
+                returning (material, value) pairs
+            T (fenics.Function): the temperature
+            key (str): the name of the attribute
+
+        Returns:
+            ufl.core.expr.Expr: the property
+        """
+        constant_materials = []
+        prop = 0
+        for mat in self:
+            attribute = getattr(mat, key)
+            if callable(attribute):
+                # the function of T is restricted to the material
+                prop += piecewise(lambda mat=mat: [(mat, 1)]) * attribute(T)
+            else:
+                constant_materials.append(mat)
+        if constant_materials:
+            prop += piecewise(
+                lambda: [(mat, getattr(mat, key)) for mat in constant_materials]
+            )
+        return prop
 
     def solubility_as_function(self, mesh, T):
         """
-        Makes solubility as a fenics.Function and stores it in S attribute
+        Makes solubility as a fenics.Function and stores it in S attribute.
+        If S is already a fenics.Function, it is updated in place.
         """
-        V = f.FunctionSpace(mesh.mesh, "DG", 1)
-        S = f.Function(V, name="S")
+        if isinstance(self.S, f.Function):
+            S = self.S
+            V = S.function_space()
+        else:
+            V = f.FunctionSpace(mesh.mesh, "DG", 1)
+            S = f.Function(V, name="S")
         vS = f.TestFunction(V)
         dx = mesh.dx
         F = 0
@@ -367,6 +589,10 @@ class Materials(list):
         self.sievert_marker = sievert
 
 
+def _as_list(mat_id):
+    return mat_id if isinstance(mat_id, list) else [mat_id]
+
+
 class ArheniusCoeff(f.UserExpression):
     def __init__(self, materials, vm, T, pre_exp, E, **kwargs):
         super().__init__(kwargs)
@@ -1,7 +1,8 @@
 import fenics as f
+from festim import Specifiable
 
 
-class Mesh:
+class Mesh(Specifiable):
     """
     Mesh class
 
@@ -63,6 +63,8 @@ class Mesh1D(Mesh):
         volume_markers = f.MeshFunction(
             "size_t", self.mesh, self.mesh.topology().dim(), 0
         )
+        # the borders may have been modified since the last lookup
+        materials.reset_indexes()
         # iterate through the cells of the mesh and mark them
         for cell in f.cells(self.mesh):
             x = cell.midpoint().x()
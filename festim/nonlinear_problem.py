@@ -11,12 +11,22 @@ class Problem(f.NonlinearProblem):
         J (ufl.Form): the Jacobian form of the variational problem
         F (ufl.Form): the form of the variational problem
         bcs (list): list of fenics.DirichletBC
+
+    Attributes:
+        reuse_jacobian (bool): if True, the Jacobian matrix is only
+            assembled when jacobian_up_to_date is False (modified Newton).
+            Leaving the matrix untouched also lets PETSc reuse its
+            factorisation. Defaults to False.
+        jacobian_up_to_date (bool): False if the Jacobian matrix needs to be
+            reassembled at the next call of J
     """
 
     def __init__(self, J, F, bcs):
         self.jacobian_form = J
         self.residual_form = F
         self.bcs = bcs
+        self.reuse_jacobian = False
+        self.jacobian_up_to_date = False
         self.assembler = f.SystemAssembler(
             self.jacobian_form, self.residual_form, self.bcs
         )
@@ -27,5 +37,10 @@ class Problem(f.NonlinearProblem):
         self.assembler.assemble(b, x)
 
     def J(self, A, x):
-        """Assembles the LHS in Ax=b and applies the boundary conditions"""
+        """Assembles the LHS in Ax=b and applies the boundary conditions.
+        If self.reuse_jacobian is True and the Jacobian is up to date, A is
+        left as is."""
+        if self.reuse_jacobian and self.jacobian_up_to_date and not A.empty():
+            return
         self.assembler.assemble(A)
+        self.jacobian_up_to_date = True
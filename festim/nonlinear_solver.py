@@ -0,0 +1,247 @@
+import fenics as f
+import numpy as np
+import itertools
+import weakref
+
+# number of solvers with PETSc options, to make their options prefixes unique
+_solvers_count = itertools.count()
+
+
+def set_petsc_options(solver, options_prefix, options):
+    """Sets the PETSc options of a solver in the global PETSc options
+    database. The options prefix is made unique to the solver so that the
+    options never apply to other solvers, and the options are removed from
+    the database when the solver is deleted.
+
+    Args:
+        solver (object): the solver
+        options_prefix (str): the prefix of the options
+        options (dict): the options without the leading "-" and the prefix.
+            A value of None sets a flag.
+
+    Returns:
+        str: the unique prefix of the options
+    """
+    options_prefix = "{}{}_".format(options_prefix, next(_solvers_count))
+    for key, value in options.items():
+        if value is None:
+            f.PETScOptions.set(options_prefix + key)
+        else:
+            f.PETScOptions.set(options_prefix + key, value)
+    weakref.finalize(solver, clear_petsc_options, options_prefix, list(options))
+    return options_prefix
+
+
+def clear_petsc_options(options_prefix, keys):
+    """Removes options from the global PETSc options database
+
+    Args:
+        options_prefix (str): the prefix of the options
+        keys (list of str): the options without the leading "-" and the
+            prefix
+    """
+    for key in keys:
+        f.PETScOptions.clear(options_prefix + key)
+
+
+def create_nonlinear_solver(
+    nonlinear_solver,
+    absolute_tolerance,
+    relative_tolerance,
+    maximum_iterations,
+    linear_solver,
+    preconditioner,
+    error_on_nonconvergence,
+    line_search="bt",
+    inexact_newton=False,
+    snes_options=None,
+    options_prefix="",
+):
+    """Creates a nonlinear solver and sets its parameters
+
+    Args:
+        nonlinear_solver (str): the type of nonlinear solver. "newton" for
+            fenics.NewtonSolver, "snes" for fenics.PETScSNESSolver
+        absolute_tolerance (float): the absolute tolerance of the solver
+        relative_tolerance (float): the relative tolerance of the solver
+        maximum_iterations (int): maximum iterations allowed for the solver
+            to converge
+        linear_solver (str): linear solver method
+        preconditioner (str): preconditioning method
+        error_on_nonconvergence (bool): if True, an error is raised when
+            the solver doesn't converge
+        line_search (str, optional): line search method of the SNES solver
+            ("basic", "bt", "cp", "l2", "nleqerr"). Only used if
+            nonlinear_solver is "snes". Defaults to "bt".
+        inexact_newton (bool, optional): if True, Eisenstat-Walker forcing
+            terms are used for the tolerances of the Krylov solves. Only used
+            if nonlinear_solver is "snes". Defaults to False.
+        snes_options (dict, optional): additional PETSc options passed to the
+            SNES solver (eg. {"snes_linesearch_damping": 0.8}). Keys are
+            given without the leading "-". A value of None sets a flag.
+            Only used if nonlinear_solver is "snes". Defaults to None.
+        options_prefix (str, optional): prefix of the PETSc options of the
+            SNES solver. It is made unique to the solver (see
+            set_petsc_options). Defaults to "".
+
+    Raises:
+        ValueError: if nonlinear_solver is not "newton" or "snes"
+
+    Returns:
+        fenics.NewtonSolver or fenics.PETScSNESSolver: the solver
+    """
+    if nonlinear_solver == "newton":
+        solver = f.NewtonSolver(f.MPI.comm_world)
+    elif nonlinear_solver == "snes":
+        solver = f.PETScSNESSolver(f.MPI.comm_world)
+        solver.parameters["method"] = "newtonls"
+        solver.parameters["line_search"] = line_search
+        solver.parameters["report"] = False
+
+        options = {}
+        if inexact_newton:
+            options["snes_ksp_ew"] = None
+        if snes_options is not None:
+            options.update(snes_options)
+        options_prefix = set_petsc_options(solver, options_prefix, options)
+        solver.set_options_prefix(options_prefix)
+    else:
+        raise ValueError("accepted values for nonlinear_solver are 'newton' and 'snes'")
+
+    solver.parameters["error_on_nonconvergence"] = error_on_nonconvergence
+    solver.parameters["absolute_tolerance"] = absolute_tolerance
+    solver.parameters["relative_tolerance"] = relative_tolerance
+    solver.parameters["maximum_iterations"] = maximum_iterations
+    solver.parameters["linear_solver"] = linear_solver
+    solver.parameters["preconditioner"] = preconditioner
+    return solver
+
+
+class FieldSplitNewtonSolver(f.NewtonSolver):
+    """Newton solver using a PETSc fieldsplit (block) preconditioner that
+    separates the trapped concentrations from the mobile concentration.
+
+    The trapping equations have no spatial derivatives so the traps block
+    is mass-matrix-like and purely local. By default, the traps are
+    eliminated with a Schur complement preconditioned with the diagonal of
+    the traps block, and the remaining mobile block is solved with algebraic
+    multigrid.
+
+    Args:
+        V (fenics.FunctionSpace): the mixed function space (mobile first,
+            then traps, then eventual adsorbed species)
+        nb_traps (int): the number of traps
+        absolute_tolerance (float): the absolute tolerance of the solver
+        relative_tolerance (float): the relative tolerance of the solver
+        maximum_iterations (int): maximum iterations allowed for the solver
+            to converge
+        error_on_nonconvergence (bool): if True, an error is raised when
+            the solver doesn't converge
+        fieldsplit_options (dict, optional): PETSc options overriding the
+            default options of the linear solver (see
+            default_fieldsplit_options), without the leading "-" and the
+            prefix. The splits are named "traps" and "mobile". Defaults to
+            None.
+        options_prefix (str, optional): prefix of the PETSc options of the
+            linear solver. It is made unique to the solver (see
+            set_petsc_options). Defaults to "".
+
+    Attributes:
+        krylov_solver (fenics.PETScKrylovSolver): the linear solver
+        options (dict): the PETSc options of the linear solver
+        options_prefix (str): the unique prefix of the PETSc options
+    """
+
+    default_fieldsplit_options = {
+        "ksp_type": "fgmres",
+        "ksp_rtol": 1e-8,
+        "pc_type": "fieldsplit",
+        "pc_fieldsplit_type": "schur",
+        "pc_fieldsplit_schur_fact_type": "full",
+        "pc_fieldsplit_schur_precondition": "selfp",
+        "fieldsplit_traps_ksp_type": "preonly",
+        "fieldsplit_traps_pc_type": "bjacobi",
+        "fieldsplit_mobile_ksp_type": "preonly",
+        "fieldsplit_mobile_pc_type": "gamg",
+    }
+
+    # with trapping terms integrated at the vertices, the traps block is
+    # diagonal and the selfp Schur complement is exact: the traps are
+    # eliminated locally, the mobile-sized Schur complement is factorised
+    # and the traps are recovered by back substitution
+    static_condensation_options = {
+        "ksp_type": "preonly",
+        "pc_fieldsplit_type": "schur",
+        "pc_fieldsplit_schur_fact_type": "full",
+        "pc_fieldsplit_schur_precondition": "selfp",
+        "fieldsplit_traps_ksp_type": "preonly",
+        "fieldsplit_traps_pc_type": "jacobi",
+        "fieldsplit_mobile_ksp_type": "preonly",
+        "fieldsplit_mobile_pc_type": "lu",
+        "fieldsplit_mobile_pc_factor_mat_solver_type": "mumps",
+    }
+
+    def __init__(
+        self,
+        V,
+        nb_traps,
+        absolute_tolerance,
+        relative_tolerance,
+        maximum_iterations,
+        error_on_nonconvergence,
+        fieldsplit_options=None,
+        options_prefix="",
+    ):
+        self.krylov_solver = f.PETScKrylovSolver()
+        f.NewtonSolver.__init__(
+            self, V.mesh().mpi_comm(), self.krylov_solver, f.PETScFactory.instance()
+        )
+        self.parameters["error_on_nonconvergence"] = error_on_nonconvergence
+        self.parameters["absolute_tolerance"] = absolute_tolerance
+        self.parameters["relative_tolerance"] = relative_tolerance
+        self.parameters["maximum_iterations"] = maximum_iterations
+
+        self.V = V
+        self.nb_traps = nb_traps
+        self.options = dict(self.default_fieldsplit_options)
+        if fieldsplit_options is not None:
+            self.options.update(fieldsplit_options)
+        self.options_prefix = set_petsc_options(self, options_prefix, self.options)
+        self.krylov_solver.set_options_prefix(self.options_prefix)
+        self._splits_defined = False
+
+    def index_sets(self):
+        """Creates the PETSc index sets of the traps and mobile blocks
+
+        Returns:
+            petsc4py.PETSc.IS, petsc4py.PETSc.IS: the traps and mobile index
+                sets
+        """
+        from petsc4py import PETSc
+
+        trap_dofs = np.concatenate(
+            [self.V.sub(i).dofmap().dofs() for i in range(1, self.nb_traps + 1)]
+        )
+        # mobile and eventual adsorbed species
+        other_dofs = np.setdiff1d(self.V.dofmap().dofs(), trap_dofs)
+
+        comm = self.V.mesh().mpi_comm()
+        traps_is = PETSc.IS().createGeneral(
+            np.sort(trap_dofs).astype(PETSc.IntType), comm=comm
+        )
+        mobile_is = PETSc.IS().createGeneral(
+            other_dofs.astype(PETSc.IntType), comm=comm
+        )
+        return traps_is, mobile_is
+
+    def solver_setup(self, A, P, problem, iteration):
+        """Sets the operator of the linear solver and, the first time, the
+        fieldsplit blocks"""
+        self.krylov_solver.set_operator(A)
+        if not self._splits_defined:
+            pc = self.krylov_solver.ksp().getPC()
+            pc.setType("fieldsplit")
+            traps_is, mobile_is = self.index_sets()
+            pc.setFieldSplitIS(("traps", traps_is), ("mobile", mobile_is))
+            self.krylov_solver.set_from_options()
+            self._splits_defined = True
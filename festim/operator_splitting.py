@@ -0,0 +1,332 @@
+import fenics as f
+import numpy as np
+import festim
+
+
+class OperatorSplittingSolver:
+    """Advances the hydrogen transport problem by one time step with a
+    first order (Lie) operator splitting:
+
+    1. the mobile concentration is advanced by solving the diffusion
+       problem (sources, fluxes and Dirichlet BCs but no trapping terms)
+       on the whole domain
+    2. the trapping/detrapping reactions
+       d c_t/dt = k c_m (n - c_t) - p c_t, d c_m/dt = - sum(d c_t/dt)
+       are integrated with an implicit Euler scheme at each vertex, all
+       vertices at once with NumPy
+
+    The trapping terms are lumped at the vertices (same quadrature as with
+    Settings.static_condensation) so that the reaction step is purely
+    local and conserves the total amount of hydrogen.
+
+    Args:
+        h_transport_problem (festim.HTransportProblem): the hydrogen
+            transport problem (with its concentrations initialised)
+
+    Attributes:
+        V (fenics.FunctionSpace): the CG1 function space of the mobile and
+            trapped concentrations
+        concentrations (list): fenics.Function of the mobile and trapped
+            concentrations at the current time step
+        previous_concentrations (list): fenics.Function of the mobile and
+            trapped concentrations at the previous time step
+        mobile (festim.Mobile): the mobile concentration of the diffusion
+            step
+        bcs (list): fenics.DirichletBC of the diffusion step
+        problem (festim.Problem): the nonlinear problem of the diffusion step
+        newton_solver (fenics.NewtonSolver or fenics.PETScSNESSolver): the
+            solver of the diffusion step
+    """
+
+    def __init__(self, h_transport_problem) -> None:
+        self.h_transport_problem = h_transport_problem
+        self.settings = h_transport_problem.settings
+
+        self.V = None
+        self.concentrations = None
+        self.previous_concentrations = None
+        self.mobile = None
+        self.bcs = None
+        self.problem = None
+        self.newton_solver = None
+
+    def check_compatibility(self):
+        """Checks that the problem can be solved with operator splitting
+
+        Raises:
+            ValueError: if the traps are not continuous
+            NotImplementedError: if the problem has features that are not
+                supported with operator splitting
+        """
+        h_transport_problem = self.h_transport_problem
+        if self.settings.traps_element_type != "CG":
+            raise ValueError("operator splitting requires CG traps")
+        if self.settings.chemical_pot:
+            raise NotImplementedError(
+                "operator splitting is not implemented with conservation of chemical potential"
+            )
+        if len(h_transport_problem._all_surf_kinetics) > 0:
+            raise NotImplementedError(
+                "operator splitting is not implemented with SurfaceKinetics"
+            )
+        for trap in h_transport_problem.traps:
+            if trap.sources:
+                raise NotImplementedError(
+                    "operator splitting is not implemented with sources on traps"
+                )
+        accepted_fields = [0, "0", "solute", "T"]
+        for bc in h_transport_problem.boundary_conditions:
+            if isinstance(bc, festim.DirichletBC) and bc.field not in accepted_fields:
+                raise NotImplementedError(
+                    "operator splitting is not implemented with Dirichlet BCs on traps"
+                )
+
+    def initialise(self, materials, mesh, dt):
+        """Creates the diffusion problem and the lumped trapping
+        coefficients. Has to be called after the Dirichlet BCs of the
+        hydrogen transport problem have been created.
+
+        Args:
+            materials (festim.Materials): the materials
+            mesh (festim.Mesh): the mesh
+            dt (festim.Stepsize): the stepsize
+        """
+        self.check_compatibility()
+        h_transport_problem = self.h_transport_problem
+        traps = h_transport_problem.traps
+        V = h_transport_problem.V_CG1
+        self.V = V
+
+        nb_fields = len(traps) + 1
+        self.concentrations = [f.Function(V) for _ in range(nb_fields)]
+        self.previous_concentrations = [f.Function(V) for _ in range(nb_fields)]
+        self.assigner_to_u = f.FunctionAssigner(h_transport_problem.V, [V] * nb_fields)
+        self.assigner_from_u = f.FunctionAssigner(
+            [V] * nb_fields, h_transport_problem.V
+        )
+
+        self.define_diffusion_problem(materials, mesh, dt)
+        self.define_trapping_coefficients(mesh)
+
+    def define_diffusion_problem(self, materials, mesh, dt):
+        """Creates the variational problem of the diffusion step, its
+        Dirichlet BCs and its nonlinear solver
+
+        Args:
+            materials (festim.Materials): the materials
+            mesh (festim.Mesh): the mesh
+            dt (festim.Stepsize): the stepsize
+        """
+        h_transport_problem = self.h_transport_problem
+        mobile = festim.Mobile()
+        mobile.solution = self.concentrations[0]
+        mobile.previous_solution = self.previous_concentrations[0]
+        mobile.test_function = f.TestFunction(self.V)
+        mobile.sources = h_transport_problem.mobile.sources
+        mobile.boundary_conditions = h_transport_problem.mobile.boundary_conditions
+        mobile.create_form(
+            materials, mesh, h_transport_problem.T, dt, soret=self.settings.soret
+        )
+        self.mobile = mobile
+        # the fluxes forms have been recreated with their own expressions
+        h_transport_problem.expressions += mobile.sub_expressions
+
+        # reuse the values of the Dirichlet BCs of the monolithic problem
+        self.bcs = []
+        for bc in h_transport_problem.boundary_conditions:
+            if isinstance(bc, festim.DirichletBC) and bc.field != "T":
+                if bc.boundary_values is None:
+                    value = bc.expression
+                else:
+                    value = bc.boundary_values
+                for surface in bc.surfaces:
+                    self.bcs.append(
+                        f.DirichletBC(self.V, value, mesh.surface_markers, surface)
+                    )
+
+        du = f.TrialFunction(self.V)
+        J = f.derivative(mobile.F, mobile.solution, du)
+        self.problem = festim.Problem(J, mobile.F, self.bcs)
+        self.problem.reuse_jacobian = self.settings.modified_newton
+
+        self.newton_solver = festim.create_nonlinear_solver(
+            nonlinear_solver=self.settings.nonlinear_solver,
+            absolute_tolerance=self.settings.absolute_tolerance,
+            relative_tolerance=self.settings.relative_tolerance,
+            maximum_iterations=self.settings.maximum_iterations,
+            linear_solver=self.settings.linear_solver,
+            preconditioner=self.settings.preconditioner,
+            error_on_nonconvergence=False,
+            line_search=self.settings.line_search,
+            inexact_newton=self.settings.inexact_newton,
+            snes_options=self.settings.snes_options,
+            options_prefix="diffusion_",
+        )
+
+    def define_trapping_coefficients(self, mesh):
+        """Creates the forms of the trapping coefficients lumped at the
+        vertices: for each trap, k, k*n and p weighted by the vertex
+        quadrature of the materials the trap lives in
+
+        Args:
+            mesh (festim.Mesh): the mesh
+        """
+        T = self.h_transport_problem.T
+        v = f.TestFunction(self.V)
+        dx_vertex = mesh.dx(scheme="vertex", degree=1)
+        self.lumped_mass = f.assemble(v * dx_vertex).get_local()
+
+        self.trapping_forms = []
+        self.trapping_vectors = []
+        for trap in self.h_transport_problem.traps:
+            form_k, form_kn, form_p = 0, 0, 0
+            for i, mat in enumerate(trap.materials):
+                if type(trap.k_0) is list:
+                    index, density = i, trap.density[i]
+                else:
+                    index, density = None, trap.density[0]
+                k_0 = festim.parameter_as_constant(trap, "k_0", index)
+                E_k = festim.parameter_as_constant(trap, "E_k", index)
+                p_0 = festim.parameter_as_constant(trap, "p_0", index)
+                E_p = festim.parameter_as_constant(trap, "E_p", index)
+                k = k_0 * f.exp(-E_k / festim.k_B / T.T)
+                p = p_0 * f.exp(-E_p / festim.k_B / T.T)
+                form_k += k * v * dx_vertex(mat.id)
+                form_kn += k * density * v * dx_vertex(mat.id)
+                form_p += p * v * dx_vertex(mat.id)
+            self.trapping_forms.append((form_k, form_kn, form_p))
+            self.trapping_vectors.append(
+                tuple(f.assemble(form) for form in (form_k, form_kn, form_p))
+            )
+
+    def compute_trapping_coefficients(self):
+        """Assembles the lumped trapping coefficients at the vertices
+
+        Returns:
+            numpy.ndarray, numpy.ndarray, numpy.ndarray: the trapping rate k,
+                the product k*n and the detrapping rate p of each trap
+                (shape (nb_traps, nb_dofs))
+        """
+        k, kn, p = [], [], []
+        for forms, vectors in zip(self.trapping_forms, self.trapping_vectors):
+            # assemble in the preallocated vectors
+            for form, vector in zip(forms, vectors):
+                f.assemble(form, tensor=vector)
+            k.append(vectors[0].get_local())
+            kn.append(vectors[1].get_local())
+            p.append(vectors[2].get_local())
+        return (
+            np.array(k) / self.lumped_mass,
+            np.array(kn) / self.lumped_mass,
+            np.array(p) / self.lumped_mass,
+        )
+
+    def solve_reactions(self, c_m_0, c_t_0, k, kn, p, dt):
+        """Integrates the trapping/detrapping reactions over a time step with
+        an implicit Euler scheme, independently at each dof.
+
+        For a given mobile concentration c_m, the implicit trapped
+        concentrations are explicit:
+        c_t(c_m) = (c_t_0 + dt*k*n*c_m)/(1 + dt*k*c_m + dt*p)
+        and conservation of hydrogen c_m + sum(c_t) = c_m_0 + sum(c_t_0) is a
+        scalar equation in c_m solved with Newton iterations. For
+        non-negative concentrations the physical root lies between 0 and
+        c_m_0 + sum(c_t_0): the iterates are kept in this interval by
+        bisection, since for large time steps a Newton step can reach a
+        spurious negative root.
+
+        Args:
+            c_m_0 (numpy.ndarray): the mobile concentration before the
+                reactions (shape (nb_dofs,))
+            c_t_0 (numpy.ndarray): the trapped concentrations before the
+                reactions (shape (nb_traps, nb_dofs))
+            k (numpy.ndarray): the trapping rates
+            kn (numpy.ndarray): the trapping rates times the trap densities
+            p (numpy.ndarray): the detrapping rates
+            dt (float): the time step (s)
+
+        Returns:
+            numpy.ndarray, numpy.ndarray, bool: the mobile and trapped
+                concentrations after the reactions, True if converged
+        """
+
+        def residual(c_m):
+            c_t = (c_t_0 + dt * kn * c_m) / (1 + dt * (k * c_m + p))
+            return c_m - c_m_0 + np.sum(c_t - c_t_0, axis=0), c_t
+
+        scale = np.max(np.abs(c_m_0) + np.sum(np.abs(c_t_0), axis=0), initial=0)
+        tolerance = self.settings.relative_tolerance * scale
+
+        # bracket of the root where it is valid
+        lower = np.zeros_like(c_m_0)
+        upper = c_m_0 + np.sum(c_t_0, axis=0)
+        bracketed = (upper >= 0) & (residual(lower)[0] <= 0)
+        lower[~bracketed] = -np.inf
+        upper[~bracketed] = np.inf
+
+        c_m = c_m_0.copy()
+        for _ in range(self.settings.maximum_iterations):
+            res, c_t = residual(c_m)
+            if np.max(np.abs(res), initial=0) <= tolerance:
+                return c_m, c_t, True
+            upper = np.where(bracketed & (res > 0), np.minimum(upper, c_m), upper)
+            lower = np.where(bracketed & (res < 0), np.maximum(lower, c_m), lower)
+            denominator = 1 + dt * (k * c_m + p)
+            derivative = 1 + np.sum(
+                dt * (kn * (1 + dt * p) - k * c_t_0) / denominator**2, axis=0
+            )
+            c_m = c_m - res / derivative
+            outside = ~((c_m > lower) & (c_m < upper))
+            c_m[outside] = (0.5 * (lower + upper))[outside]
+        res, c_t = residual(c_m)
+        return c_m, c_t, np.max(np.abs(res), initial=0) <= tolerance
+
+    def solve(self, dt):
+        """Advances the concentrations from u_n to u over one time step
+
+        Args:
+            dt (festim.Stepsize): the stepsize
+
+        Returns:
+            int, bool: number of iterations of the diffusion step, True if
+                both steps converged else False
+        """
+        h_transport_problem = self.h_transport_problem
+        self.assigner_from_u.assign(
+            self.previous_concentrations, h_transport_problem.u_n
+        )
+
+        # diffusion step
+        mobile = self.concentrations[0]
+        mobile.assign(self.previous_concentrations[0])
+        f.begin("Solving diffusion step.")
+        nb_it, converged = self.newton_solver.solve(self.problem, mobile.vector())
+        f.end()
+        if not converged:
+            return nb_it, False
+
+        # reaction step
+        k, kn, p = self.compute_trapping_coefficients()
+        c_m_0 = mobile.vector().get_local()
+        c_t_0 = np.array(
+            [c.vector().get_local() for c in self.previous_concentrations[1:]]
+        )
+        c_m, c_t, converged = self.solve_reactions(
+            c_m_0, c_t_0, k, kn, p, float(dt.value)
+        )
+
+        mobile.vector().set_local(c_m)
+        mobile.vector().apply("insert")
+        for bc in self.bcs:
+            bc.apply(mobile.vector())
+        for concentration, values in zip(self.concentrations[1:], c_t):
+            concentration.vector().set_local(values)
+            concentration.vector().apply("insert")
+        self.assigner_to_u.assign(h_transport_problem.u, self.concentrations)
+
+        if self.settings.modified_newton and (
+            not converged or nb_it > self.settings.jacobian_update_threshold
+        ):
+            self.problem.jacobian_up_to_date = False
+
+        return nb_it, converged
@@ -1,4 +1,8 @@
-class Settings:
+from festim import Specifiable
+import warnings
+
+
+class Settings(Specifiable):
     """
     Args:
         absolute_tolerance (float): the absolute tolerance of the newton
@@ -18,16 +22,59 @@ class Settings:
         traps_element_type (str, optional): Finite element used for traps.
             If traps densities are discontinuous (eg. different materials)
             "DG" is recommended. Defaults to "CG".
-        update_jacobian (bool, optional): If set to False, the Jacobian of
-            the formulation will be computed only once at the beggining.
-            Else it will be computed at each time step. Defaults to True.
+        update_jacobian (bool, optional): Deprecated, kept for backwards
+            compatibility. The Jacobian form is now always computed once
+            when the HTransportProblem is initialised and reused at each
+            time step. Defaults to True.
         linear_solver (str, optional): linear solver method for the newton solver,
             options can be viewed by print(list_linear_solver_methods()).
             More information can be found at: https://fenicsproject.org/pub/tutorial/html/._ftut1017.html.
             Defaults to None, for the newton solver this is: "umfpack".
         preconditioner (str, optional): preconditioning method for the newton solver,
             options can be viewed by print(list_krylov_solver_preconditioners()).
+            If "fieldsplit", a block preconditioner separating the traps
+            from the mobile concentration is used (see
+            festim.FieldSplitNewtonSolver) and linear_solver is ignored.
             Defaults to "default".
+        modified_newton (bool, optional): If True, the assembled Jacobian
+            (and its factorisation with direct solvers) is kept across
+            Newton iterations and time steps. It is only refreshed when the
+            convergence slows down, the stepsize changes or a step fails.
+            Defaults to False.
+        jacobian_update_threshold (int, optional): with modified_newton,
+            the Jacobian is refreshed if the Newton solver needed more
+            iterations than this threshold. Defaults to 3.
+        nonlinear_solver (str, optional): the nonlinear solver. "newton" for
+            fenics.NewtonSolver or "snes" for a PETSc SNES solver with line
+            search (fenics.PETScSNESSolver). Defaults to "newton".
+        line_search (str, optional): line search method of the SNES solver
+            ("basic", "bt", "cp", "l2", "nleqerr"). Only used if
+            nonlinear_solver is "snes". Defaults to "bt".
+        inexact_newton (bool, optional): if True, Eisenstat-Walker forcing
+            terms are used for the Krylov solves of the SNES solver.
+            Defaults to False.
+        snes_options (dict, optional): additional PETSc options passed to the
+            SNES solver, without the leading "-"
+            (eg. {"snes_linesearch_maxstep": 1e10}). Defaults to None.
+        fieldsplit_options (dict, optional): PETSc options overriding the
+            default options of the fieldsplit preconditioner, without the
+            leading "-" (eg. {"fieldsplit_mobile_pc_type": "hypre"}). Only
+            used if preconditioner is "fieldsplit". Defaults to None.
+        static_condensation (bool, optional): If True, the trapping terms
+            are integrated at the mesh vertices (mass lumping) so that trap
+            unknowns can be eliminated locally. Only a system of the size of
+            the mobile concentration is then factorised and the traps are
+            recovered afterwards. Defaults to False.
+        operator_splitting (bool, optional): If True, transient problems
+            with traps are solved by operator splitting: a diffusion problem
+            for the mobile concentration is solved on the whole domain, then
+            the trapping reactions are integrated independently at each
+            vertex (see festim.OperatorSplittingSolver). First order in
+            time. Defaults to False.
+        predictor (str, optional): initial guess of the Newton solver at
+            each time step. None for the previous solution, "linear" or
+            "quadratic" for an extrapolation of the two or three previous
+            steps accounting for variable stepsizes. Defaults to None.
 
     Attributes:
         transient (bool): transient or steady state sim
@@ -41,9 +88,26 @@ class Settings:
         maximum_iterations (int): maximum iterations allowed for
             the solver to converge
         traps_element_type (str): Finite element used for traps.
-        update_jacobian (bool):
+        update_jacobian (bool): deprecated, has no effect
         linear_solver (str): linear solver method for the newton solver
         precondtitioner (str): preconditioning method for the newton solver
+        modified_newton (bool): if True, the Jacobian is reused across Newton
+            iterations and time steps
+        jacobian_update_threshold (int): number of Newton iterations above
+            which the Jacobian is refreshed with modified_newton
+        nonlinear_solver (str): the nonlinear solver ("newton" or "snes")
+        line_search (str): line search method of the SNES solver
+        inexact_newton (bool): Eisenstat-Walker forcing terms for the SNES
+            solver
+        snes_options (dict): additional PETSc options for the SNES solver
+        fieldsplit_options (dict): PETSc options for the fieldsplit
+            preconditioner
+        static_condensation (bool): if True, trap unknowns are eliminated
+            before the linear solve
+        operator_splitting (bool): if True, diffusion and trapping are
+            solved separately
+        predictor (str): initial guess of the Newton solver at each time
+            step (None, "linear" or "quadratic")
     """
 
     def __init__(
@@ -59,6 +123,16 @@ class Settings:
         update_jacobian=True,
         linear_solver=None,
         preconditioner="default",
+        modified_newton=False,
+        jacobian_update_threshold=3,
+        nonlinear_solver="newton",
+        line_search="bt",
+        inexact_newton=False,
+        snes_options=None,
+        fieldsplit_options=None,
+        static_condensation=False,
+        operator_splitting=False,
+        predictor=None,
     ):
         # TODO maybe transient and final_time are redundant
         self.transient = transient
@@ -74,3 +148,26 @@ class Settings:
         self.update_jacobian = update_jacobian
         self.linear_solver = linear_solver
         self.preconditioner = preconditioner
+        self.modified_newton = modified_newton
+        self.jacobian_update_threshold = jacobian_update_threshold
+        self.nonlinear_solver = nonlinear_solver
+        self.line_search = line_search
+        self.inexact_newton = inexact_newton
+        self.snes_options = snes_options
+        self.fieldsplit_options = fieldsplit_options
+        self.static_condensation = static_condensation
+        self.operator_splitting = operator_splitting
+        self.predictor = predictor
+
+    @property
+    def update_jacobian(self):
+        return self._update_jacobian
+
+    @update_jacobian.setter
+    def update_jacobian(self, value):
+        if value is False:
+            warnings.warn(
+                "update_jacobian is deprecated and has no effect, the Jacobian form is always reused at each time step",
+                DeprecationWarning,
+            )
+        self._update_jacobian = value
@@ -1,8 +1,9 @@
+from festim import as_expression, Specifiable
 from fenics import Constant, Expression, Function, UserExpression
 import sympy as sp
 
 
-class Source:
+class Source(Specifiable):
     """
     Volumetric source term.
 
@@ -28,6 +29,6 @@ class Source:
         if isinstance(value, (float, int)):
             self.value = Constant(value)
         elif isinstance(value, sp.Expr):
-            self.value = Expression(sp.printing.ccode(value), t=0, degree=2)
+            self.value = as_expression(value, degree=2)
         elif isinstance(value, (Expression, UserExpression, Function)):
             self.value = value
@@ -0,0 +1,395 @@
+import festim
+import hashlib
+import importlib
+import inspect
+import numpy as np
+import sympy as sp
+import types
+
+
+class Specifiable:
+    """Base class of the FESTIM objects that can be described by a
+    festim.ComponentSpec. Records the arguments the object is created with.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        obj = super().__new__(cls)
+        obj._spec_arguments = (args, kwargs)
+        return obj
+
+
+class _List(tuple):
+    """A list in a specification"""
+
+
+class _Dict(tuple):
+    """A dict in a specification, as a tuple of (key, value) pairs"""
+
+
+class _Array(tuple):
+    """A numpy.ndarray in a specification, as (values, shape, dtype)"""
+
+
+class _Reference(tuple):
+    """A reference to an object of the model (name, index), eg. the
+    materials of a trap ("materials", 0)"""
+
+
+class ComponentSpec:
+    """Plain-data description of a FESTIM object (eg. a festim.Material): its
+    class and the arguments to create it. Picklable and hashable.
+
+    Args:
+        cls (str): the class as "module:qualname"
+        args (tuple): the positional arguments
+        kwargs (tuple): the keyword arguments as (name, value) pairs
+
+    Attributes:
+        cls (str): the class as "module:qualname"
+        args (tuple): the positional arguments
+        kwargs (tuple): the keyword arguments as (name, value) pairs
+    """
+
+    def __init__(self, cls, args=(), kwargs=()) -> None:
+        self.cls = cls
+        self.args = tuple(args)
+        self.kwargs = tuple(kwargs)
+
+    def _key(self):
+        return (self.cls, self.args, self.kwargs)
+
+    def __eq__(self, other):
+        return isinstance(other, ComponentSpec) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        arguments = [repr(arg) for arg in self.args]
+        arguments += ["{}={!r}".format(name, value) for name, value in self.kwargs]
+        return "{}({})".format(self.cls.split(":")[-1], ", ".join(arguments))
+
+    def build(self, references=None):
+        """Creates the FESTIM object
+
+        Args:
+            references (dict, optional): the objects referenced in the
+                arguments {name: list of objects} (eg. {"materials": [...]}).
+                Defaults to None.
+
+        Returns:
+            object: the FESTIM object
+        """
+        module, qualname = self.cls.split(":")
+        cls = importlib.import_module(module)
+        for name in qualname.split("."):
+            cls = getattr(cls, name)
+        args = [_build(arg, references) for arg in self.args]
+        kwargs = {name: _build(value, references) for name, value in self.kwargs}
+        return cls(*args, **kwargs)
+
+
+def _build(value, references):
+    """Converts a value of a specification back to the objects it
+    describes"""
+    if isinstance(value, ComponentSpec):
+        return value.build(references)
+    if isinstance(value, _Reference):
+        name, index = value
+        return references[name][index]
+    if isinstance(value, _List):
+        return [_build(item, references) for item in value]
+    if isinstance(value, _Dict):
+        return {key: _build(item, references) for key, item in value}
+    if isinstance(value, _Array):
+        values, shape, dtype = value
+        return np.array(values, dtype=dtype).reshape(shape)
+    if isinstance(value, tuple):
+        return tuple(_build(item, references) for item in value)
+    return value
+
+
+def _function_content(function):
+    """Returns what determines the values of a function: its code, the
+    plain data global variables it uses, its default arguments and the values
+    of its closure. The name of a function is not enough since its body can
+    be modified between two runs."""
+    code = function.__code__
+    global_values = tuple(
+        (name, function.__globals__[name])
+        for name in code.co_names
+        if isinstance(function.__globals__.get(name), (int, float, complex, str))
+    )
+    closure = tuple(cell.cell_contents for cell in function.__closure__ or ())
+    kwdefaults = tuple(sorted((function.__kwdefaults__ or {}).items()))
+    return (code, global_values, function.__defaults__, kwdefaults, closure)
+
+
+def _canonical(value):
+    """Returns a string describing a value of a specification that does not
+    depend on the Python process (unlike hash() of strings)"""
+    if isinstance(value, ComponentSpec):
+        return "{}({};{})".format(
+            value.cls, _canonical(value.args), _canonical(value.kwargs)
+        )
+    if isinstance(value, sp.Basic):
+        return "sympy:" + sp.srepr(value)
+    if isinstance(value, types.FunctionType):
+        return "function:{}.{}({})".format(
+            value.__module__, value.__qualname__, _canonical(_function_content(value))
+        )
+    if isinstance(value, types.BuiltinFunctionType):
+        return "function:{}.{}".format(value.__module__, value.__qualname__)
+    if isinstance(value, types.CodeType):
+        return "code:{}{}".format(
+            hashlib.sha256(value.co_code).hexdigest(),
+            _canonical((value.co_consts, value.co_names)),
+        )
+    if isinstance(value, tuple):
+        return "{}[{}]".format(
+            type(value).__name__, ",".join(_canonical(item) for item in value)
+        )
+    return "{}:{!r}".format(type(value).__name__, value)
+
+
+class _Converter:
+    """Converts FESTIM objects to plain data
+
+    Args:
+        references (dict, optional): the objects that are referenced rather
+            than described {id(object): (name, index)}. Defaults to None.
+        containers (list, optional): the objects whose items are described
+            even if they are in references. Defaults to None.
+    """
+
+    def __init__(self, references=None, containers=None) -> None:
+        self.references = references or {}
+        self.containers = containers or []
+
+    def convert(self, value, reference=True):
+        if value is None or isinstance(value, (bool, int, float, complex, str)):
+            return value
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return _Array(
+                (tuple(value.ravel().tolist()), value.shape, str(value.dtype))
+            )
+        if isinstance(value, sp.Basic):
+            return value
+        if isinstance(value, Specifiable):
+            if reference and id(value) in self.references:
+                return _Reference(self.references[id(value)])
+            return self.component(value)
+        if isinstance(value, list):
+            return _List(self.convert(item) for item in value)
+        if isinstance(value, tuple):
+            return tuple(self.convert(item) for item in value)
+        if isinstance(value, dict):
+            return _Dict((key, self.convert(item)) for key, item in value.items())
+        if isinstance(value, (types.FunctionType, types.BuiltinFunctionType)):
+            if "<" in value.__qualname__:
+                raise TypeError(
+                    "{} cannot be pickled, use a function defined at the top level of a module".format(
+                        value.__qualname__
+                    )
+                )
+            return value
+        raise TypeError(
+            "{} cannot be part of a model specification".format(type(value).__name__)
+        )
+
+    def component(self, obj):
+        """Describes a FESTIM object by the arguments it was created with.
+        The arguments that are also attributes of the object are taken from
+        the attributes if they are plain data, so that modifications made
+        after the creation are taken into account.
+
+        Args:
+            obj (festim.Specifiable): the object
+
+        Returns:
+            festim.ComponentSpec: the description of the object
+        """
+        cls = type(obj)
+        args, kwargs = obj._spec_arguments
+        signature = inspect.signature(cls.__init__)
+        signature = signature.replace(
+            parameters=list(signature.parameters.values())[1:]  # without self
+        )
+        bound = signature.bind(*args, **kwargs)
+        for name, parameter in signature.parameters.items():
+            if parameter.kind == parameter.VAR_POSITIONAL:
+                if isinstance(obj, list):
+                    # the current items of festim.Materials, festim.Traps...
+                    is_container = any(obj is other for other in self.containers)
+                    items = [
+                        self.convert(item, reference=not is_container) for item in obj
+                    ]
+                    bound.arguments[name] = (_List(items),)
+                elif name in bound.arguments:
+                    bound.arguments[name] = self.convert(bound.arguments[name])
+            elif parameter.kind == parameter.VAR_KEYWORD:
+                if name in bound.arguments:
+                    bound.arguments[name] = {
+                        key: self.argument(obj, key, value)
+                        for key, value in bound.arguments[name].items()
+                    }
+            elif name in bound.arguments:
+                bound.arguments[name] = self.argument(obj, name, bound.arguments[name])
+            elif hasattr(obj, name):
+                # an attribute modified after the creation
+                value = self.argument(obj, name, parameter.default)
+                if value != self.convert(parameter.default):
+                    bound.arguments[name] = value
+        return ComponentSpec(
+            "{}:{}".format(cls.__module__, cls.__qualname__),
+            bound.args,
+            sorted(bound.kwargs.items()),
+        )
+
+    def argument(self, obj, name, value):
+        """Converts an argument of obj, from the attribute with the same name
+        if it is plain data or else from the value it was created with"""
+        if hasattr(obj, name):
+            try:
+                return self.convert(getattr(obj, name))
+            except TypeError:
+                pass
+        return self.convert(value)
+
+
+class ModelSpec:
+    """Plain-data description of a festim.Simulation: its mesh, materials,
+    traps, boundary conditions, sources, settings, stepsize, temperature,
+    initial conditions and exports. Unlike the Simulation, it holds no
+    FEniCS object so it is cheap to pickle (eg. to send to other processes)
+    and it can be hashed and compared.
+
+    Usage:
+        spec = festim.ModelSpec.from_simulation(my_model)
+        my_model_copy = spec.to_simulation()
+
+    The objects are described by the arguments they were created with
+    (updated with the current values of the attributes of the same name).
+    Functions (eg. a thermal conductivity depending on T) have to be defined
+    at the top level of a module to be pickled.
+
+    Args:
+        **components: the arguments of festim.Simulation (mesh, materials,
+            sources, boundary_conditions, traps, dt, settings, temperature,
+            initial_conditions, exports, log_level) as plain data
+    """
+
+    fields = (
+        "mesh",
+        "materials",
+        "sources",
+        "boundary_conditions",
+        "traps",
+        "dt",
+        "settings",
+        "temperature",
+        "initial_conditions",
+        "exports",
+        "log_level",
+    )
+
+    def __init__(self, **components) -> None:
+        for name in components:
+            if name not in self.fields:
+                raise TypeError("unknown component {}".format(name))
+        for name in self.fields:
+            setattr(self, name, components.get(name))
+
+    def _key(self):
+        return tuple(getattr(self, name) for name in self.fields)
+
+    def __eq__(self, other):
+        return isinstance(other, ModelSpec) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        components = [
+            "{}={!r}".format(name, getattr(self, name))
+            for name in self.fields
+            if getattr(self, name) is not None
+        ]
+        return "ModelSpec({})".format(", ".join(components))
+
+    def digest(self):
+        """Returns a digest of the specification that is the same in all
+        Python processes (eg. to identify results stored on disk)
+
+        Returns:
+            str: the SHA-256 digest in hexadecimal
+        """
+        return hashlib.sha256(_canonical(self._key()).encode()).hexdigest()
+
+    @classmethod
+    def from_simulation(cls, simulation):
+        """Describes a festim.Simulation
+
+        Args:
+            simulation (festim.Simulation): the simulation
+
+        Raises:
+            TypeError: if a component cannot be described with plain data
+                (eg. a festim.Mesh created from a fenics.Mesh)
+
+        Returns:
+            festim.ModelSpec: the description of the simulation
+        """
+        references = {}
+        containers = []
+        for name, container in [
+            ("materials", simulation.materials),
+            ("traps", simulation.traps),
+        ]:
+            if container is not None:
+                containers.append(container)
+                for index, obj in enumerate(container):
+                    references[id(obj)] = (name, index)
+        converter = _Converter(references, containers)
+        components = {
+            "mesh": simulation.mesh,
+            "materials": simulation.materials,
+            "sources": simulation.sources,
+            "boundary_conditions": simulation.boundary_conditions,
+            "traps": simulation.traps,
+            "dt": simulation.dt,
+            "settings": simulation.settings,
+            "temperature": simulation.T,
+            "initial_conditions": simulation.initial_conditions,
+            "exports": simulation.exports,
+            "log_level": simulation.log_level,
+        }
+        return cls(
+            **{name: converter.convert(value) for name, value in components.items()}
+        )
+
+    def to_simulation(self):
+        """Creates a new festim.Simulation (not initialised) from the
+        description
+
+        Returns:
+            festim.Simulation: the simulation
+        """
+        references = {}
+        materials = _build(self.materials, references)
+        references["materials"] = list(materials) if materials is not None else []
+        traps = _build(self.traps, references)
+        references["traps"] = list(traps) if traps is not None else []
+        components = {
+            name: _build(getattr(self, name), references)
+            for name in self.fields
+            if name not in ["materials", "traps"]
+        }
+        if components["log_level"] is None:
+            del components["log_level"]
+        for name in ["sources", "boundary_conditions", "initial_conditions"]:
+            if components[name] is None:
+                components[name] = []
+        return festim.Simulation(materials=materials, traps=traps, **components)
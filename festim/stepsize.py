@@ -1,9 +1,10 @@
 import fenics as f
 import numpy as np
 import warnings
+from festim import Specifiable
 
 
-class Stepsize:
+class Stepsize(Specifiable):
     """
     Description of Stepsize
 
@@ -21,12 +22,32 @@ class Stepsize:
             raised. Defaults to None.
         milestones (list, optional): list of times by which the simulation must
             pass. Defaults to None.
+        time_scheme (str, optional): the time discretisation scheme.
+            "backward_euler" (first order) or "BDF2" (second order backward
+            differentiation formula with variable stepsize, backward Euler
+            is used for the first step). Defaults to "backward_euler".
+        rtol (float or dict, optional): relative tolerance on the local
+            time error. If not None, the stepsize is controlled by an
+            estimate of the local error instead of the number of Newton
+            iterations. Can be a dict {field: rtol} to set a tolerance per
+            field (eg. {"solute": 1e-3, 1: 1e-2}), fields not in the dict
+            are not controlled. Defaults to None.
+        atol (float or dict, optional): absolute tolerance on the local
+            time error (same units as the concentrations). Can be a dict
+            {field: atol}. Only used if rtol is not None. Defaults to 0.
 
     Attributes:
         adaptive_stepsize (dict): contains the parameters for adaptive stepsize
+        error_control (dict): contains the parameters of the error-based
+            stepsize control, None if rtol is None
         value (fenics.Constant): value of dt
         milestones (list): list of times by which the simulation must
             pass.
+        time_scheme (str): the time discretisation scheme
+        bdf2_coefficients (tuple): fenics.Constant objects holding the
+            coefficients (a_0, a_2) of the BDF2 scheme
+        previous_value (float): the stepsize of the previous accepted step,
+            None before the first step
 
     Example::
 
@@ -38,6 +59,11 @@ class Stepsize:
         )
     """
 
+    # parameters of the error-based stepsize control
+    safety_factor = 0.9
+    min_change_ratio = 0.2
+    max_change_ratio = 5
+
     def __init__(
         self,
         initial_value=0.0,
@@ -47,23 +73,42 @@ class Stepsize:
         max_stepsize=None,
         dt_min=None,
         milestones=None,
+        time_scheme="backward_euler",
+        rtol=None,
+        atol=0,
     ) -> None:
         self.adaptive_stepsize = None
-        if stepsize_change_ratio is not None:
-            if t_stop or stepsize_stop_max:
+        if t_stop or stepsize_stop_max:
+            if stepsize_change_ratio is not None or rtol is not None:
                 warnings.warn(
                     "stepsize_stop_max and t_stop attributes will be deprecated in a future release, please use max_stepsize instead",
                     DeprecationWarning,
                 )
                 max_stepsize = lambda t: stepsize_stop_max if t >= t_stop else None
+        if stepsize_change_ratio is not None:
             self.adaptive_stepsize = {
                 "stepsize_change_ratio": stepsize_change_ratio,
                 "max_stepsize": max_stepsize,
                 "dt_min": dt_min,
             }
+        self.error_control = None
+        if rtol is not None:
+            self.error_control = {
+                "rtol": rtol,
+                "atol": atol,
+                "max_stepsize": max_stepsize,
+                "dt_min": dt_min,
+                "previous_error": None,
+            }
         self.initial_value = initial_value
         self.value = None
         self.milestones = milestones
+        self.time_scheme = time_scheme
+        self.previous_value = None
+        self.bdf2_coefficients = (
+            f.Constant(1.0, name="a_0"),
+            f.Constant(0.0, name="a_2"),
+        )
         self.initialise_value()
 
     @property
@@ -77,11 +122,81 @@ class Stepsize:
         else:
             self._milestones = value
 
+    @property
+    def time_scheme(self):
+        return self._time_scheme
+
+    @time_scheme.setter
+    def time_scheme(self, value):
+        accepted_values = ["backward_euler", "BDF2"]
+        if value not in accepted_values:
+            raise ValueError(
+                "accepted values for time_scheme are {}".format(accepted_values)
+            )
+        self._time_scheme = value
+
     def initialise_value(self):
         """Creates a fenics.Constant object initialised with self.initial_value
         and stores it in self.value"""
         self.value = f.Constant(self.initial_value, name="dt")
 
+    def reset(self):
+        """Resets the stepsize to its initial value in place (the forms
+        using self.value are kept) and forgets the previous steps"""
+        self.value.assign(self.initial_value)
+        self.previous_value = None
+        self.bdf2_coefficients[0].assign(1.0)
+        self.bdf2_coefficients[1].assign(0.0)
+        if self.error_control is not None:
+            self.error_control["previous_error"] = None
+
+    def time_derivative(self, u, u_n, u_nm1=None):
+        """Returns the discretised time derivative of u.
+
+        backward Euler: (u - u_n)/dt
+
+        BDF2: (a_0 (u - u_n) - a_2 (u_n - u_nm1))/dt
+        with w = dt/dt_n, a_0 = (1 + 2w)/(1 + w) and a_2 = w^2/(1 + w)
+
+        Args:
+            u (ufl.Expr): the current value
+            u_n (ufl.Expr): the value at the previous step
+            u_nm1 (ufl.Expr, optional): the value two steps before. Only
+                needed for BDF2. Defaults to None.
+
+        Raises:
+            ValueError: if u_nm1 is None with BDF2
+
+        Returns:
+            ufl.Expr: the time derivative
+        """
+        if self.time_scheme == "backward_euler":
+            return (u - u_n) / self.value
+        if u_nm1 is None:
+            raise ValueError("BDF2 requires the solution two steps before")
+        a_0, a_2 = self.bdf2_coefficients
+        return (a_0 * (u - u_n) - a_2 * (u_n - u_nm1)) / self.value
+
+    def update_time_scheme(self):
+        """Updates the coefficients of the time scheme with the current
+        stepsize and self.previous_value. Has to be called before solving a
+        time step.
+
+        Returns:
+            bool: True if the coefficients have changed, else False
+        """
+        if self.time_scheme != "BDF2":
+            return False
+        if self.previous_value is None:
+            a_0, a_2 = 1.0, 0.0
+        else:
+            w = float(self.value) / self.previous_value
+            a_0, a_2 = (1 + 2 * w) / (1 + w), w**2 / (1 + w)
+        changed = (a_0, a_2) != tuple(float(a) for a in self.bdf2_coefficients)
+        self.bdf2_coefficients[0].assign(a_0)
+        self.bdf2_coefficients[1].assign(a_2)
+        return changed
+
     def adapt(self, t, nb_it, converged):
         """Changes the stepsize based on convergence.
 
@@ -104,13 +219,83 @@ class Stepsize:
             else:
                 self.value.assign(float(self.value) / change_ratio)
 
-            if callable(max_stepsize):
-                max_stepsize = max_stepsize(t)
-            if max_stepsize is not None:
-                if float(self.value) > max_stepsize:
-                    self.value.assign(max_stepsize)
+            self.apply_max_stepsize(t, max_stepsize)
+
+        self.adapt_to_milestones(t)
+
+    def adapt_to_error(self, t, error, converged=True, order=1):
+        """Changes the stepsize based on an estimate of the local time
+        error with a PI controller:
+
+        dt_new = dt * safety * error^(-0.7/k) * previous_error^(0.4/k)
+
+        with k = order + 1. After a rejected step, the previous error is
+        ignored and the stepsize can only decrease.
+
+        Args:
+            t (float): time at which the next step starts.
+            error (float): the weighted norm of the local error estimate,
+                the step is accepted if it is below 1. None if no estimate
+                is available (the stepsize is then unchanged).
+            converged (bool, optional): True if the solver converged, else
+                False. The stepsize is halved if False. Defaults to True.
+            order (int, optional): the order of the local error estimate.
+                Defaults to 1.
+
+        Raises:
+            ValueError: if the stepsize goes below dt_min
+
+        Returns:
+            bool: True if the step is accepted, else False
+        """
+        control = self.error_control
+        accepted = converged and (error is None or error <= 1)
+
+        if not converged:
+            factor = 0.5
+        elif error is None:
+            factor = 1
+        else:
+            k = order + 1
+            error = max(error, 1e-10)
+            factor = self.safety_factor * error ** (-0.7 / k)
+            if accepted and control["previous_error"] is not None:
+                factor *= control["previous_error"] ** (0.4 / k)
+            factor = min(max(factor, self.min_change_ratio), self.max_change_ratio)
+            if not accepted:
+                factor = min(factor, 1)
+            if accepted:
+                control["previous_error"] = error
+        self.value.assign(float(self.value) * factor)
+
+        dt_min = control["dt_min"]
+        if dt_min is not None and float(self.value) < dt_min:
+            raise ValueError("stepsize reached minimal value")
+
+        self.apply_max_stepsize(t, control["max_stepsize"])
+        self.adapt_to_milestones(t)
+        return accepted
+
+    def apply_max_stepsize(self, t, max_stepsize):
+        """Caps the stepsize
+
+        Args:
+            t (float): current time.
+            max_stepsize (float or callable): Maximum stepsize, can be a
+                function of t. If None, the stepsize is not capped.
+        """
+        if callable(max_stepsize):
+            max_stepsize = max_stepsize(t)
+        if max_stepsize is not None:
+            if float(self.value) > max_stepsize:
+                self.value.assign(max_stepsize)
+
+    def adapt_to_milestones(self, t):
+        """Reduces the stepsize so that the next milestone is not exceeded
 
-        # adapt for next milestone
+        Args:
+            t (float): current time.
+        """
         next_milestone = self.next_milestone(t)
         if next_milestone is not None:
             if t + float(self.value) > next_milestone and not np.isclose(
@@ -0,0 +1,194 @@
+import festim
+import itertools
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+class SweepResults:
+    """Results of a parameter sweep (see festim.run_sweep)
+
+    Args:
+        parameters (list of dict): the parameters of each run
+        series (list of dict): for each run, the derived quantities
+            {title: numpy.ndarray} with two columns (time, value)
+
+    Attributes:
+        parameters (list of dict): the parameters of each run
+        series (list of dict): for each run, the derived quantities
+            {title: numpy.ndarray} with two columns (time, value)
+        titles (list of str): the titles of the derived quantities
+    """
+
+    def __init__(self, parameters, series) -> None:
+        self.parameters = parameters
+        self.series = series
+        self.titles = []
+        for run_series in series:
+            for title in run_series:
+                if title not in self.titles:
+                    self.titles.append(title)
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def table(self):
+        """Gathers the parameters and the last value of each derived quantity
+        in a table with one row per run
+
+        Returns:
+            numpy.ndarray: a structured array with one field per parameter
+                and per derived quantity (NaN if not computed in a run). The
+                fields of the parameters that are not all numbers (eg.
+                strings, lists) have the object dtype.
+        """
+        parameter_names = []
+        for parameters in self.parameters:
+            for name in parameters:
+                if name not in parameter_names:
+                    parameter_names.append(name)
+        columns = {
+            name: [parameters.get(name, np.nan) for parameters in self.parameters]
+            for name in parameter_names
+        }
+        dtype = [(name, _column_dtype(columns[name])) for name in parameter_names]
+        dtype += [(title, float) for title in self.titles]
+        table = np.empty(len(self), dtype=dtype)
+        for name, column in columns.items():
+            for i, value in enumerate(column):
+                table[name][i] = value
+        for title in self.titles:
+            table[title] = np.nan
+        for i, run_series in enumerate(self.series):
+            for title, values in run_series.items():
+                if len(values) > 0:
+                    table[title][i] = values[-1, 1]
+        return table
+
+
+def _column_dtype(values):
+    """Returns the dtype of a column of the table of a sweep: the numpy
+    dtype of the values if they are all numbers, else object
+
+    Args:
+        values (list): the values of the column
+
+    Returns:
+        numpy.dtype: the dtype
+    """
+    try:
+        array = np.array(values)
+    except ValueError:
+        # eg. sequences of different lengths
+        return np.dtype(object)
+    if array.ndim == 1 and array.dtype.kind in "biuf":
+        return array.dtype
+    return np.dtype(object)
+
+
+def sweep_samples(parameters):
+    """Returns the list of parameters of each run of a sweep
+
+    Args:
+        parameters (dict or list of dict): a grid {name: list of values}
+            (all the combinations are run) or a list of samples
+            [{name: value}, ...]
+
+    Returns:
+        list of dict: the parameters of each run
+    """
+    if isinstance(parameters, dict):
+        names = list(parameters.keys())
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*parameters.values())
+        ]
+    return [dict(sample) for sample in parameters]
+
+
+def run_sample(model_factory, parameters):
+    """Creates, initialises and runs a model and returns its derived
+    quantities
+
+    Args:
+        model_factory (callable): returns a festim.Simulation from keyword
+            arguments
+        parameters (dict): the keyword arguments of model_factory
+
+    Returns:
+        dict: the derived quantities {title: numpy.ndarray} with two columns
+            (time, value). The titles are prefixed by the index of their
+            festim.DerivedQuantities in the exports (eg. "0: Total volume 1")
+    """
+    model = model_factory(**parameters)
+    model.initialise()
+    model.run()
+    series = {}
+    for i, export in enumerate(model.exports):
+        if isinstance(export, festim.DerivedQuantities):
+            for quantity in export:
+                # the index of the export distinguishes identical titles
+                title = "{}: {}".format(i, quantity.title)
+                series[title] = np.column_stack(
+                    [np.array(quantity.t, dtype=float), np.array(quantity.data)]
+                ).reshape(-1, 2)
+    return series
+
+
+def run_sweep(model_factory, parameters, max_workers=None, prewarm=True):
+    """Runs a model for several sets of parameters in parallel processes.
+
+    The processes are started with the "spawn" method (forking a process in
+    which MPI and PETSc are initialised is unsafe) so model_factory has to be
+    importable, ie. defined at the top level of a module, and the sweep
+    launched under a ``if __name__ == "__main__":`` guard.
+
+    The compiled forms are cached on disk by FEniCS and shared by all the
+    processes. If prewarm is True, the first run is done in the current
+    process before the others are dispatched so that the forms are compiled
+    once instead of each worker compiling them concurrently.
+
+    Usage:
+        def make_model(D_0, T):
+            my_model = festim.Simulation()
+            ...
+            return my_model
+
+        if __name__ == "__main__":
+            results = festim.run_sweep(
+                make_model, {"D_0": [1e-7, 1e-6], "T": [300, 400, 500]}
+            )
+            table = results.table()
+
+    Args:
+        model_factory (callable): returns a festim.Simulation (not
+            initialised) from keyword arguments. The derived quantities of
+            its exports are collected.
+        parameters (dict or list of dict): a grid {name: list of values}
+            (all the combinations are run) or a list of samples
+            [{name: value}, ...]
+        max_workers (int, optional): the number of processes. If None, the
+            number of processors is used. Defaults to None.
+        prewarm (bool, optional): if True, the first run is done in the
+            current process to compile the forms. Defaults to True.
+
+    Returns:
+        festim.SweepResults: the results in the order of the samples
+    """
+    samples = sweep_samples(parameters)
+    series = [None] * len(samples)
+    remaining = list(range(len(samples)))
+    if prewarm and remaining:
+        first = remaining.pop(0)
+        series[first] = run_sample(model_factory, samples[first])
+
+    if remaining:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            futures = {
+                i: pool.submit(run_sample, model_factory, samples[i]) for i in remaining
+            }
+            for i, future in futures.items():
+                series[i] = future.result()
+
+    return SweepResults(samples, series)
@@ -1,8 +1,9 @@
+from festim import as_expression, Specifiable
 import sympy as sp
 import fenics as f
 
 
-class Temperature:
+class Temperature(Specifiable):
     """
     Class for Temperature in FESTIM
 
@@ -38,7 +39,7 @@ class Temperature:
         V = f.FunctionSpace(mesh.mesh, "CG", 1)
         self.T = f.Function(V, name="T")
         self.T_n = f.Function(V, name="T_n")
-        self.expression = f.Expression(sp.printing.ccode(self.value), t=0, degree=2)
+        self.expression = as_expression(self.value, degree=2)
         self.T.assign(f.interpolate(self.expression, V))
         self.T_n.assign(self.T)
 
@@ -52,5 +53,17 @@ class Temperature:
         self.expression.t = t
         self.T.assign(f.interpolate(self.expression, self.T.function_space()))
 
+    def rollback(self):
+        """Restores T to its value before the last update, so that the update
+        can be redone at another time (eg. when a time step is retried)
+        """
+        self.T.assign(self.T_n)
+
+    def reset(self):
+        """Resets T and T_n to their values at t = 0"""
+        self.expression.t = 0
+        self.T.assign(f.interpolate(self.expression, self.T.function_space()))
+        self.T_n.assign(self.T)
+
     def is_steady_state(self):
         return "t" not in sp.printing.ccode(self.value)
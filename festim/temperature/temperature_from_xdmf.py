@@ -47,6 +47,14 @@ class TemperatureFromXDMF(Temperature):
         """
         pass
 
+    def rollback(self):
+        """The temperature read from the XDMF file doesn't change"""
+        pass
+
+    def reset(self):
+        """The temperature read from the XDMF file doesn't change"""
+        pass
+
     def is_steady_state(self):
         # TemperatureFromXDMF is always steady state
         return True
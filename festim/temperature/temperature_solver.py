@@ -24,11 +24,28 @@ class HeatTransferProblem(festim.Temperature):
         preconditioner (str, optional): preconditioning method for the newton solver,
             options can be veiwed by print(list_krylov_solver_preconditioners()).
             Defaults to "default".
+        nonlinear_solver (str, optional): the nonlinear solver. "newton" for
+            fenics.NewtonSolver or "snes" for a PETSc SNES solver with line
+            search (fenics.PETScSNESSolver). Defaults to "newton".
+        line_search (str, optional): line search method of the SNES solver
+            ("basic", "bt", "cp", "l2", "nleqerr"). Defaults to "bt".
+        inexact_newton (bool, optional): if True, Eisenstat-Walker forcing
+            terms are used for the Krylov solves of the SNES solver.
+            Defaults to False.
+        snes_options (dict, optional): additional PETSc options passed to the
+            SNES solver, without the leading "-". Defaults to None.
 
     Attributes:
         F (fenics.Form): the variational form of the heat transfer problem
+        T_nm1 (fenics.Function): the temperature two steps before, only
+            used with multistep time schemes
+        T_rollback (fenics.Function): T_nm1 before the last update, to
+            restore it if the update is redone (see rollback)
         v_T (fenics.TestFunction): the test function
-        newton_solver (fenics.NewtonSolver): Newton solver for solving the nonlinear problem
+        newton_solver (fenics.NewtonSolver or fenics.PETScSNESSolver): Newton
+            solver for solving the nonlinear problem
+        problem (festim.Problem): the nonlinear problem of the transient
+            heat transfer problem, reused at each time step
         initial_condition (festim.InitialCondition): the initial condition
         sub_expressions (list): contains time dependent fenics.Expression to
             be updated
@@ -46,6 +63,10 @@ class HeatTransferProblem(festim.Temperature):
         maximum_iterations=30,
         linear_solver=None,
         preconditioner="default",
+        nonlinear_solver="newton",
+        line_search="bt",
+        inexact_newton=False,
+        snes_options=None,
     ) -> None:
         super().__init__()
         self.transient = transient
@@ -55,6 +76,10 @@ class HeatTransferProblem(festim.Temperature):
         self.maximum_iterations = maximum_iterations
         self.linear_solver = linear_solver
         self.preconditioner = preconditioner
+        self.nonlinear_solver = nonlinear_solver
+        self.line_search = line_search
+        self.inexact_newton = inexact_newton
+        self.snes_options = snes_options
 
         self.F = 0
         self.v_T = None
@@ -62,6 +87,7 @@ class HeatTransferProblem(festim.Temperature):
         self.boundary_conditions = []
         self.sub_expressions = []
         self.newton_solver = None
+        self.problem = None
 
     @property
     def newton_solver(self):
@@ -71,12 +97,14 @@ class HeatTransferProblem(festim.Temperature):
     def newton_solver(self, value):
         if value is None:
             self._newton_solver = value
-        elif isinstance(value, f.NewtonSolver):
+        elif isinstance(value, (f.NewtonSolver, f.PETScSNESSolver)):
             if self._newton_solver:
                 print("Settings for the Newton solver will be overwritten")
             self._newton_solver = value
         else:
-            raise TypeError("accepted type for newton_solver is fenics.NewtonSolver")
+            raise TypeError(
+                "accepted type for newton_solver is fenics.NewtonSolver or fenics.PETScSNESSolver"
+            )
 
     @property
     def initial_condition(self):
@@ -105,27 +133,26 @@ class HeatTransferProblem(festim.Temperature):
         V = f.FunctionSpace(mesh.mesh, "CG", 1)
         self.T = f.Function(V, name="T")
         self.T_n = f.Function(V, name="T_n")
+        self.T_nm1 = f.Function(V, name="T_nm1")
+        self.T_rollback = f.Function(V)
         self.v_T = f.TestFunction(V)
         if self.transient and self.initial_condition is None:
             raise AttributeError(
                 "Initial condition is required for transient heat transfer simulations"
             )
         if self.transient and self.initial_condition:
-            if isinstance(self.initial_condition.value, str):
-                if self.initial_condition.value.endswith(".xdmf"):
-                    with f.XDMFFile(self.initial_condition.value) as file:
-                        file.read_checkpoint(
-                            self.T_n,
-                            self.initial_condition.label,
-                            self.initial_condition.time_step,
-                        )
-            else:
-                ccode_T_ini = sp.printing.ccode(self.initial_condition.value)
-                self.initial_condition.value = f.Expression(ccode_T_ini, degree=2, t=0)
-                self.T_n.assign(f.interpolate(self.initial_condition.value, V))
+            if not isinstance(self.initial_condition.value, str):
+                self.initial_condition.value = festim.as_expression(
+                    self.initial_condition.value, degree=2
+                )
+            self.assign_initial_condition()
 
         self.define_variational_problem(materials, mesh, dt)
         self.create_dirichlet_bcs(mesh.surface_markers)
+        # time-independent expressions are interpolated once
+        self.F, self.sub_expressions = festim.freeze_expressions(
+            self.F, self.sub_expressions, mesh.mesh
+        )
 
         if not self.newton_solver:
             self.define_newton_solver()
@@ -144,6 +171,21 @@ class HeatTransferProblem(festim.Temperature):
 
             self.T_n.assign(self.T)
 
+    def assign_initial_condition(self):
+        """Assigns the initial condition to self.T_n and self.T_nm1"""
+        value = self.initial_condition.value
+        if isinstance(value, str):
+            if value.endswith(".xdmf"):
+                with f.XDMFFile(value) as file:
+                    file.read_checkpoint(
+                        self.T_n,
+                        self.initial_condition.label,
+                        self.initial_condition.time_step,
+                    )
+        else:
+            self.T_n.assign(f.interpolate(value, self.T.function_space()))
+        self.T_nm1.assign(self.T_n)
+
     def define_variational_problem(self, materials, mesh, dt=None):
         """Create a variational form for heat transfer problem
 
@@ -163,6 +205,8 @@ class HeatTransferProblem(festim.Temperature):
             thermal_cond = mat.thermal_cond
             if callable(thermal_cond):  # if thermal_cond is a function
                 thermal_cond = thermal_cond(T)
+            else:
+                thermal_cond = festim.parameter_as_constant(mat, "thermal_cond")
 
             subdomains = mat.id  # list of subdomains with this material
             if type(subdomains) is not list:
@@ -172,11 +216,21 @@ class HeatTransferProblem(festim.Temperature):
                 rho = mat.rho
                 if callable(cp):  # if cp or rho are functions, apply T
                     cp = cp(T)
+                else:
+                    cp = festim.parameter_as_constant(mat, "heat_capacity")
                 if callable(rho):
                     rho = rho(T)
+                else:
+                    rho = festim.parameter_as_constant(mat, "rho")
                 # Transien term
                 for vol in subdomains:
-                    self.F += rho * cp * (T - T_n) / dt.value * v_T * mesh.dx(vol)
+                    self.F += (
+                        rho
+                        * cp
+                        * dt.time_derivative(T, T_n, self.T_nm1)
+                        * v_T
+                        * mesh.dx(vol)
+                    )
             # Diffusion term
             for vol in subdomains:
                 if mesh.type == "cartesian":
@@ -221,14 +275,21 @@ class HeatTransferProblem(festim.Temperature):
                     self.F += -bc.form * self.v_T * mesh.ds(surf)
 
     def define_newton_solver(self):
-        """Creates the Newton solver and sets its parameters"""
-        self.newton_solver = f.NewtonSolver(f.MPI.comm_world)
-        self.newton_solver.parameters["error_on_nonconvergence"] = True
-        self.newton_solver.parameters["absolute_tolerance"] = self.absolute_tolerance
-        self.newton_solver.parameters["relative_tolerance"] = self.relative_tolerance
-        self.newton_solver.parameters["maximum_iterations"] = self.maximum_iterations
-        self.newton_solver.parameters["linear_solver"] = self.linear_solver
-        self.newton_solver.parameters["preconditioner"] = self.preconditioner
+        """Creates the Newton solver (or the SNES solver if
+        self.nonlinear_solver is "snes") and sets its parameters"""
+        self.newton_solver = festim.create_nonlinear_solver(
+            nonlinear_solver=self.nonlinear_solver,
+            absolute_tolerance=self.absolute_tolerance,
+            relative_tolerance=self.relative_tolerance,
+            maximum_iterations=self.maximum_iterations,
+            linear_solver=self.linear_solver,
+            preconditioner=self.preconditioner,
+            error_on_nonconvergence=True,
+            line_search=self.line_search,
+            inexact_newton=self.inexact_newton,
+            snes_options=self.snes_options,
+            options_prefix="heat_transfer_",
+        )
 
     def create_dirichlet_bcs(self, surface_markers):
         """Creates a list of fenics.DirichletBC and add time dependent
@@ -259,17 +320,42 @@ class HeatTransferProblem(festim.Temperature):
         if self.transient:
             festim.update_expressions(self.sub_expressions, t)
             # Solve heat transfers
-            dT = f.TrialFunction(self.T.function_space())
-            JT = f.derivative(self.F, self.T, dT)  # Define the Jacobian
-            problem = festim.Problem(JT, self.F, self.dirichlet_bcs)
+            if (
+                self.problem is None
+                or self.problem.residual_form is not self.F
+                or self.problem.bcs is not self.dirichlet_bcs
+            ):
+                dT = f.TrialFunction(self.T.function_space())
+                JT = f.derivative(self.F, self.T, dT)  # Define the Jacobian
+                self.problem = festim.Problem(JT, self.F, self.dirichlet_bcs)
 
             f.begin(
                 "Solving nonlinear variational problem."
             )  # Add message to fenics logs
-            self.newton_solver.solve(problem, self.T.vector())
+            self.newton_solver.solve(self.problem, self.T.vector())
             f.end()
 
+            self.T_rollback.assign(self.T_nm1)
+            self.T_nm1.assign(self.T_n)
             self.T_n.assign(self.T)
 
+    def rollback(self):
+        """Restores the temperatures to their values before the last update,
+        so that the update can be redone at another time (eg. when a time
+        step is retried)
+        """
+        if self.transient:
+            self.T_n.assign(self.T_nm1)
+            self.T_nm1.assign(self.T_rollback)
+            self.T.assign(self.T_n)
+
+    def reset(self):
+        """Resets the temperature to the initial condition. The steady-state
+        temperature doesn't depend on time and is kept."""
+        if self.transient:
+            self.T.vector().zero()
+            self.assign_initial_condition()
+            festim.update_expressions(self.sub_expressions, 0)
+
     def is_steady_state(self):
         return not self.transient
@@ -234,3 +234,34 @@ def test_initialisation_no_component():
     my_problem.initialise_concentrations()
     w = my_problem.u_n
     assert fenics.errornorm(u, w) == 0
+
+
+@pytest.mark.parametrize(
+    "stepsize,predictor,allocated",
+    [
+        (festim.Stepsize(1), None, False),
+        (festim.Stepsize(1, time_scheme="BDF2"), None, True),
+        (festim.Stepsize(1, rtol=1e-3), None, True),
+        (festim.Stepsize(1), "linear", True),
+    ],
+)
+def test_older_solution_only_created_when_needed(stepsize, predictor, allocated):
+    """
+    Test that the concentrations two steps before are only created with
+    BDF2, error control or a predictor
+    """
+    mesh = fenics.UnitSquareMesh(4, 4)
+    V = fenics.VectorFunctionSpace(mesh, "P", 1, 2)
+    my_trap = festim.Trap(1, 1, 1, 1, ["mat_name"], 1)
+
+    my_problem = festim.HTransportProblem(
+        festim.Mobile(),
+        festim.Traps([my_trap]),
+        festim.Temperature(300),
+        festim.Settings(1e10, 1e-10, predictor=predictor),
+        [],
+    )
+
+    my_problem.V = V
+    my_problem.initialise_concentrations(stepsize)
+    assert (my_problem.u_nm1 is not None) == allocated
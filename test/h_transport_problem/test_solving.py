@@ -1,6 +1,44 @@
 import festim
 import fenics as f
 import pytest
+import numpy as np
+
+
+@pytest.fixture
+def create_problem():
+    """Returns a function creating a festim.HTransportProblem on a unit
+    interval with its newton solver and the functions u, u_n and v. The form
+    F is left to the tests.
+
+    The returned function takes an optional festim.Temperature (defaults to
+    200 K) and the arguments of festim.Settings overriding the defaults.
+    """
+
+    def create(temperature=None, **settings):
+        mesh = f.UnitIntervalMesh(8)
+        V = f.FunctionSpace(mesh, "CG", 1)
+        if temperature is None:
+            temperature = festim.Temperature(200)
+        settings = {
+            "absolute_tolerance": 1e-10,
+            "relative_tolerance": 1e-10,
+            "maximum_iterations": 50,
+            **settings,
+        }
+        my_problem = festim.HTransportProblem(
+            festim.Mobile(),
+            festim.Traps([]),
+            temperature,
+            festim.Settings(**settings),
+            [],
+        )
+        my_problem.define_newton_solver()
+        my_problem.u = f.Function(V)
+        my_problem.u_n = f.Function(V)
+        my_problem.v = f.TestFunction(V)
+        return my_problem
+
+    return create
 
 
 def test_default_dt_min_value():
@@ -42,6 +80,47 @@ def test_default_dt_min_value():
     my_problem.update(t, dt)
 
 
+def test_temperature_is_updated_when_a_step_is_retried(create_problem, monkeypatch):
+    """Checks that when a step is rejected and retried with a smaller
+    stepsize, a time-dependent temperature is evaluated at the time of the
+    retried step"""
+    # build
+    my_temp = festim.Temperature(300 + 100 * festim.t)
+    dt = festim.Stepsize(initial_value=0.5, stepsize_change_ratio=2)
+    my_problem = create_problem(temperature=my_temp)
+    my_temp.create_functions(festim.Mesh(my_problem.u.function_space().mesh()))
+    my_problem.F = (
+        (my_problem.u - my_problem.u_n) * my_problem.v * f.dx
+        + (my_problem.u - my_temp.T) * my_problem.v * f.dx
+        + f.dot(f.grad(my_problem.u), f.grad(my_problem.v)) * f.dx
+    )
+
+    # the first attempt of the step fails
+    solve_once = my_problem.solve_once
+    attempts = []
+
+    def failing_once():
+        attempts.append(float(dt.value))
+        if len(attempts) == 1:
+            return my_problem.settings.maximum_iterations, False
+        return solve_once()
+
+    monkeypatch.setattr(my_problem, "solve_once", failing_once)
+
+    # run
+    t = 0.5
+    my_temp.update(t)
+    t = my_problem.update(t, dt)
+
+    # test
+    assert len(attempts) == 2
+    t_retried = attempts[1]
+    assert t_retried < 0.5
+    assert t == pytest.approx(t_retried)
+    assert my_temp.T(0.5) == pytest.approx(300 + 100 * t_retried)
+    assert my_temp.T_n(0.5) == pytest.approx(300)
+
+
 def test_solve_once_jacobian_is_none():
     """Checks that solve_once() works when the jacobian (J) is None (defaults)"""
     # build
@@ -188,3 +267,286 @@ class Test_solve_once_with_custom_solver:
         problem_2.solve_once()
 
         assert (problem_1.u.vector() == problem_2.u.vector()).all()
+
+
+def test_nonlinear_problem_is_reused(create_problem):
+    """Checks that solve_once() reuses the same festim.Problem between calls
+    and only recreates it when the form is changed"""
+    # build
+    my_problem = create_problem()
+    my_problem.F = (
+        (my_problem.u - my_problem.u_n) * my_problem.v * f.dx
+        + 1 * my_problem.v * f.dx
+        + f.dot(f.grad(my_problem.u), f.grad(my_problem.v)) * f.dx
+    )
+
+    # run
+    my_problem.solve_once()
+    problem_first_solve = my_problem.problem
+    my_problem.solve_once()
+
+    # test
+    assert my_problem.problem is problem_first_solve
+
+    # change the form
+    my_problem.F = (
+        (my_problem.u - my_problem.u_n) * my_problem.v * f.dx
+        + 2 * my_problem.v * f.dx
+        + f.dot(f.grad(my_problem.u), f.grad(my_problem.v)) * f.dx
+    )
+    nb_it, converged = my_problem.solve_once()
+
+    # test
+    assert converged
+    assert my_problem.problem is not problem_first_solve
+    assert my_problem.problem.residual_form is my_problem.F
+
+
+def test_modified_newton_reuses_jacobian(create_problem, monkeypatch):
+    """Checks that with modified_newton the Jacobian is only assembled once
+    when the stepsize doesn't change and the solver converges quickly, and
+    that it is refreshed when dt changes"""
+    # build
+    dt = festim.Stepsize(1)
+    my_problem = create_problem(
+        final_time=10, modified_newton=True, jacobian_update_threshold=10
+    )
+    my_problem.F = (
+        (my_problem.u - my_problem.u_n) / dt.value * my_problem.v * f.dx
+        - 1 * my_problem.v * f.dx
+        + f.dot(f.grad(my_problem.u), f.grad(my_problem.v)) * f.dx
+    )
+
+    nb_assemblies = []
+    assemble = f.SystemAssembler.assemble
+
+    def counting_assemble(assembler, *args):
+        if len(args) == 1:  # only the Jacobian
+            nb_assemblies.append(1)
+        return assemble(assembler, *args)
+
+    monkeypatch.setattr(f.SystemAssembler, "assemble", counting_assemble)
+
+    # run
+    my_problem.update(1, dt)
+    my_problem.update(2, dt)
+
+    # test
+    assert len(nb_assemblies) == 1
+
+    # run
+    dt.value.assign(0.5)
+    my_problem.update(2.5, dt)
+
+    # test
+    assert len(nb_assemblies) == 2
+
+
+def test_modified_newton_gives_same_solution(create_problem):
+    """Checks that modified_newton converges to the same solution as the
+    default Newton solver"""
+
+    def run(modified_newton):
+        dt = festim.Stepsize(1)
+        my_problem = create_problem(
+            absolute_tolerance=1e-12,
+            relative_tolerance=1e-12,
+            final_time=10,
+            modified_newton=modified_newton,
+        )
+        my_problem.F = (
+            (my_problem.u - my_problem.u_n) / dt.value * my_problem.v * f.dx
+            - 1 * my_problem.v * f.dx
+            + f.dot((1 + my_problem.u**2) * f.grad(my_problem.u), f.grad(my_problem.v))
+            * f.dx
+        )
+        for t in range(1, 4):
+            my_problem.update(t, dt)
+        return my_problem.u
+
+    assert f.errornorm(run(True), run(False)) < 1e-8
+
+
+@pytest.mark.parametrize("line_search", ["basic", "bt", "cp"])
+def test_solve_once_snes(create_problem, line_search):
+    """Checks that solve_once() works with the SNES nonlinear solver and
+    gives the same solution as the default Newton solver"""
+
+    def solve(**settings):
+        my_problem = create_problem(**settings)
+        my_problem.F = (
+            (my_problem.u - my_problem.u_n) * my_problem.v * f.dx
+            + 1 * my_problem.v * f.dx
+            + f.dot((1 + my_problem.u**2) * f.grad(my_problem.u), f.grad(my_problem.v))
+            * f.dx
+        )
+        nb_it, converged = my_problem.solve_once()
+        return my_problem, converged
+
+    snes_problem, converged = solve(
+        nonlinear_solver="snes",
+        line_search=line_search,
+        linear_solver="gmres",
+        preconditioner="ilu",
+        inexact_newton=True,
+        snes_options={"snes_linesearch_damping": 1.0},
+    )
+    newton_problem, _ = solve()
+
+    assert converged
+    assert isinstance(snes_problem.newton_solver, f.PETScSNESSolver)
+    assert snes_problem.newton_solver.parameters["line_search"] == line_search
+    assert f.errornorm(snes_problem.u, newton_problem.u) < 1e-8
+
+
+def test_snes_options_do_not_leak():
+    """Checks that the PETSc options of a SNES solver don't apply to other
+    solvers created with the same prefix and are removed with the solver"""
+    from petsc4py import PETSc
+    import gc
+
+    def create_solver(snes_options):
+        return festim.create_nonlinear_solver(
+            nonlinear_solver="snes",
+            absolute_tolerance=1e-10,
+            relative_tolerance=1e-10,
+            maximum_iterations=50,
+            linear_solver="default",
+            preconditioner="default",
+            error_on_nonconvergence=False,
+            inexact_newton=True,
+            snes_options=snes_options,
+            options_prefix="h_transport_",
+        )
+
+    options = PETSc.Options()
+    solver = create_solver({"snes_linesearch_damping": 0.5})
+    prefix = solver.snes().getOptionsPrefix()
+    assert options.getReal(prefix + "snes_linesearch_damping") == 0.5
+    assert options.hasName(prefix + "snes_ksp_ew")
+
+    other_prefix = create_solver(None).snes().getOptionsPrefix()
+    assert other_prefix != prefix
+    assert not options.hasName(other_prefix + "snes_linesearch_damping")
+
+    del solver
+    gc.collect()
+    assert not options.hasName(prefix + "snes_linesearch_damping")
+    assert not options.hasName(prefix + "snes_ksp_ew")
+
+
+def test_fieldsplit_options_do_not_leak():
+    """Checks that the options of the fieldsplit preconditioner don't apply
+    to a SNES solver created afterwards and are removed with the solver"""
+    from petsc4py import PETSc
+    import gc
+
+    mesh = f.UnitIntervalMesh(8)
+    P1 = f.FiniteElement("CG", mesh.ufl_cell(), 1)
+    V = f.FunctionSpace(mesh, f.MixedElement([P1, P1]))
+    fieldsplit_solver = festim.FieldSplitNewtonSolver(
+        V,
+        nb_traps=1,
+        absolute_tolerance=1e-10,
+        relative_tolerance=1e-10,
+        maximum_iterations=50,
+        error_on_nonconvergence=False,
+        options_prefix="h_transport_fieldsplit_",
+    )
+    prefix = fieldsplit_solver.options_prefix
+    snes_problem = festim.HTransportProblem(
+        festim.Mobile(),
+        festim.Traps([]),
+        festim.Temperature(200),
+        festim.Settings(1e-10, 1e-10, nonlinear_solver="snes"),
+        [],
+    )
+    snes_problem.define_newton_solver()
+    snes_prefix = snes_problem.newton_solver.snes().getOptionsPrefix()
+
+    options = PETSc.Options()
+    assert options.getString(prefix + "pc_type") == "fieldsplit"
+    assert snes_prefix != prefix
+    assert not options.hasName(snes_prefix + "pc_type")
+
+    del fieldsplit_solver
+    gc.collect()
+    assert not options.hasName(prefix + "pc_type")
+
+
+def test_wrong_nonlinear_solver():
+    """Checks that a ValueError is raised when an unknown nonlinear solver is
+    given"""
+    my_settings = festim.Settings(
+        absolute_tolerance=1e-10,
+        relative_tolerance=1e-10,
+        nonlinear_solver="coucou",
+    )
+    my_problem = festim.HTransportProblem(
+        festim.Mobile(), festim.Traps([]), festim.Temperature(200), my_settings, []
+    )
+    with pytest.raises(
+        ValueError, match="accepted values for nonlinear_solver are 'newton' and 'snes'"
+    ):
+        my_problem.define_newton_solver()
+
+
+@pytest.mark.parametrize("predictor", ["linear", "quadratic"])
+def test_predictor_gives_exact_guess(create_problem, predictor):
+    """Checks that with a solution linear in time, the extrapolated initial
+    guess is already the solution once enough steps have been solved,
+    also with variable stepsizes"""
+    # build
+    dt = festim.Stepsize(1)
+    my_problem = create_problem(final_time=10, predictor=predictor)
+    V = my_problem.u.function_space()
+    my_problem.u_nm1 = f.Function(V)
+    my_problem.u_nm2 = f.Function(V)
+    my_problem.F = (
+        my_problem.u - my_problem.u_n
+    ) / dt.value * my_problem.v * f.dx - 2 * my_problem.v * f.dx
+
+    t = 0
+    for value in [1, 0.5, 2]:
+        dt.value.assign(value)
+        t += value
+        my_problem.update(t, dt)
+
+    # run
+    dt.value.assign(1.5)
+    my_problem.apply_predictor(dt)
+
+    # test
+    assert np.allclose(my_problem.u.vector().get_local(), 2 * (t + 1.5))
+    nb_it, converged = my_problem.solve_once()
+    assert converged
+    assert nb_it == 0
+
+
+def test_update_does_not_allocate_functions(create_problem, monkeypatch):
+    """Checks that once the first step is solved, update() doesn't create
+    new fenics.Function objects"""
+    # build
+    dt = festim.Stepsize(1)
+    my_problem = create_problem(final_time=10)
+    my_problem.F = (
+        (my_problem.u - my_problem.u_n) / dt.value * my_problem.v * f.dx
+        - 1 * my_problem.v * f.dx
+        + f.dot(f.grad(my_problem.u), f.grad(my_problem.v)) * f.dx
+    )
+    my_problem.update(1, dt)
+
+    nb_functions = []
+
+    def counting_function(*args, **kwargs):
+        nb_functions.append(1)
+        return f.Function(*args, **kwargs)
+
+    monkeypatch.setattr(festim.h_transport_problem, "Function", counting_function)
+
+    # run
+    for t in range(2, 5):
+        my_problem.update(t, dt)
+
+    # test
+    assert len(nb_functions) == 0
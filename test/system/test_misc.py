@@ -289,6 +289,43 @@ def test_txt_export_desired_times(tmp_path, final_time, stepsize, export_times):
     assert len(data[0, :]) == len(my_export.times) + 1
 
 
+def test_txt_export_is_written_when_the_run_fails(tmp_path, monkeypatch):
+    """
+    Tests that the columns of a TXTExport are written when the simulation
+    raises an error before the last export time
+
+    Args:
+        tmp_path (os.PathLike): path to a temporary folder
+    """
+    my_model = F.Simulation()
+
+    my_model.mesh = F.MeshFromVertices(np.linspace(0, 1))
+    my_model.materials = F.Material(1, 1, 0)
+    my_model.settings = F.Settings(1e-10, 1e-10, final_time=1)
+    my_model.T = F.Temperature(500)
+    my_model.dt = F.Stepsize(0.1)
+
+    my_export = F.TXTExport(
+        "solute", times=[0.1, 0.2, 0.3, 1], filename="{}/c.txt".format(tmp_path)
+    )
+    my_model.exports = [my_export]
+    my_model.initialise()
+
+    iterate = my_model.iterate
+
+    def failing_iterate():
+        if my_model.t >= 0.3 - 1e-10:
+            raise RuntimeError("failed step")
+        iterate()
+
+    monkeypatch.setattr(my_model, "iterate", failing_iterate)
+    with pytest.raises(RuntimeError, match="failed step"):
+        my_model.run()
+
+    data = np.genfromtxt(my_export.filename, skip_header=1, delimiter=",")
+    assert len(data[0, :]) == 4
+
+
 def test_txt_export_all_times(tmp_path):
     """
     Tests that TXTExport can be exported at all timesteps
@@ -850,3 +887,416 @@ def test_soret_surface_flux_mass_balance(coordinates, surface_flux_class):
 
     assert not np.isclose(flux_left.data[0], 0)
     assert np.isclose(np.abs(flux_left.data[0]), np.abs(flux_right.data[0]), rtol=1e-2)
+
+
+def test_fieldsplit_preconditioner_with_traps():
+    """
+    Runs a transient simulation with two traps using the fieldsplit
+    preconditioner and checks that the result matches the default solver
+    """
+
+    def run(preconditioner):
+        my_model = F.Simulation()
+        my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=100))
+        my_model.materials = F.Material(id=1, D_0=1, E_D=0)
+        my_model.traps = [
+            F.Trap(k_0=1, E_k=0, p_0=0.1, E_p=0, materials=1, density=2),
+            F.Trap(k_0=2, E_k=0, p_0=0.5, E_p=0, materials=1, density=1),
+        ]
+        my_model.T = 300
+        my_model.boundary_conditions = [
+            F.DirichletBC(surfaces=[1], value=1, field=0),
+        ]
+        my_model.settings = F.Settings(
+            absolute_tolerance=1e-10,
+            relative_tolerance=1e-10,
+            final_time=5,
+            preconditioner=preconditioner,
+        )
+        my_model.dt = F.Stepsize(1)
+        my_model.initialise()
+        my_model.run()
+        return my_model.h_transport_problem.u
+
+    u_fieldsplit = run("fieldsplit")
+    u_default = run("default")
+
+    assert f.errornorm(u_fieldsplit, u_default) < 1e-6
+
+
+def test_fieldsplit_preconditioner_without_traps():
+    """
+    Checks that a ValueError is raised when the fieldsplit preconditioner is
+    used without traps
+    """
+    my_model = F.Simulation()
+    my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=10))
+    my_model.materials = F.Material(id=1, D_0=1, E_D=0)
+    my_model.T = 300
+    my_model.settings = F.Settings(
+        absolute_tolerance=1e-10,
+        relative_tolerance=1e-10,
+        transient=False,
+        preconditioner="fieldsplit",
+    )
+    with pytest.raises(ValueError, match="fieldsplit preconditioner requires traps"):
+        my_model.initialise()
+
+
+def test_static_condensation_with_traps():
+    """
+    Runs a transient simulation with two traps with static condensation of
+    the traps and checks that the result is close to the default solver
+    """
+
+    def run(static_condensation):
+        my_model = F.Simulation()
+        my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=200))
+        my_model.materials = F.Material(id=1, D_0=1, E_D=0)
+        my_model.traps = [
+            F.Trap(k_0=1, E_k=0, p_0=0.1, E_p=0, materials=1, density=2),
+            F.Trap(k_0=2, E_k=0, p_0=0.5, E_p=0, materials=1, density=1),
+        ]
+        my_model.T = 300
+        my_model.boundary_conditions = [
+            F.DirichletBC(surfaces=[1], value=1, field=0),
+        ]
+        my_model.settings = F.Settings(
+            absolute_tolerance=1e-10,
+            relative_tolerance=1e-10,
+            final_time=5,
+            static_condensation=static_condensation,
+        )
+        my_model.dt = F.Stepsize(1)
+        my_model.initialise()
+        my_model.run()
+        return my_model.h_transport_problem.u
+
+    u_condensed = run(True)
+    u_default = run(False)
+
+    assert f.errornorm(u_condensed, u_default) / f.norm(u_default) < 1e-3
+
+
+def test_operator_splitting_with_traps():
+    """
+    Runs a transient simulation with two traps with operator splitting and
+    checks that the result is close to the monolithic solver
+    """
+
+    def run(operator_splitting):
+        my_model = F.Simulation()
+        my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=100))
+        my_model.materials = F.Material(id=1, D_0=1, E_D=0)
+        my_model.traps = [
+            F.Trap(k_0=1, E_k=0, p_0=0.1, E_p=0, materials=1, density=2),
+            F.Trap(k_0=2, E_k=0, p_0=0.5, E_p=0, materials=1, density=1),
+        ]
+        my_model.T = 300
+        my_model.boundary_conditions = [
+            F.DirichletBC(surfaces=[1], value=1, field=0),
+        ]
+        my_model.settings = F.Settings(
+            absolute_tolerance=1e-10,
+            relative_tolerance=1e-10,
+            final_time=1,
+            static_condensation=True,
+            operator_splitting=operator_splitting,
+        )
+        my_model.dt = F.Stepsize(0.005)
+        my_model.initialise()
+        my_model.run()
+        return my_model.h_transport_problem.u
+
+    u_split = run(True)
+    u_monolithic = run(False)
+
+    assert f.errornorm(u_split, u_monolithic) / f.norm(u_monolithic) < 1e-2
+
+
+def test_bdf2_is_more_accurate_than_backward_euler():
+    """
+    Runs a transient simulation with a trap with a coarse stepsize and
+    checks that BDF2 is closer to a fine backward Euler reference than
+    backward Euler
+    """
+
+    def run(time_scheme, stepsize):
+        my_model = F.Simulation()
+        my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=50))
+        my_model.materials = F.Material(id=1, D_0=1, E_D=0)
+        my_model.traps = F.Trap(k_0=1, E_k=0, p_0=0.1, E_p=0, materials=1, density=2)
+        my_model.T = 300
+        my_model.boundary_conditions = [
+            F.DirichletBC(surfaces=[1], value=1, field=0),
+        ]
+        my_model.settings = F.Settings(
+            absolute_tolerance=1e-10,
+            relative_tolerance=1e-10,
+            final_time=1,
+        )
+        my_model.dt = F.Stepsize(stepsize, time_scheme=time_scheme)
+        my_model.initialise()
+        my_model.run()
+        return my_model.h_transport_problem.u
+
+    u_reference = run("backward_euler", 1e-3)
+    error_bdf2 = f.errornorm(u_reference, run("BDF2", 0.05))
+    error_backward_euler = f.errornorm(u_reference, run("backward_euler", 0.05))
+
+    assert error_bdf2 < error_backward_euler
+
+
+def test_bdf2_temperature_is_solved_with_the_retried_stepsize(monkeypatch):
+    """
+    Rejects the first attempt of the second BDF2 step of a simulation with a
+    transient heat transfer problem and checks that the temperature is the
+    same as when the retried stepsize is used directly
+    """
+
+    def make_model(stepsize):
+        my_model = F.Simulation()
+        my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=20))
+        my_model.materials = F.Material(
+            id=1, D_0=1, E_D=0, thermal_cond=1, rho=1, heat_capacity=1
+        )
+        my_model.T = F.HeatTransferProblem(transient=True, initial_condition=300)
+        my_model.boundary_conditions = [
+            F.DirichletBC(surfaces=[1], value=300 + 100 * F.t, field="T"),
+            F.DirichletBC(surfaces=[1], value=1, field=0),
+        ]
+        my_model.settings = F.Settings(
+            absolute_tolerance=1e-10, relative_tolerance=1e-10, final_time=100
+        )
+        my_model.dt = stepsize
+        my_model.initialise()
+        return my_model
+
+    # the second step is rejected once
+    retried_model = make_model(
+        F.Stepsize(1, stepsize_change_ratio=2, time_scheme="BDF2")
+    )
+    h_transport_problem = retried_model.h_transport_problem
+    solve_once = h_transport_problem.solve_once
+    attempts = []
+
+    def failing_once():
+        attempts.append(float(retried_model.dt.value))
+        if len(attempts) == 2:
+            return retried_model.settings.maximum_iterations, False
+        return solve_once()
+
+    monkeypatch.setattr(h_transport_problem, "solve_once", failing_once)
+    retried_model.iterate()
+    retried_model.iterate()
+    assert len(attempts) == 3
+    retried_stepsize = attempts[2]
+    assert retried_stepsize != attempts[1]
+
+    # the same steps without rejection
+    reference_model = make_model(F.Stepsize(1, time_scheme="BDF2"))
+    reference_model.iterate()
+    reference_model.dt.value.assign(retried_stepsize)
+    reference_model.iterate()
+
+    assert retried_model.t == pytest.approx(reference_model.t)
+    assert f.errornorm(retried_model.T.T, reference_model.T.T) < 1e-10
+    assert (
+        f.errornorm(
+            retried_model.h_transport_problem.u, reference_model.h_transport_problem.u
+        )
+        < 1e-10
+    )
+
+
+def test_error_controlled_stepsize():
+    """
+    Runs a transient simulation with an error-controlled stepsize and
+    checks that the final time is reached and that the solution is close
+    to a fine stepsize reference
+    """
+
+    def run(stepsize):
+        my_model = F.Simulation()
+        my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=50))
+        my_model.materials = F.Material(id=1, D_0=1, E_D=0)
+        my_model.traps = F.Trap(k_0=1, E_k=0, p_0=0.1, E_p=0, materials=1, density=2)
+        my_model.T = 300
+        my_model.boundary_conditions = [
+            F.DirichletBC(surfaces=[1], value=1, field=0),
+        ]
+        my_model.settings = F.Settings(
+            absolute_tolerance=1e-10,
+            relative_tolerance=1e-10,
+            final_time=2,
+        )
+        my_model.dt = stepsize
+        my_model.initialise()
+        my_model.run()
+        return my_model
+
+    reference = run(F.Stepsize(1e-3))
+    controlled = run(F.Stepsize(1e-3, rtol={"solute": 1e-3, 1: 1e-2}, atol=1e-6))
+
+    assert np.isclose(controlled.t, 2)
+    u_reference = reference.h_transport_problem.u
+    u_controlled = controlled.h_transport_problem.u
+    assert f.errornorm(u_controlled, u_reference) / f.norm(u_reference) < 1e-2
+
+
+def test_set_parameters_without_initialising_again():
+    """Checks that Simulation.set_parameters modifies the solution without
+    recreating the variational form"""
+    my_model = F.Simulation()
+    my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=20))
+    my_model.materials = F.Material(id=1, D_0=1, E_D=0, name="mat")
+    my_model.T = 300
+    my_model.sources = [F.Source(value=1, volume=1, field=0)]
+    my_model.boundary_conditions = [
+        F.DirichletBC(surfaces=[1, 2], value=0, field=0),
+    ]
+    my_model.settings = F.Settings(1e-10, 1e-10, transient=False)
+    my_model.initialise()
+    form = my_model.h_transport_problem.F
+
+    my_model.run()
+    c_reference = my_model.h_transport_problem.u(0.5)
+
+    my_model.set_parameters("mat", D_0=2)
+    my_model.run()
+
+    assert my_model.h_transport_problem.F is form
+    assert my_model.h_transport_problem.u(0.5) == pytest.approx(c_reference / 2)
+
+
+def test_set_parameters_with_chemical_potential():
+    """Checks that Simulation.set_parameters updates the solubility used by
+    the Dirichlet BCs and by the conversion of theta to the concentration
+    with conservation of chemical potential"""
+    my_model = F.Simulation()
+    my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=20))
+    my_model.materials = F.Material(id=1, D_0=1, E_D=0, S_0=2, E_S=0, name="mat")
+    my_model.T = 300
+    my_model.boundary_conditions = [
+        F.DirichletBC(surfaces=[1], value=1, field=0),
+        F.DirichletBC(surfaces=[2], value=0, field=0),
+    ]
+    my_model.settings = F.Settings(1e-10, 1e-10, transient=False, chemical_pot=True)
+    my_model.initialise()
+    form = my_model.h_transport_problem.F
+
+    my_model.run()
+    assert my_model.h_transport_problem.u(0) == pytest.approx(1 / 2)
+
+    my_model.set_parameters("mat", S_0=4)
+    my_model.run()
+
+    assert my_model.h_transport_problem.F is form
+    # theta = c/S
+    assert my_model.h_transport_problem.u(0) == pytest.approx(1 / 4)
+    assert my_model.mobile.post_processing_solution(0) == pytest.approx(1)
+    assert my_model.mobile.post_processing_solution(0.5) == pytest.approx(0.5)
+
+
+def test_reset_gives_same_results():
+    """Checks that a model reset and run again gives the same results
+    without being initialised again"""
+    derived_quantities = F.DerivedQuantities([F.TotalVolume("retention", volume=1)])
+    my_model = F.Simulation()
+    my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=20))
+    my_model.materials = F.Material(id=1, D_0=1, E_D=0)
+    my_model.traps = F.Trap(k_0=1, E_k=0, p_0=0.1, E_p=0, materials=1, density=2)
+    my_model.T = 300 + 10 * F.t
+    my_model.boundary_conditions = [F.DirichletBC(surfaces=[1], value=1, field=0)]
+    my_model.settings = F.Settings(1e-10, 1e-10, final_time=2)
+    my_model.dt = F.Stepsize(0.1, stepsize_change_ratio=1.1)
+    my_model.exports = [derived_quantities]
+    my_model.initialise()
+    form = my_model.h_transport_problem.F
+
+    my_model.run()
+    reference = list(derived_quantities[0].data)
+
+    my_model.reset()
+    assert my_model.t == 0
+    assert derived_quantities[0].data == []
+    my_model.run()
+
+    assert my_model.h_transport_problem.F is form
+    assert derived_quantities[0].data == pytest.approx(reference)
+
+
+def test_reset_before_initialise():
+    with pytest.raises(AttributeError, match="must be initialised"):
+        F.Simulation().reset()
+
+
+def make_diffusion_model(D_0, value):
+    """Model factory of test_run_sweep, defined at the top level so that it
+    can be used by the worker processes"""
+    my_model = F.Simulation()
+    my_model.mesh = F.MeshFromVertices(np.linspace(0, 1, num=20))
+    my_model.materials = F.Material(id=1, D_0=D_0, E_D=0)
+    my_model.T = 300
+    my_model.boundary_conditions = [
+        F.DirichletBC(surfaces=[1], value=value, field=0),
+        F.DirichletBC(surfaces=[2], value=0, field=0),
+    ]
+    my_model.settings = F.Settings(1e-10, 1e-10, transient=False)
+    my_model.exports = [F.DerivedQuantities([F.SurfaceFlux("solute", surface=2)])]
+    return my_model
+
+
+def test_run_sweep():
+    """Checks that run_sweep gives the results of the runs in the order of
+    the samples"""
+    results = F.run_sweep(
+        make_diffusion_model, {"D_0": [1, 2], "value": [1, 3]}, max_workers=2
+    )
+    table = results.table()
+    title = results.titles[0]
+
+    assert len(results) == 4
+    # steady-state flux through a slab of thickness 1: D * grad(c) = - D * value
+    assert table[title] == pytest.approx(-table["D_0"] * table["value"], rel=1e-6)
+
+
+def test_cached_results_are_restored(tmpdir):
+    """Checks that a model identical to a model already run is not solved
+    again and gets the derived quantities and files of the first run"""
+    cache = F.ResultCache(str(tmpdir.join("cache")))
+    csv_file = str(tmpdir.join("derived_quantities.csv"))
+
+    my_model = make_diffusion_model(D_0=2, value=3)
+    my_model.exports[0].filename = csv_file
+    my_model.cache = cache
+    my_model.initialise()
+    my_model.run()
+    os.remove(csv_file)
+
+    other_model = make_diffusion_model(D_0=2, value=3)
+    other_model.exports[0].filename = csv_file
+    other_model.cache = cache
+    other_model.initialise()
+    other_model.run()
+
+    assert len(cache.entries()) == 1
+    assert list(other_model.exports[0][0].data) == list(my_model.exports[0][0].data)
+    assert other_model.exports[0].data == my_model.exports[0].data
+    assert os.path.exists(csv_file)
+    # the model was not solved
+    assert other_model.h_transport_problem.u.vector().norm("l2") == 0
+
+
+def test_different_models_are_not_cached_together(tmpdir):
+    cache = F.ResultCache(str(tmpdir))
+    fluxes = []
+    for value in [1, 2]:
+        my_model = make_diffusion_model(D_0=1, value=value)
+        my_model.cache = cache
+        my_model.initialise()
+        my_model.run()
+        fluxes.append(my_model.exports[0][0].data[-1])
+
+    assert len(cache.entries()) == 2
+    assert fluxes[1] == pytest.approx(2 * fluxes[0])
@@ -67,18 +67,19 @@ def test_define_dirichlet_bcs_theta():
     for i in range(0, 3):
         my_temp.expression.t = i
         my_temp.T.assign(fenics.interpolate(my_temp.expression, V))
-        expressions[0].t = i
-        expressions[1].t = i
+        for expr in expressions:
+            expr.t = i
+        my_bc.compute_values()
 
-        # Test that the expression is correct at vertices
-        expr = fenics.interpolate(expressions[1], V)
+        # Test that the values are correct at the boundary dofs
+        values = my_bc.boundary_values
         assert np.isclose(
-            expr(0.25, 0.5),
-            (200 + i) / (S_01 * np.exp(-E_S1 / festim.k_B / my_temp.T(0.25, 0.5))),
+            values(0, 0.5),
+            (200 + i) / (S_01 * np.exp(-E_S1 / festim.k_B / my_temp.T(0, 0.5))),
         )
         assert np.isclose(
-            expr(0.75, 0.5),
-            (200 + i) / (S_02 * np.exp(-E_S2 / festim.k_B / my_temp.T(0.75, 0.5))),
+            values(1, 0.5),
+            (200 + i) / (S_02 * np.exp(-E_S2 / festim.k_B / my_temp.T(1, 0.5))),
         )
 
         # Test that the BCs can be applied to a problem
@@ -262,6 +263,7 @@ def test_bc_recomb_chemical_pot():
         my_temp.T.assign(fenics.interpolate(my_temp.expression, V))
         for expr in expressions:
             expr.t = i
+        my_bc.compute_values()
 
         T_left = 200 + i
         T_right = 200 + 2 * i
@@ -462,6 +464,122 @@ def test_create_expression_dc_custom():
             assert expected(x) == my_BC.expression(x)
 
 
+def test_dc_custom_is_compiled():
+    """Checks that a custom function made of arithmetic operations is
+    compiled and that the other functions are evaluated in Python
+    """
+
+    def arithmetic(T, prm1):
+        return 2 * T + prm1
+
+    def with_fenics_exp(T, prm1):
+        return fenics.exp(-prm1 / T)
+
+    T = fenics.Constant(300)
+    compiled_bc = festim.CustomDirichlet(surfaces=1, function=arithmetic, prm1=2)
+    compiled_bc.create_expression(T)
+    python_bc = festim.CustomDirichlet(surfaces=1, function=with_fenics_exp, prm1=2)
+    python_bc.create_expression(T)
+
+    assert not isinstance(compiled_bc.expression, festim.BoundaryConditionExpression)
+    assert compiled_bc.expression(0) == pytest.approx(602)
+    assert isinstance(python_bc.expression, festim.BoundaryConditionExpression)
+    assert python_bc.expression(0) == pytest.approx(np.exp(-2 / 300))
+
+
+def test_dc_custom_errors_are_raised():
+    """Checks that an error in a custom function that is not due to the
+    sympy symbols is raised instead of falling back to Python evaluation"""
+
+    def buggy(T, prm1):
+        return {}["missing"] * T + prm1
+
+    my_bc = festim.CustomDirichlet(surfaces=1, function=buggy, prm1=2)
+    with pytest.raises(KeyError):
+        my_bc.create_expression(fenics.Constant(300))
+
+
+def test_dirichlet_bcs_theta_henry():
+    """Checks the BC values with conservation of chemical potential in a
+    Henry material: theta = (c/S)**0.5
+    """
+    mesh = fenics.UnitIntervalMesh(10)
+    V = fenics.FunctionSpace(mesh, "P", 1)
+    vm = fenics.MeshFunction("size_t", mesh, 1, 1)
+    sm = fenics.MeshFunction("size_t", mesh, 0, 0)
+    fenics.CompiledSubDomain("near(x[0], 0)").mark(sm, 1)
+
+    T = fenics.Constant(500)
+    mat = festim.Material(1, None, None, S_0=2, E_S=0.1, solubility_law="henry")
+    my_mats = festim.Materials([mat])
+
+    my_bc = festim.DirichletBC(1, value=100, field=0)
+    my_bc.create_dirichletbc(
+        V,
+        T,
+        surface_markers=sm,
+        chemical_pot=True,
+        materials=my_mats,
+        volume_markers=vm,
+    )
+    u = fenics.Function(V)
+    my_bc.dirichlet_bc[0].apply(u.vector())
+
+    S = 2 * np.exp(-0.1 / festim.k_B / 500)
+    assert u(0) == pytest.approx((100 / S) ** 0.5)
+
+
+def test_dirichlet_values_are_computed_once_per_step():
+    """Checks that the values of a temperature-dependent BC applied on a
+    mixed function space are only updated when compute_values is called
+    """
+    mesh = fenics.UnitIntervalMesh(10)
+    P1 = fenics.FiniteElement("CG", mesh.ufl_cell(), 1)
+    V = fenics.FunctionSpace(mesh, fenics.MixedElement([P1, P1]))
+    sm = fenics.MeshFunction("size_t", mesh, 0, 0)
+    fenics.CompiledSubDomain("near(x[0], 0)").mark(sm, 1)
+    T = fenics.Function(fenics.FunctionSpace(mesh, "CG", 1))
+    T.assign(fenics.Constant(300))
+
+    my_bc = festim.SievertsBC(1, S_0=2, E_S=0.1, pressure=100)
+    my_bc.create_dirichletbc(V, T, surface_markers=sm)
+
+    def applied_value():
+        u = fenics.Function(V)
+        my_bc.dirichlet_bc[0].apply(u.vector())
+        return u(0)[0]
+
+    def expected(T):
+        return 2 * np.exp(-0.1 / festim.k_B / T) * 100**0.5
+
+    assert applied_value() == pytest.approx(expected(300))
+    T.assign(fenics.Constant(500))
+    assert applied_value() == pytest.approx(expected(300))
+    my_bc.compute_values()
+    assert applied_value() == pytest.approx(expected(500))
+
+
+def test_evaluate_at_boundary():
+    """Checks that functions and expressions are evaluated at the dofs of
+    the surfaces of a BC"""
+    mesh = fenics.UnitIntervalMesh(10)
+    V = fenics.FunctionSpace(mesh, "CG", 1)
+    sm = fenics.MeshFunction("size_t", mesh, 0, 0)
+    fenics.CompiledSubDomain("near(x[0], 0)").mark(sm, 1)
+    fenics.CompiledSubDomain("near(x[0], 1)").mark(sm, 2)
+    T = fenics.interpolate(fenics.Expression("300 + 100*x[0]", degree=1), V)
+
+    my_bc = festim.SievertsBC([1, 2], S_0=2, E_S=0.1, pressure=100)
+    my_bc.create_dirichletbc(V, T, surface_markers=sm)
+    x = V.tabulate_dof_coordinates()[my_bc._dofs, 0]
+
+    assert sorted(x) == pytest.approx([0, 1])
+    assert my_bc.evaluate_at_boundary(T) == pytest.approx(300 + 100 * x)
+    expression = fenics.Expression("1 + 2*x[0]", degree=1)
+    assert my_bc.evaluate_at_boundary(expression) == pytest.approx(1 + 2 * x)
+    assert my_bc.evaluate_at_boundary(fenics.Constant(3)) == 3
+
+
 def test_create_form_flux_custom():
     """Creates a flux_custom bc and checks
     create_form returns
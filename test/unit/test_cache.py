@@ -0,0 +1,70 @@
+import festim
+import numpy as np
+import os
+import pytest
+
+
+def make_model(D_0=1):
+    return festim.Simulation(
+        mesh=festim.MeshFromVertices(np.linspace(0, 1, num=11)),
+        materials=festim.Material(1, D_0=D_0, E_D=0),
+        temperature=300,
+        boundary_conditions=[festim.DirichletBC(surfaces=[1], value=1, field=0)],
+        settings=festim.Settings(1e-10, 1e-10, transient=False),
+    )
+
+
+def add_entry(cache, key, size, last_used):
+    """Creates fake results in the cache"""
+    folder = os.path.join(cache.directory, key)
+    os.makedirs(os.path.join(folder, "files"))
+    with open(os.path.join(folder, "files", "0"), "wb") as file:
+        file.write(b"0" * size)
+    results_file = os.path.join(folder, cache.results_filename)
+    with open(results_file, "wb") as file:
+        file.write(b"")
+    os.utime(results_file, (last_used, last_used))
+
+
+def test_same_models_have_same_key(tmpdir):
+    cache = festim.ResultCache(str(tmpdir))
+    assert cache.key(make_model()) == cache.key(make_model())
+
+
+def test_different_models_have_different_keys(tmpdir):
+    cache = festim.ResultCache(str(tmpdir))
+    assert cache.key(make_model(D_0=1)) != cache.key(make_model(D_0=2))
+
+
+def test_key_depends_on_version(tmpdir, monkeypatch):
+    cache = festim.ResultCache(str(tmpdir))
+    key = cache.key(make_model())
+    monkeypatch.setattr(festim, "__version__", "0.0.0")
+    assert cache.key(make_model()) != key
+
+
+def test_missing_results_are_not_loaded(tmpdir):
+    cache = festim.ResultCache(str(tmpdir))
+    my_model = make_model()
+    assert not cache.load(cache.key(my_model), my_model)
+
+
+def test_least_recently_used_results_are_evicted(tmpdir):
+    cache = festim.ResultCache(str(tmpdir), max_size=2500)
+    add_entry(cache, "a", 1000, last_used=3)
+    add_entry(cache, "b", 1000, last_used=1)
+    add_entry(cache, "c", 1000, last_used=2)
+    assert cache.entries() == ["b", "c", "a"]
+
+    cache.evict()
+
+    assert cache.entries() == ["c", "a"]
+    assert cache.size() <= 2500
+
+
+def test_clear(tmpdir):
+    cache = festim.ResultCache(str(tmpdir))
+    add_entry(cache, "a", 10, last_used=1)
+    cache.clear()
+    assert cache.entries() == []
+    assert cache.size() == 0
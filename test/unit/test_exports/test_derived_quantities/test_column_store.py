@@ -0,0 +1,38 @@
+from festim import ColumnStore
+import numpy as np
+import pytest
+
+
+def test_append_beyond_capacity():
+    store = ColumnStore(["t(s)", "flux"], capacity=2)
+    for i in range(5):
+        store.append([i, 2 * i])
+
+    assert len(store) == 5
+    assert store.capacity >= 5
+    assert list(store.column(0)) == [0, 1, 2, 3, 4]
+    assert list(store.column(1)) == [0, 2, 4, 6, 8]
+    assert store.rows(3).tolist() == [[3, 6], [4, 8]]
+
+
+def test_columns_are_views():
+    store = ColumnStore(["t(s)", "flux"])
+    store.append([1, 2])
+    store.append([3, 4])
+
+    assert not np.shares_memory(store.column(0), store.column(1))
+    assert np.shares_memory(store.column(1), store.rows())
+
+
+def test_clear():
+    store = ColumnStore(["t(s)", "flux"])
+    store.append([1, 2])
+    store.clear()
+    assert len(store) == 0
+    assert len(store.column(1)) == 0
+
+
+def test_wrong_number_of_values():
+    store = ColumnStore(["t(s)", "flux"])
+    with pytest.raises(ValueError, match="expected 2 values, got 3"):
+        store.append([1, 2, 3])
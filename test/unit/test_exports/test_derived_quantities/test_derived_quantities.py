@@ -16,6 +16,7 @@ from festim import (
     Materials,
 )
 import fenics as f
+import numpy as np
 import os
 from pathlib import Path
 import pytest
@@ -346,6 +347,25 @@ class TestCompute:
 
         assert my_derv_quant.data[1] == expected_data
 
+    def test_data_are_views_of_store(self):
+        """Checks that the data of the derived quantities are columns of the
+        store of DerivedQuantities and that there is one row per call"""
+        my_derv_quant = DerivedQuantities([self.surface_flux_1, self.tot_vol_1])
+        for quantity in my_derv_quant:
+            quantity.function = self.label_to_function[quantity.field]
+        my_derv_quant.assign_properties_to_quantities(self.my_mats)
+        my_derv_quant.assign_measures_to_quantities(self.dx, self.ds)
+
+        for t in [1, 2, 3]:
+            my_derv_quant.compute(t)
+
+        assert len(my_derv_quant.store) == 3
+        for i, quantity in enumerate(my_derv_quant):
+            assert isinstance(quantity.data, np.ndarray)
+            assert np.shares_memory(quantity.data, my_derv_quant.store.rows())
+            assert list(quantity.t) == [1, 2, 3]
+            assert list(quantity.data) == [row[i + 1] for row in my_derv_quant.data[1:]]
+
 
 class TestWrite:
     @pytest.fixture
@@ -381,6 +401,43 @@ class TestWrite:
 
         assert os.path.exists(filename)
 
+    def test_write_appends_new_rows(self, folder, my_derived_quantities):
+        """Checks that write() only adds the new rows to the file"""
+        filename = "{}/my_file.csv".format(folder)
+        my_derived_quantities.filename = filename
+        my_derived_quantities.write()
+        my_derived_quantities.store.append([2, 4, 6.5])
+        my_derived_quantities.write()
+
+        with open(filename) as file:
+            assert file.read() == "a,b,c\n1.0,2.0,3.0\n1.0,2.0,3.0\n2.0,4.0,6.5\n"
+
+    def test_write_after_close_rewrites_file(self, folder, my_derived_quantities):
+        filename = "{}/my_file.csv".format(folder)
+        my_derived_quantities.filename = filename
+        my_derived_quantities.write()
+        my_derived_quantities.close()
+        my_derived_quantities.data = [["a", "b", "c"], [5, 6, 7]]
+        my_derived_quantities.write()
+
+        with open(filename) as file:
+            assert file.read() == "a,b,c\n5.0,6.0,7.0\n"
+
+    def test_write_binary(self, folder, my_derived_quantities):
+        """Checks that the data can be written in a .npy file and read
+        by columns"""
+        filename = "{}/my_file.npy".format(folder)
+        my_derived_quantities.filename = filename
+        my_derived_quantities.write()
+        my_derived_quantities.store.append([2, 4, 6.5])
+        my_derived_quantities.write()
+        my_derived_quantities.close()
+
+        data = np.load(filename)
+        assert data.dtype.names == ("a", "b", "c")
+        assert list(data["a"]) == [1, 1, 2]
+        assert list(data["c"]) == [3, 3, 6.5]
+
 
 class TestFilter:
     """Tests the filter method of DerivedQUantities"""
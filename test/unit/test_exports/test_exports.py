@@ -1,4 +1,5 @@
 import festim
+import fenics as f
 import pytest
 import numpy as np
 
@@ -176,3 +177,67 @@ def test_show_units_true_with_retention():
 
     my_model.initialise()
     my_model.run()
+
+
+def test_reset(tmpdir):
+    derived_quantities = festim.DerivedQuantities([festim.TotalVolume("solute", 1)])
+    derived_quantities.data = [["t(s)", "Total solute volume 1"], [1, 2]]
+    derived_quantities[0].data = [2]
+    derived_quantities[0].t = [1]
+    xdmf_export = festim.XDMFExport("solute", folder=str(tmpdir))
+    xdmf_export.append = True
+    txt_export = festim.TXTExport("solute", filename=str(tmpdir) + "/out.txt")
+    txt_export._first_time = False
+    my_exports = festim.Exports([derived_quantities, xdmf_export, txt_export])
+    my_exports.nb_iterations = 10
+
+    my_exports.reset()
+
+    assert my_exports.nb_iterations == 0
+    assert derived_quantities.data == []
+    assert derived_quantities.t == []
+    assert derived_quantities[0].data == []
+    assert derived_quantities[0].t == []
+    assert not xdmf_export.append
+    assert txt_export._first_time
+
+
+def test_fields_are_projected_once_per_step():
+    """Checks that Exports.project gives the same result as fenics.project
+    and only projects a field again after invalidate_projections()"""
+    mesh = f.UnitSquareMesh(4, 4)
+    V = f.FunctionSpace(mesh, "CG", 1)
+    u = f.interpolate(f.Expression("x[0]*x[0] + x[1]", degree=2), V)
+    my_exports = festim.Exports([])
+    my_exports.V_DG1 = f.FunctionSpace(mesh, "DG", 1)
+
+    projection = my_exports.project("retention", u * u)
+    expected = f.project(u * u, my_exports.V_DG1)
+    assert np.allclose(projection.vector()[:], expected.vector()[:])
+
+    u.assign(f.Constant(2))
+    assert my_exports.project("retention", u * u) is projection
+    assert np.allclose(projection.vector()[:], expected.vector()[:])
+
+    my_exports.invalidate_projections()
+    assert my_exports.project("retention", u * u) is projection
+    assert np.allclose(projection.vector()[:], 4)
+
+
+def test_close_flushes_txt_exports(tmpdir):
+    """Checks that Exports.close() writes the columns of a TXTExport that
+    weren't written because its last export time wasn't reached"""
+    mesh = f.UnitIntervalMesh(10)
+    V = f.FunctionSpace(mesh, "P", 1)
+    my_export = festim.TXTExport(
+        "solute", filename=str(tmpdir.join("solute.txt")), times=[1, 2, 10]
+    )
+    my_export.function = f.interpolate(f.Constant(2), V)
+    my_exports = festim.Exports([my_export])
+
+    my_export.write(current_time=1, steady=False, final_time=5)
+    my_export.write(current_time=2, steady=False, final_time=5)
+    my_exports.close()
+
+    with open(my_export.filename) as file:
+        assert file.readline().rstrip() == "x,t=1.00e+00s,t=2.00e+00s"
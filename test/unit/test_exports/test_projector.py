@@ -0,0 +1,43 @@
+from festim import Projector
+import fenics as f
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("family", ["DG", "CG"])
+def test_same_as_fenics_project(family):
+    mesh = f.UnitSquareMesh(5, 5)
+    V = f.FunctionSpace(mesh, family, 1)
+    u = f.interpolate(f.Expression("x[0]*x[1] + 1", degree=2), V)
+    projector = Projector(V)
+
+    assert projector.local == (family == "DG")
+    for expression in [u * u, f.exp(u)]:
+        projection = projector.project(expression)
+        expected = f.project(expression, V)
+        assert np.allclose(projection.vector()[:], expected.vector()[:])
+
+
+def test_reuses_function():
+    mesh = f.UnitIntervalMesh(10)
+    V = f.FunctionSpace(mesh, "DG", 1)
+    function = f.Function(V)
+    projector = Projector(V)
+
+    assert projector.project(f.Constant(3), function=function) is function
+    assert np.allclose(function.vector()[:], 3)
+
+
+def test_project_on_subdomain():
+    """Checks that the projection of an expression integrated on a
+    subdomain is zero elsewhere"""
+    mesh = f.UnitIntervalMesh(10)
+    markers = f.MeshFunction("size_t", mesh, 1, 1)
+    f.CompiledSubDomain("x[0] >= 0.5 - DOLFIN_EPS").mark(markers, 2)
+    dx = f.Measure("dx", domain=mesh, subdomain_data=markers)
+    V = f.FunctionSpace(mesh, "DG", 1)
+
+    projection = Projector(V).project(f.Constant(2), dx=[dx(2)])
+
+    assert projection(0.1) == pytest.approx(0, abs=1e-12)
+    assert projection(0.9) == pytest.approx(2)
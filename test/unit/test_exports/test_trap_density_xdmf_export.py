@@ -154,3 +154,36 @@ def test_trap_density_xdmf_export_traps_materials_mixed(tmpdir):
     XDMFFile(str(Path(density_file))).read_checkpoint(density_read, "density1", -1)
     l2_error = errornorm(density_expected, density_read, "L2")
     assert l2_error < 2e-3
+
+
+def test_trap_density_xdmf_export_new_function_space(tmpdir):
+    """Checks that the density is projected on the new function space when
+    the exported function changes of function space (eg. when the simulation
+    is initialised again with another mesh)
+
+    Args:
+        tmpdir (os.PathLike): path to the pytest temporary folder
+    """
+    density_expr = 2 + festim.x + festim.y
+    density_file = tmpdir.join("density1.xdmf")
+    mat = festim.Material(1, 1, 1)
+    trap_1 = festim.Trap(1, 0, 1, 0, materials=mat, density=density_expr)
+    my_export = festim.TrapDensityXDMF(
+        trap=trap_1,
+        label="density1",
+        filename=str(Path(density_file)),
+    )
+
+    for nx in [10, 20]:
+        mesh = UnitSquareMesh(nx, nx)
+        V = FunctionSpace(mesh, "CG", 1)
+        volume_markers = MeshFunction("size_t", mesh, mesh.topology().dim(), 1)
+        dx = Measure("dx", domain=mesh, subdomain_data=volume_markers)
+        trap_1.density = [interpolate(festim.as_expression(density_expr), V)]
+        my_export.function = Function(V)
+
+        my_export.write(t=1, dx=dx)
+
+        density_read = Function(V)
+        XDMFFile(str(Path(density_file))).read_checkpoint(density_read, "density1", -1)
+        assert errornorm(trap_1.density[0], density_read, "L2") < 1e-10
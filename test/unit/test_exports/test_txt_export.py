@@ -1,5 +1,6 @@
-from festim import TXTExport, Stepsize
+from festim import TXTExport, Stepsize, Projector
 import fenics as f
+import numpy as np
 import os
 import pytest
 from pathlib import Path
@@ -122,3 +123,89 @@ class TestWhenIsNextTime:
     def test_last(self, my_export):
         assert my_export.when_is_next_time(3) is None
         assert my_export.when_is_next_time(4) is None
+
+
+def test_write_reuses_function_space(tmpdir, monkeypatch):
+    """Checks that the DG1 function space of TXTExport is only created once
+    and that nothing is projected when it is not time to export"""
+    mesh = f.UnitIntervalMesh(10)
+    V = f.FunctionSpace(mesh, "P", 1)
+    my_export = TXTExport(
+        "solute",
+        times=[1, 2, 3],
+        filename="{}/solute_label.txt".format(str(Path(tmpdir))),
+    )
+    my_export.function = f.Function(V)
+
+    nb_function_spaces = []
+    function_space = f.FunctionSpace
+
+    def counting_function_space(*args, **kwargs):
+        nb_function_spaces.append(1)
+        return function_space(*args, **kwargs)
+
+    monkeypatch.setattr(f, "FunctionSpace", counting_function_space)
+
+    nb_projections = []
+    project = Projector.project
+
+    def counting_project(*args, **kwargs):
+        nb_projections.append(1)
+        return project(*args, **kwargs)
+
+    monkeypatch.setattr(Projector, "project", counting_project)
+
+    for t in [1, 1.5, 2, 2.5, 3]:
+        my_export.write(current_time=t, steady=False)
+
+    assert len(nb_function_spaces) == 1
+    assert len(nb_projections) == 3
+
+
+def test_file_is_written_at_first_and_last_exports(tmpdir):
+    """Checks that the columns are kept in memory between the first and the
+    last exports and that flush() writes them"""
+    mesh = f.UnitIntervalMesh(10)
+    V = f.FunctionSpace(mesh, "P", 1)
+    my_export = TXTExport(
+        "solute",
+        filename="{}/solute_label.txt".format(str(Path(tmpdir))),
+    )
+    my_export.function = f.interpolate(f.Constant(2), V)
+
+    def read_header():
+        with open(my_export.filename) as file:
+            return file.readline().rstrip()
+
+    my_export.write(current_time=1, steady=False, final_time=4)
+    my_export.write(current_time=2, steady=False, final_time=4)
+    assert read_header() == "x,t=1.00e+00s"
+
+    my_export.flush()
+    assert read_header() == "x,t=1.00e+00s,t=2.00e+00s"
+
+    my_export.write(current_time=4, steady=False, final_time=4)
+    assert read_header() == "x,t=1.00e+00s,t=2.00e+00s,t=4.00e+00s"
+    data = np.genfromtxt(my_export.filename, skip_header=1, delimiter=",")
+    assert data.shape == (20, 4)
+    assert np.allclose(data[:, 1:], 2)
+
+
+def test_dg1_function_is_not_projected(tmpdir, monkeypatch):
+    """Checks that TXTExport writes a DG1 function (eg. projected by
+    festim.Exports) without projecting it again"""
+    mesh = f.UnitIntervalMesh(10)
+    V = f.FunctionSpace(mesh, "DG", 1)
+    my_export = TXTExport(
+        "solute", filename="{}/solute_label.txt".format(str(Path(tmpdir)))
+    )
+    my_export.function = f.interpolate(f.Expression("2*x[0]", degree=1), V)
+
+    def forbidden_project(*args, **kwargs):
+        raise AssertionError("the function should not be projected")
+
+    monkeypatch.setattr(Projector, "project", forbidden_project)
+    my_export.write(current_time=1, steady=False, final_time=1)
+
+    data = np.genfromtxt(my_export.filename, skip_header=1, delimiter=",")
+    assert np.allclose(data[:, 1], 2 * data[:, 0])
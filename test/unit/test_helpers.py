@@ -5,9 +5,29 @@ from festim import (
     as_constant,
     as_expression,
     as_constant_or_expression,
+    is_time_dependent,
+    freeze_expressions,
+    canonical_ccode,
+    parameter_as_constant,
+    set_parameter,
+    Material,
+    Trap,
     t,
+    x,
 )
-from fenics import Constant, Expression, UserExpression
+from fenics import (
+    Constant,
+    Expression,
+    UserExpression,
+    Function,
+    FunctionSpace,
+    TestFunction,
+    UnitIntervalMesh,
+    assemble,
+    dx,
+)
+from ufl.algorithms import extract_coefficients
+from sympy import exp
 import pytest
 
 
@@ -61,3 +81,90 @@ def test_as_expression(expression, type):
 )
 def test_as_constant_or_expression(expression, type):
     assert isinstance(as_constant_or_expression(expression), type)
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        (as_expression(3 * t), True),
+        (as_expression(1 + x), False),
+        (as_expression(2.0), False),
+        (Expression("2 + x[0]", degree=2), True),
+        (CustomExpr(), True),
+    ],
+)
+def test_is_time_dependent(expression, expected):
+    assert is_time_dependent(expression) == expected
+
+
+def test_freeze_expressions():
+    """Checks that time-independent expressions of the form are replaced by
+    functions and that duplicates are removed from the expressions"""
+    mesh = UnitIntervalMesh(10)
+    v = TestFunction(FunctionSpace(mesh, "CG", 1))
+    constant_in_time = as_expression(1 + x)
+    time_dependent = as_expression(1 + t)
+    not_in_form = as_expression(2 + x)
+    form = (constant_in_time + time_dependent) * v * dx
+    expected = assemble(form).get_local()
+
+    expressions = [constant_in_time, time_dependent, time_dependent, not_in_form]
+    frozen_form, remaining = freeze_expressions(form, expressions, mesh)
+
+    assert remaining == [time_dependent]
+    coefficients = extract_coefficients(frozen_form)
+    assert not any(c is constant_in_time for c in coefficients)
+    assert any(isinstance(c, Function) for c in coefficients)
+    assert assemble(frozen_form).get_local() == pytest.approx(expected)
+
+
+def test_canonical_ccode_only_depends_on_structure():
+    code_1, parameters_1 = canonical_ccode(300 + 10 * t + 2 * x**2)
+    code_2, parameters_2 = canonical_ccode(500 + 20 * t + 2 * x**2)
+    assert code_1 == code_2
+    assert dict(parameters_1) != dict(parameters_2)
+
+
+@pytest.mark.parametrize(
+    "expr", [3.0, 1e19, 300 + 10 * t, 2 * x**2 + 1.5e3 * x, 1e19 * exp(-0.5 / (1 + x))]
+)
+def test_as_expression_values(expr):
+    expression = as_expression(expr)
+    expression.t = 2
+    for x_value in [0, 0.3, 1]:
+        expected = float(
+            expr.subs({t: 2, x: x_value}) if hasattr(expr, "subs") else expr
+        )
+        assert expression(x_value) == pytest.approx(expected)
+
+
+def test_parameter_as_constant_is_created_once():
+    my_mat = Material(1, D_0=2, E_D=0.1)
+    D_0 = parameter_as_constant(my_mat, "D_0")
+    assert isinstance(D_0, Constant)
+    assert float(D_0) == 2
+    assert parameter_as_constant(my_mat, "D_0") is D_0
+
+
+def test_parameter_as_constant_returns_non_numbers_as_is():
+    thermal_cond = lambda T: 3 * T
+    my_mat = Material(1, D_0=2, E_D=0.1, thermal_cond=thermal_cond)
+    assert parameter_as_constant(my_mat, "thermal_cond") is thermal_cond
+    assert parameter_as_constant(my_mat, "S_0") is None
+
+
+def test_set_parameter_updates_constants():
+    my_trap = Trap(
+        k_0=[1, 2], E_k=[1, 2], p_0=[3, 4], E_p=[3, 4], materials=[1, 2], density=[1, 2]
+    )
+    k_0_mat1 = parameter_as_constant(my_trap, "k_0", 0)
+    k_0_mat2 = parameter_as_constant(my_trap, "k_0", 1)
+    set_parameter(my_trap, "k_0", [5, 6])
+    assert my_trap.k_0 == [5, 6]
+    assert float(k_0_mat1) == 5
+    assert float(k_0_mat2) == 6
+
+
+def test_set_parameter_unknown_parameter():
+    with pytest.raises(AttributeError, match="has no parameter"):
+        set_parameter(Material(1, D_0=2, E_D=0.1), "foo", 1)
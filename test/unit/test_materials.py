@@ -1,6 +1,7 @@
 import festim as F
 from fenics import *
 import pytest
+import numpy as np
 import warnings
 
 
@@ -42,6 +43,28 @@ def test_find_material_from_id_unfound_id():
         my_Mats.find_material_from_id(id_test)
 
 
+def test_find_material_from_id_after_modifications():
+    """Checks find_material_from_id() is up to date when the list or the
+    ids of the materials are modified
+    """
+    mat_1 = F.Material(id=1, D_0=None, E_D=None)
+    mat_2 = F.Material(id=2, D_0=None, E_D=None)
+    my_Mats = F.Materials([mat_1])
+    assert my_Mats.find_material_from_id(1) == mat_1
+
+    my_Mats.append(mat_2)
+    assert my_Mats.find_material_from_id(2) == mat_2
+
+    my_Mats[0] = F.Material(id=3, D_0=None, E_D=None)
+    with pytest.raises(ValueError, match="Couldn't find ID 1"):
+        my_Mats.find_material_from_id(1)
+
+    mat_2.id = [4, 5]
+    assert my_Mats.find_material_from_id(5) == mat_2
+    with pytest.raises(ValueError, match="Couldn't find ID 2"):
+        my_Mats.find_material_from_id(2)
+
+
 def test_find_material_from_name():
     """Checks the function find_material_from_name() returns the correct material"""
     mat_1 = F.Material(id=1, D_0=None, E_D=None, name="mat1")
@@ -214,6 +237,52 @@ class TestCheckBorders:
         materials.check_borders(size=9)
 
 
+class TestFindSubdomainFromXCoordinate:
+    materials = F.Materials(
+        [
+            F.Material([1, 2], 1, 0, borders=[[0, 1], [1, 5]]),
+            F.Material(3, 1, 0, borders=[5, 9]),
+        ]
+    )
+
+    @pytest.mark.parametrize(
+        "x,expected", [(0, 1), (0.5, 1), (3, 2), (7, 3), (9, 3), (10, 0), (-1, 0)]
+    )
+    def test_subdomain(self, x, expected):
+        assert self.materials.find_subdomain_from_x_coordinate(x) == expected
+
+    @pytest.mark.parametrize("x,expected", [(1, 1), (5, 2)])
+    def test_first_material_has_priority_on_borders(self, x, expected):
+        assert self.materials.find_subdomain_from_x_coordinate(x) == expected
+
+    def test_material_without_borders(self):
+        materials = F.Materials([F.Material(4, 1, 0)])
+        assert materials.find_subdomain_from_x_coordinate(100) == 4
+
+    def test_modified_borders(self):
+        materials = F.Materials(
+            [F.Material(1, 1, 0, borders=[0, 1]), F.Material(2, 1, 0, borders=[1, 2])]
+        )
+        assert materials.find_subdomain_from_x_coordinate(0.8) == 1
+        materials[0].borders = [0, 0.5]
+        materials[1].borders = [0.5, 2]
+        materials.reset_indexes()
+        assert materials.find_subdomain_from_x_coordinate(0.8) == 2
+
+    @pytest.mark.parametrize("x,expected", [(1, 1), (2.5, 2), (4.2, 3), (5, 1)])
+    def test_nested_borders(self, x, expected):
+        """Checks that an interval containing other intervals is found when
+        x is after them, the first material having priority"""
+        materials = F.Materials(
+            [
+                F.Material(2, 1, 0, borders=[2, 3]),
+                F.Material(3, 1, 0, borders=[4, 4.5]),
+                F.Material(1, 1, 0, borders=[0, 10]),
+            ]
+        )
+        assert materials.find_subdomain_from_x_coordinate(x) == expected
+
+
 def test_material_with_multiple_ids_solubility():
     """Tests the function find_material_from_id() for cases with several ids
     per material
@@ -224,8 +293,9 @@ def test_material_with_multiple_ids_solubility():
     mesh = UnitIntervalMesh(10)
     vm = MeshFunction("size_t", mesh, 1, 1)
     my_mats.create_properties(vm, T=Constant(300))
-    V = FunctionSpace(mesh, "P", 1)
-    interpolate(my_mats.D, V)
+    V = FunctionSpace(mesh, "DG", 0)
+    D = project(my_mats.D, V)
+    assert D(0.5) == pytest.approx(1 * np.exp(-1 / F.k_B / 300))
 
 
 def test_create_properties():
@@ -233,7 +303,7 @@ def test_create_properties():
     Test the function create_properties()
     """
     mesh = UnitIntervalMesh(10)
-    DG_1 = FunctionSpace(mesh, "DG", 1)
+    DG_0 = FunctionSpace(mesh, "DG", 0)
     mat_1 = F.Material(
         1,
         D_0=1,
@@ -266,20 +336,70 @@ def test_create_properties():
             mf[cell] = 2
     T = Expression("1", degree=1)
     materials.create_properties(mf, T)
-    D = interpolate(materials.D, DG_1)
-    thermal_cond = interpolate(materials.thermal_cond, DG_1)
-    cp = interpolate(materials.heat_capacity, DG_1)
-    rho = interpolate(materials.density, DG_1)
-    Q = interpolate(materials.Q, DG_1)
-    S = interpolate(materials.S, DG_1)
+    D = project(materials.D, DG_0)
+    thermal_cond = project(materials.thermal_cond, DG_0)
+    cp = project(materials.heat_capacity, DG_0)
+    rho = project(materials.density, DG_0)
+    Q = project(materials.Q, DG_0)
+    S = project(materials.S, DG_0)
 
     for cell in cells(mesh):
-        assert D(cell.midpoint().x()) == mf[cell]
-        assert thermal_cond(cell.midpoint().x()) == mf[cell] + 3
-        assert cp(cell.midpoint().x()) == mf[cell] + 4
-        assert rho(cell.midpoint().x()) == mf[cell] + 5
-        assert Q(cell.midpoint().x()) == mf[cell] + 10
-        assert S(cell.midpoint().x()) == mf[cell] + 6
+        x = cell.midpoint().x()
+        assert D(x) == pytest.approx(mf[cell])
+        assert thermal_cond(x) == pytest.approx(mf[cell] + 3)
+        assert cp(x) == pytest.approx(mf[cell] + 4)
+        assert rho(x) == pytest.approx(mf[cell] + 5)
+        assert Q(x) == pytest.approx(mf[cell] + 10)
+        assert S(x) == pytest.approx(mf[cell] + 6)
+
+
+def test_create_properties_function_of_temperature():
+    """
+    Test the function create_properties() with thermal properties that are
+    functions of temperature in some materials
+    """
+    mesh = UnitIntervalMesh(10)
+    DG_0 = FunctionSpace(mesh, "DG", 0)
+    mat_1 = F.Material(
+        1,
+        D_0=1,
+        E_D=0.1,
+        thermal_cond=lambda T: 2 * T,
+        heat_capacity=5,
+        rho=lambda T: T + 1,
+    )
+    mat_2 = F.Material(
+        [2, 3],
+        D_0=2,
+        E_D=0.2,
+        thermal_cond=5,
+        heat_capacity=lambda T: 3 * T,
+        rho=7,
+    )
+    materials = F.Materials([mat_1, mat_2])
+    mf = MeshFunction("size_t", mesh, 1, 0)
+    for cell in cells(mesh):
+        x = cell.midpoint().x()
+        mf[cell] = 1 if x < 0.3 else 2 if x < 0.6 else 3
+    T = Constant(400)
+    materials.create_properties(mf, T)
+    D = project(materials.D, DG_0)
+    thermal_cond = project(materials.thermal_cond, DG_0)
+    cp = project(materials.heat_capacity, DG_0)
+    rho = project(materials.density, DG_0)
+
+    for cell in cells(mesh):
+        x = cell.midpoint().x()
+        if mf[cell] == 1:
+            assert D(x) == pytest.approx(np.exp(-0.1 / F.k_B / 400))
+            assert thermal_cond(x) == pytest.approx(800)
+            assert cp(x) == pytest.approx(5)
+            assert rho(x) == pytest.approx(401)
+        else:
+            assert D(x) == pytest.approx(2 * np.exp(-0.2 / F.k_B / 400))
+            assert thermal_cond(x) == pytest.approx(5)
+            assert cp(x) == pytest.approx(1200)
+            assert rho(x) == pytest.approx(7)
 
 
 def test_E_S_without_S_0():
@@ -30,7 +30,10 @@ def test_mobile_create_diffusion_form():
     v = my_mobile.test_function
     Index._globalcount = 8
     expected_form = f.dot(
-        mat.D_0 * f.exp(-mat.E_D / festim.k_B / T.T) * f.grad(c_0), f.grad(v)
+        festim.parameter_as_constant(mat, "D_0")
+        * f.exp(-festim.parameter_as_constant(mat, "E_D") / festim.k_B / T.T)
+        * f.grad(c_0),
+        f.grad(v),
     ) * dx(1)
     assert my_mobile.F.equals(expected_form)
     assert my_mobile.F_diffusion.equals(expected_form)
@@ -166,7 +169,11 @@ class TestCreateDiffusionForm:
         # test
         Index._globalcount = 8
         v = my_mobile.test_function
-        D = self.mat1.D_0 * f.exp(-self.mat1.E_D / festim.k_B / self.my_temp.T)
+        D = festim.parameter_as_constant(self.mat1, "D_0") * f.exp(
+            -festim.parameter_as_constant(self.mat1, "E_D")
+            / festim.k_B
+            / self.my_temp.T
+        )
         c_0 = my_mobile.solution
         c_0_n = my_mobile.previous_solution
         expected_form = ((c_0 - c_0_n) / self.dt.value) * v * self.my_mesh.dx(1)
@@ -175,8 +182,12 @@ class TestCreateDiffusionForm:
         for trap in my_traps:
             form_trapping_expected += (
                 (
-                    -trap.k_0
-                    * f.exp(-trap.E_k / festim.k_B / self.my_temp.T)
+                    -festim.parameter_as_constant(trap, "k_0")
+                    * f.exp(
+                        -festim.parameter_as_constant(trap, "E_k")
+                        / festim.k_B
+                        / self.my_temp.T
+                    )
                     * c_0
                     * (trap.density[0] - trap.solution)
                 )
@@ -184,8 +195,12 @@ class TestCreateDiffusionForm:
                 * self.my_mesh.dx(1)
             )
             form_trapping_expected += (
-                trap.p_0
-                * f.exp(-trap.E_p / festim.k_B / self.my_temp.T)
+                festim.parameter_as_constant(trap, "p_0")
+                * f.exp(
+                    -festim.parameter_as_constant(trap, "E_p")
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * trap.solution
                 * v
                 * self.my_mesh.dx(1)
@@ -223,8 +238,16 @@ class TestCreateDiffusionForm:
         # test
         Index._globalcount = 8
         v = my_mobile.test_function
-        D1 = self.mat1.D_0 * f.exp(-self.mat1.E_D / festim.k_B / self.my_temp.T)
-        D2 = self.mat2.D_0 * f.exp(-self.mat2.E_D / festim.k_B / self.my_temp.T)
+        D1 = festim.parameter_as_constant(self.mat1, "D_0") * f.exp(
+            -festim.parameter_as_constant(self.mat1, "E_D")
+            / festim.k_B
+            / self.my_temp.T
+        )
+        D2 = festim.parameter_as_constant(self.mat2, "D_0") * f.exp(
+            -festim.parameter_as_constant(self.mat2, "E_D")
+            / festim.k_B
+            / self.my_temp.T
+        )
         c_0 = my_mobile.solution
         c_0_n = my_mobile.previous_solution
         expected_form = ((c_0 - c_0_n) / self.dt.value) * v * self.my_mesh.dx(1)
@@ -235,8 +258,12 @@ class TestCreateDiffusionForm:
         for i in range(2):
             form_trapping_expected += (
                 (
-                    -trap1.k_0[i]
-                    * f.exp(-trap1.E_k[i] / festim.k_B / self.my_temp.T)
+                    -festim.parameter_as_constant(trap1, "k_0", i)
+                    * f.exp(
+                        -festim.parameter_as_constant(trap1, "E_k", i)
+                        / festim.k_B
+                        / self.my_temp.T
+                    )
                     * c_0
                     * (trap1.density[i] - trap1.solution)
                 )
@@ -244,8 +271,12 @@ class TestCreateDiffusionForm:
                 * self.my_mesh.dx(i + 1)
             )
             form_trapping_expected += (
-                trap1.p_0[i]
-                * f.exp(-trap1.E_p[i] / festim.k_B / self.my_temp.T)
+                festim.parameter_as_constant(trap1, "p_0", i)
+                * f.exp(
+                    -festim.parameter_as_constant(trap1, "E_p", i)
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * trap1.solution
                 * v
                 * self.my_mesh.dx(i + 1)
@@ -0,0 +1,70 @@
+import festim
+import pytest
+import numpy as np
+
+
+class TestSolveReactions:
+    @pytest.fixture
+    def my_solver(self):
+        my_problem = festim.HTransportProblem(
+            festim.Mobile(),
+            festim.Traps([]),
+            festim.Temperature(300),
+            festim.Settings(absolute_tolerance=1e10, relative_tolerance=1e-12),
+            [],
+        )
+        return festim.OperatorSplittingSolver(my_problem)
+
+    @pytest.fixture
+    def reaction_data(self):
+        c_m_0 = np.array([0.0, 1.0, 2.0, 10.0])
+        c_t_0 = np.array([[0.0, 0.5, 1.0, 0.2], [0.0, 0.0, 0.3, 0.1]])
+        k = np.array([[1.0, 2.0, 3.0, 0.0], [10.0, 10.0, 10.0, 10.0]])
+        n = np.array([[1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 1.0, 1.0]])
+        p = np.array([[0.1, 0.2, 0.3, 0.0], [5.0, 5.0, 5.0, 5.0]])
+        return c_m_0, c_t_0, k, k * n, p
+
+    def test_hydrogen_is_conserved(self, my_solver, reaction_data):
+        c_m_0, c_t_0, k, kn, p = reaction_data
+        c_m, c_t, converged = my_solver.solve_reactions(c_m_0, c_t_0, k, kn, p, dt=0.5)
+        assert converged
+        assert np.allclose(c_m + c_t.sum(axis=0), c_m_0 + c_t_0.sum(axis=0))
+
+    def test_implicit_euler_is_satisfied(self, my_solver, reaction_data):
+        c_m_0, c_t_0, k, kn, p = reaction_data
+        dt = 0.5
+        c_m, c_t, converged = my_solver.solve_reactions(c_m_0, c_t_0, k, kn, p, dt)
+        assert converged
+        expected = c_t_0 + dt * (kn * c_m - k * c_m * c_t - p * c_t)
+        assert np.allclose(c_t, expected)
+
+    def test_large_time_step_gives_equilibrium(self, my_solver, reaction_data):
+        c_m_0, c_t_0, k, kn, p = reaction_data
+        c_m, c_t, converged = my_solver.solve_reactions(c_m_0, c_t_0, k, kn, p, dt=1e12)
+        assert converged
+        # k c_m (n - c_t) = p c_t
+        assert np.allclose(kn * c_m - k * c_m * c_t, p * c_t, atol=1e-8)
+
+    def test_large_time_step_on_stiff_traps(self, my_solver):
+        c_m_0 = np.array([1.0, 5.0, 0.1])
+        c_t_0 = np.array([[0.0, 0.5, 2.0], [0.2, 0.0, 1.0]])
+        k = np.array([[1e3, 1e4, 1e3], [1e4, 1e3, 1e5]])
+        n = np.array([[2.0, 1.0, 3.0], [1.0, 4.0, 2.0]])
+        p = np.array([[1e2, 1e3, 1e1], [1e3, 1e2, 1e4]])
+        dt = 10
+
+        c_m, c_t, converged = my_solver.solve_reactions(c_m_0, c_t_0, k, k * n, p, dt)
+        assert converged
+        assert np.all(c_m >= 0)
+
+        # reference: many small time steps
+        c_m_ref, c_t_ref = c_m_0, c_t_0
+        nb_steps = 1000
+        for _ in range(nb_steps):
+            c_m_ref, c_t_ref, converged = my_solver.solve_reactions(
+                c_m_ref, c_t_ref, k, k * n, p, dt / nb_steps
+            )
+            assert converged
+        # the implicit Euler step is within 1/(1 + dt*k*c_m) of the reference
+        assert np.allclose(c_m, c_m_ref, rtol=1e-3)
+        assert np.allclose(c_t, c_t_ref, rtol=1e-3)
@@ -0,0 +1,13 @@
+import festim
+import pytest
+
+
+def test_DeprecationWarning_update_jacobian():
+    """A temporary test to check DeprecationWarning in festim.Settings"""
+
+    with pytest.deprecated_call():
+        festim.Settings(None, None, update_jacobian=False)
+
+    my_settings = festim.Settings(None, None)
+    with pytest.deprecated_call():
+        my_settings.update_jacobian = False
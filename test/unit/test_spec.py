@@ -0,0 +1,118 @@
+import festim
+import fenics as f
+import numpy as np
+import pickle
+import pytest
+
+
+def thermal_cond_function(T):
+    return 3 + 0.1 * T
+
+
+def make_model():
+    mat1 = festim.Material(1, D_0=1, E_D=0.1, borders=[0, 1], name="mat1")
+    mat2 = festim.Material(
+        2, D_0=2, E_D=0.2, borders=[1, 2], thermal_cond=thermal_cond_function
+    )
+    trap = festim.Trap(
+        k_0=[1, 2],
+        E_k=[1, 2],
+        p_0=[3, 4],
+        E_p=[3, 4],
+        materials=[mat1, mat2],
+        density=1 + festim.x,
+    )
+    return festim.Simulation(
+        mesh=festim.MeshFromVertices(np.linspace(0, 2, num=21)),
+        materials=[mat1, mat2],
+        traps=[trap],
+        boundary_conditions=[
+            festim.DirichletBC(surfaces=[1], value=1 + festim.t, field=0),
+            festim.RecombinationFlux(Kr_0=2, E_Kr=0.1, order=2, surfaces=2),
+        ],
+        sources=[festim.Source(1e10, volume=1, field=0)],
+        temperature=300,
+        settings=festim.Settings(1e-10, 1e-10, final_time=10),
+        dt=festim.Stepsize(1, stepsize_change_ratio=1.1, milestones=[5]),
+        exports=[
+            festim.DerivedQuantities(
+                [festim.TotalVolume("retention", volume=1)], filename="out.csv"
+            ),
+            festim.TrapDensityXDMF(trap=trap, filename="density.xdmf"),
+        ],
+    )
+
+
+def test_round_trip():
+    spec = festim.ModelSpec.from_simulation(make_model())
+    my_model = spec.to_simulation()
+
+    assert festim.ModelSpec.from_simulation(my_model) == spec
+    assert hash(festim.ModelSpec.from_simulation(my_model)) == hash(spec)
+    assert my_model.materials[0].borders == [0, 1]
+    assert my_model.materials[1].thermal_cond is thermal_cond_function
+    assert my_model.dt.adaptive_stepsize["stepsize_change_ratio"] == 1.1
+    assert my_model.T.value == 300
+
+
+def test_references_are_kept():
+    my_model = festim.ModelSpec.from_simulation(make_model()).to_simulation()
+
+    trap = my_model.traps[0]
+    assert trap.materials[0] is my_model.materials[0]
+    assert trap.materials[1] is my_model.materials[1]
+    assert my_model.exports[1].trap is trap
+
+
+def test_pickle():
+    spec = festim.ModelSpec.from_simulation(make_model())
+    assert pickle.loads(pickle.dumps(spec)) == spec
+
+
+def test_same_models_have_same_specs():
+    spec_1 = festim.ModelSpec.from_simulation(make_model())
+    spec_2 = festim.ModelSpec.from_simulation(make_model())
+    assert spec_1 == spec_2
+    assert len({spec_1, spec_2}) == 1
+
+
+def test_modified_parameters_are_in_spec():
+    my_model = make_model()
+    spec = festim.ModelSpec.from_simulation(my_model)
+    festim.set_parameter(my_model.materials[0], "D_0", 5)
+    my_model.settings.final_time = 20
+
+    modified_spec = festim.ModelSpec.from_simulation(my_model)
+    assert modified_spec != spec
+    modified_model = modified_spec.to_simulation()
+    assert modified_model.materials[0].D_0 == 5
+    assert modified_model.settings.final_time == 20
+
+
+def test_modified_function_changes_digest():
+    """Checks that the digest depends on the body of a function, not only on
+    its name, so that editing a function invalidates cached results"""
+    my_model = make_model()
+    digest = festim.ModelSpec.from_simulation(my_model).digest()
+
+    namespace = {"__name__": __name__}
+    exec("def thermal_cond_function(T):\n    return 4 + 0.1 * T", namespace)
+    my_model.materials[1].thermal_cond = namespace["thermal_cond_function"]
+    assert festim.ModelSpec.from_simulation(my_model).digest() != digest
+
+    my_model.materials[1].thermal_cond = thermal_cond_function
+    assert festim.ModelSpec.from_simulation(my_model).digest() == digest
+
+
+def test_lambda_cannot_be_in_spec():
+    my_model = make_model()
+    my_model.materials[0].thermal_cond = lambda T: 2 * T
+    with pytest.raises(TypeError, match="cannot be pickled"):
+        festim.ModelSpec.from_simulation(my_model)
+
+
+def test_fenics_objects_cannot_be_in_spec():
+    my_model = make_model()
+    my_model.mesh = festim.Mesh(mesh=f.UnitIntervalMesh(10))
+    with pytest.raises(TypeError, match="cannot be part of a model specification"):
+        festim.ModelSpec.from_simulation(my_model)
@@ -130,3 +130,107 @@ def test_hit_stepsize_max_with_t_stop(time):
     )
     max_stepsize = lambda t: 1 if t >= 1 else None
     assert my_stepsize.adaptive_stepsize["max_stepsize"](time) == max_stepsize(time)
+
+
+def test_wrong_time_scheme():
+    with pytest.raises(ValueError, match="accepted values for time_scheme"):
+        festim.Stepsize(initial_value=1, time_scheme="coucou")
+
+
+def test_bdf2_first_step_is_backward_euler():
+    my_stepsize = festim.Stepsize(initial_value=2, time_scheme="BDF2")
+    my_stepsize.update_time_scheme()
+    a_0, a_2 = my_stepsize.bdf2_coefficients
+    assert float(a_0) == 1
+    assert float(a_2) == 0
+
+
+@pytest.mark.parametrize("ratio", [0.5, 1, 3])
+def test_bdf2_coefficients(ratio):
+    """Checks that the variable stepsize BDF2 coefficients differentiate
+    quadratic functions exactly"""
+    my_stepsize = festim.Stepsize(initial_value=ratio, time_scheme="BDF2")
+    my_stepsize.previous_value = 1
+    assert my_stepsize.update_time_scheme()
+    a_0, a_2 = [float(a) for a in my_stepsize.bdf2_coefficients]
+
+    u = lambda t: 3 * t**2 - t + 2
+    du = lambda t: 6 * t - 1
+    t_nm1, t_n = 0, 1
+    t = t_n + ratio
+    computed = (a_0 * (u(t) - u(t_n)) - a_2 * (u(t_n) - u(t_nm1))) / ratio
+    assert np.isclose(computed, du(t))
+
+
+def test_update_time_scheme_backward_euler():
+    my_stepsize = festim.Stepsize(initial_value=1)
+    my_stepsize.previous_value = 2
+    assert not my_stepsize.update_time_scheme()
+
+
+class TestAdaptToError:
+    @pytest.fixture
+    def my_stepsize(self):
+        return festim.Stepsize(initial_value=1, rtol=1e-3, dt_min=1e-3)
+
+    def test_small_error_increases_stepsize(self, my_stepsize):
+        accepted = my_stepsize.adapt_to_error(t=1, error=0.01)
+        assert accepted
+        assert float(my_stepsize.value) > 1
+
+    def test_large_error_is_rejected(self, my_stepsize):
+        accepted = my_stepsize.adapt_to_error(t=1, error=10)
+        assert not accepted
+        assert float(my_stepsize.value) < 1
+
+    def test_stepsize_change_is_bounded(self, my_stepsize):
+        my_stepsize.adapt_to_error(t=1, error=1e-20)
+        assert np.isclose(float(my_stepsize.value), my_stepsize.max_change_ratio)
+        my_stepsize.adapt_to_error(t=1, error=1e20)
+        assert np.isclose(
+            float(my_stepsize.value),
+            my_stepsize.max_change_ratio * my_stepsize.min_change_ratio,
+        )
+
+    def test_no_estimate_keeps_stepsize(self, my_stepsize):
+        assert my_stepsize.adapt_to_error(t=1, error=None)
+        assert float(my_stepsize.value) == 1
+
+    def test_not_converged_halves_stepsize(self, my_stepsize):
+        assert not my_stepsize.adapt_to_error(t=1, error=None, converged=False)
+        assert float(my_stepsize.value) == 0.5
+
+    def test_stepsize_reaches_minimal_size(self, my_stepsize):
+        with pytest.raises(ValueError, match="stepsize reached minimal value"):
+            my_stepsize.adapt_to_error(t=1, error=1e20)
+            my_stepsize.adapt_to_error(t=1, error=1e20)
+            my_stepsize.adapt_to_error(t=1, error=1e20)
+            my_stepsize.adapt_to_error(t=1, error=1e20)
+            my_stepsize.adapt_to_error(t=1, error=1e20)
+
+    def test_milestones_are_hit(self):
+        my_stepsize = festim.Stepsize(initial_value=1, rtol=1e-3, milestones=[2.5])
+        my_stepsize.adapt_to_error(t=2, error=0.01)
+        assert np.isclose(float(my_stepsize.value), 0.5)
+
+    def test_max_stepsize(self):
+        my_stepsize = festim.Stepsize(initial_value=1, rtol=1e-3, max_stepsize=1.2)
+        my_stepsize.adapt_to_error(t=2, error=0.01)
+        assert np.isclose(float(my_stepsize.value), 1.2)
+
+
+def test_reset_keeps_the_constant():
+    my_stepsize = festim.Stepsize(initial_value=2, time_scheme="BDF2", rtol=1e-3)
+    value = my_stepsize.value
+    my_stepsize.value.assign(10)
+    my_stepsize.previous_value = 5
+    my_stepsize.update_time_scheme()
+    my_stepsize.error_control["previous_error"] = 0.5
+
+    my_stepsize.reset()
+
+    assert my_stepsize.value is value
+    assert float(my_stepsize.value) == 2
+    assert my_stepsize.previous_value is None
+    assert [float(a) for a in my_stepsize.bdf2_coefficients] == [1, 0]
+    assert my_stepsize.error_control["previous_error"] is None
@@ -0,0 +1,44 @@
+import festim
+import numpy as np
+import pytest
+
+
+def test_sweep_samples_from_grid():
+    samples = festim.sweep_samples({"D_0": [1, 2], "T": [300, 400, 500]})
+    assert len(samples) == 6
+    assert samples[0] == {"D_0": 1, "T": 300}
+    assert samples[-1] == {"D_0": 2, "T": 500}
+
+
+def test_sweep_samples_from_list():
+    samples = [{"D_0": 1, "T": 300}, {"D_0": 3, "T": 350}]
+    assert festim.sweep_samples(samples) == samples
+
+
+def test_sweep_results_table():
+    series = [
+        {"flux": np.array([[1, 10], [2, 20]]), "inventory": np.array([[2, 5]])},
+        {"flux": np.array([[1, 30], [2, 40]])},
+    ]
+    results = festim.SweepResults([{"D_0": 1}, {"D_0": 2}], series)
+    table = results.table()
+
+    assert len(results) == 2
+    assert results.titles == ["flux", "inventory"]
+    assert list(table["D_0"]) == [1, 2]
+    assert list(table["flux"]) == [20, 40]
+    assert table["inventory"][0] == 5
+    assert np.isnan(table["inventory"][1])
+
+
+def test_sweep_results_table_with_non_numerical_parameters():
+    series = [{"flux": np.array([[1, 10]])}, {"flux": np.array([[1, 30]])}]
+    results = festim.SweepResults(
+        [{"D_0": 1, "material": "W"}, {"D_0": 2, "material": "Cu"}], series
+    )
+    table = results.table()
+
+    assert table.dtype["D_0"].kind == "i"
+    assert table.dtype["material"] == object
+    assert list(table["material"]) == ["W", "Cu"]
+    assert list(table["flux"]) == [10, 30]
@@ -1,6 +1,7 @@
 import fenics
 import festim
 from ufl.core.multiindex import Index
+from ufl.algorithms import extract_coefficients
 from pathlib import Path
 import pytest
 import numpy as np
@@ -25,19 +26,25 @@ def test_formulation_heat_transfer_2_ids_per_mat():
     my_temp.create_functions(my_mats, my_mesh, dt=festim.Stepsize(initial_value=2))
 
 
-def test_formulation_heat_transfer():
-    """
-    Test function define_variational_problem_heat_transfers
-    """
+def thermal_cond(a):
+    return a**2
 
-    def thermal_cond(a):
-        return a**2
 
-    Index._globalcount = 8
+def create_heat_transfer_problem(flux_value):
+    """Creates a transient festim.HeatTransferProblem on a unit interval with
+    a Dirichlet BC on surface 1, a FluxBC on surface 2 and a source
+
+    Args:
+        flux_value (sympy.Expr or float): the value of the FluxBC
+
+    Returns:
+        festim.HeatTransferProblem, festim.Mesh, festim.Material,
+            festim.FluxBC, festim.Stepsize: the problem, its mesh, material,
+            FluxBC and stepsize
+    """
     u = 1 + 2 * festim.x**2
     dt = festim.Stepsize(initial_value=2)
     mesh = fenics.UnitIntervalMesh(10)
-    V = fenics.FunctionSpace(mesh, "P", 1)
 
     # create mesh functions
     surface_markers = fenics.MeshFunction("size_t", mesh, mesh.topology().dim() - 1, 0)
@@ -67,28 +74,87 @@ def test_formulation_heat_transfer():
     )
     my_mats = festim.Materials([mat1])
     bc1 = festim.DirichletBC(surfaces=[1], value=u, field="T")
-    bc2 = festim.FluxBC(surfaces=[2], value=2, field="T")
+    bc2 = festim.FluxBC(surfaces=[2], value=flux_value, field="T")
 
     my_temp = festim.HeatTransferProblem(transient=True, initial_condition=0)
     my_temp.boundary_conditions = [bc1, bc2]
     my_temp.sources = [festim.Source(-4, volume=[1], field="T")]
     my_temp.create_functions(my_mats, my_mesh, dt=dt)
+    return my_temp, my_mesh, mat1, bc2, dt
+
+
+def test_formulation_heat_transfer():
+    """
+    Test function define_variational_problem_heat_transfers. The flux
+    doesn't depend on time so it is interpolated once (frozen) in the form
+    """
+    Index._globalcount = 8
+    my_temp, my_mesh, mat1, bc2, dt = create_heat_transfer_problem(flux_value=2)
+
+    T = my_temp.T
+    T_n = my_temp.T_n
+    v = my_temp.v_T
+    dx = my_mesh.dx
+    ds = my_mesh.ds
+
+    F = my_temp.F
+    expressions = my_temp.sub_expressions
+    Index._globalcount = 8
+
+    # the frozen flux is the only function of the form besides T and T_n
+    frozen = [
+        c
+        for c in extract_coefficients(F)
+        if isinstance(c, fenics.Function) and c is not T and c is not T_n
+    ]
+    assert len(frozen) == 1
+    assert np.allclose(frozen[0].vector()[:], 2)
+    # and it is not updated at each time step
+    assert not any(expression is bc2.form for expression in expressions)
+
+    source = expressions[0]
+    rho = festim.parameter_as_constant(mat1, "rho")
+    cp = festim.parameter_as_constant(mat1, "heat_capacity")
+    expected_form = rho * cp * ((T - T_n) / dt.value) * v * dx(1) + fenics.dot(
+        thermal_cond(T) * fenics.grad(T), fenics.grad(v)
+    ) * dx(1)
+    expected_form += -source * v * dx(1)
+
+    expected_form += -frozen[0] * v * ds(2)
+    assert expected_form.equals(F)
+
+
+def test_formulation_heat_transfer_time_dependent_flux():
+    """
+    Test function define_variational_problem_heat_transfers with a flux
+    depending on time, which is kept in the form and updated at each time
+    step
+    """
+    Index._globalcount = 8
+    my_temp, my_mesh, mat1, bc2, dt = create_heat_transfer_problem(
+        flux_value=2 + festim.t
+    )
 
     T = my_temp.T
     T_n = my_temp.T_n
     v = my_temp.v_T
+    dx = my_mesh.dx
+    ds = my_mesh.ds
 
     F = my_temp.F
     expressions = my_temp.sub_expressions
     Index._globalcount = 8
 
     source = expressions[0]
-    expected_form = 5 * 4 * (T - T_n) / dt.value * v * dx(1) + fenics.dot(
+    rho = festim.parameter_as_constant(mat1, "rho")
+    cp = festim.parameter_as_constant(mat1, "heat_capacity")
+    expected_form = rho * cp * ((T - T_n) / dt.value) * v * dx(1) + fenics.dot(
         thermal_cond(T) * fenics.grad(T), fenics.grad(v)
     ) * dx(1)
     expected_form += -source * v * dx(1)
 
     neumann_flux = expressions[1]
+    assert neumann_flux is bc2.form
     expected_form += -neumann_flux * v * ds(2)
     assert expected_form.equals(F)
 
@@ -67,9 +67,15 @@ class TestCreateDiffusionForm:
         # test
         Index._globalcount = 8
         v = my_theta.test_function
-        D = mat1.D_0 * f.exp(-mat1.E_D / festim.k_B / self.my_temp.T)
-        S = mat1.S_0 * f.exp(-mat1.E_S / festim.k_B / self.my_temp.T)
-        S_n = mat1.S_0 * f.exp(-mat1.E_S / festim.k_B / self.my_temp.T_n)
+        D = festim.parameter_as_constant(mat1, "D_0") * f.exp(
+            -festim.parameter_as_constant(mat1, "E_D") / festim.k_B / self.my_temp.T
+        )
+        S = festim.parameter_as_constant(mat1, "S_0") * f.exp(
+            -festim.parameter_as_constant(mat1, "E_S") / festim.k_B / self.my_temp.T
+        )
+        S_n = festim.parameter_as_constant(mat1, "S_0") * f.exp(
+            -festim.parameter_as_constant(mat1, "E_S") / festim.k_B / self.my_temp.T_n
+        )
         c_0 = my_theta.solution * S
         c_0_n = my_theta.previous_solution * S_n
         expected_form = ((c_0 - c_0_n) / self.dt.value) * v * self.my_mesh.dx(1)
@@ -100,9 +106,15 @@ class TestCreateDiffusionForm:
         # test
         Index._globalcount = 8
         v = my_theta.test_function
-        D = mat2.D_0 * f.exp(-mat2.E_D / festim.k_B / self.my_temp.T)
-        K_H = mat2.S_0 * f.exp(-mat2.E_S / festim.k_B / self.my_temp.T)
-        K_H_n = mat2.S_0 * f.exp(-mat2.E_S / festim.k_B / self.my_temp.T_n)
+        D = festim.parameter_as_constant(mat2, "D_0") * f.exp(
+            -festim.parameter_as_constant(mat2, "E_D") / festim.k_B / self.my_temp.T
+        )
+        K_H = festim.parameter_as_constant(mat2, "S_0") * f.exp(
+            -festim.parameter_as_constant(mat2, "E_S") / festim.k_B / self.my_temp.T
+        )
+        K_H_n = festim.parameter_as_constant(mat2, "S_0") * f.exp(
+            -festim.parameter_as_constant(mat2, "E_S") / festim.k_B / self.my_temp.T_n
+        )
         c_0 = my_theta.solution**2 * K_H
         c_0_n = my_theta.previous_solution**2 * K_H_n
         expected_form = ((c_0 - c_0_n) / self.dt.value) * v * self.my_mesh.dx(2)
@@ -93,16 +93,24 @@ class TestCreateTrappingForm:
         # test
         v = my_trap.test_function
         expected_form = (
-            -my_trap.k_0
-            * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
+            -festim.parameter_as_constant(my_trap, "k_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_k")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * self.my_mobile.solution
             * (my_trap.density[0] - my_trap.solution)
             * v
             * self.dx(1)
         )
         expected_form += (
-            my_trap.p_0
-            * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+            festim.parameter_as_constant(my_trap, "p_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_p")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * my_trap.solution
             * v
             * self.dx(1)
@@ -142,16 +150,24 @@ class TestCreateTrappingForm:
             * self.dx
         )
         expected_form += (
-            -my_trap.k_0
-            * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
+            -festim.parameter_as_constant(my_trap, "k_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_k")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * self.my_mobile.solution
             * (my_trap.density[0] - my_trap.solution)
             * v
             * self.dx(1)
         )
         expected_form += (
-            my_trap.p_0
-            * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+            festim.parameter_as_constant(my_trap, "p_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_p")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * my_trap.solution
             * v
             * self.dx(1)
@@ -187,19 +203,31 @@ class TestCreateTrappingForm:
 
         # test
         v = my_trap.test_function
-        S = self.mat1.S_0 * f.exp(-self.mat1.E_S / festim.k_B / self.my_temp.T)
+        S = festim.parameter_as_constant(self.mat1, "S_0") * f.exp(
+            -festim.parameter_as_constant(self.mat1, "E_S")
+            / festim.k_B
+            / self.my_temp.T
+        )
         c_0 = mobile.solution * S
         expected_form = (
-            -my_trap.k_0
-            * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
+            -festim.parameter_as_constant(my_trap, "k_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_k")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * c_0
             * (my_trap.density[0] - my_trap.solution)
             * v
             * self.dx(1)
         )
         expected_form += (
-            my_trap.p_0
-            * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+            festim.parameter_as_constant(my_trap, "p_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_p")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * my_trap.solution
             * v
             * self.dx(1)
@@ -241,16 +269,24 @@ class TestCreateTrappingForm:
         expected_form = 0
         for mat in my_trap.materials:
             expected_form += (
-                -my_trap.k_0
-                * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
+                -festim.parameter_as_constant(my_trap, "k_0")
+                * f.exp(
+                    -festim.parameter_as_constant(my_trap, "E_k")
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * self.my_mobile.solution
                 * (my_trap.density[0] - my_trap.solution)
                 * v
                 * self.dx(mat.id)
             )
             expected_form += (
-                my_trap.p_0
-                * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+                festim.parameter_as_constant(my_trap, "p_0")
+                * f.exp(
+                    -festim.parameter_as_constant(my_trap, "E_p")
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * my_trap.solution
                 * v
                 * self.dx(mat.id)
@@ -289,16 +325,24 @@ class TestCreateTrappingForm:
         expected_form = 0
         for i in range(2):
             expected_form += (
-                -my_trap.k_0[i]
-                * f.exp(-my_trap.E_k[i] / festim.k_B / self.my_temp.T)
+                -festim.parameter_as_constant(my_trap, "k_0", i)
+                * f.exp(
+                    -festim.parameter_as_constant(my_trap, "E_k", i)
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * self.my_mobile.solution
                 * (my_trap.density[i] - my_trap.solution)
                 * v
                 * self.dx(my_trap.materials[i].id)
             )
             expected_form += (
-                my_trap.p_0[i]
-                * f.exp(-my_trap.E_p[i] / festim.k_B / self.my_temp.T)
+                festim.parameter_as_constant(my_trap, "p_0", i)
+                * f.exp(
+                    -festim.parameter_as_constant(my_trap, "E_p", i)
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * my_trap.solution
                 * v
                 * self.dx(my_trap.materials[i].id)
@@ -331,16 +375,24 @@ class TestCreateTrappingForm:
         v = my_trap.test_function
         expected_form = 0
         expected_form += (
-            -my_trap.k_0
-            * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
+            -festim.parameter_as_constant(my_trap, "k_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_k")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * self.my_mobile.solution
             * (my_trap.density[0] - my_trap.solution)
             * v
             * self.dx(self.mat1.id)
         )
         expected_form += (
-            my_trap.p_0
-            * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+            festim.parameter_as_constant(my_trap, "p_0")
+            * f.exp(
+                -festim.parameter_as_constant(my_trap, "E_p")
+                / festim.k_B
+                / self.my_temp.T
+            )
             * my_trap.solution
             * v
             * self.dx(self.mat1.id)
@@ -370,8 +422,12 @@ class TestCreateTrappingForm:
 
         # test
         v = my_trap.test_function
-        k = my_trap.k_0 * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
-        p = my_trap.p_0 * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+        k = festim.parameter_as_constant(my_trap, "k_0") * f.exp(
+            -festim.parameter_as_constant(my_trap, "E_k") / festim.k_B / self.my_temp.T
+        )
+        p = festim.parameter_as_constant(my_trap, "p_0") * f.exp(
+            -festim.parameter_as_constant(my_trap, "E_p") / festim.k_B / self.my_temp.T
+        )
         expected_form = (
             -k
             * self.my_mobile.solution
@@ -414,8 +470,12 @@ class TestCreateTrappingForm:
 
         # test
         v = my_trap.test_function
-        k = my_trap.k_0 * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
-        p = my_trap.p_0 * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+        k = festim.parameter_as_constant(my_trap, "k_0") * f.exp(
+            -festim.parameter_as_constant(my_trap, "E_k") / festim.k_B / self.my_temp.T
+        )
+        p = festim.parameter_as_constant(my_trap, "p_0") * f.exp(
+            -festim.parameter_as_constant(my_trap, "E_p") / festim.k_B / self.my_temp.T
+        )
         expected_form = (
             -k
             * self.my_mobile.solution
@@ -448,8 +508,12 @@ class TestCreateTrappingForm:
 
         # test
         v = my_trap.test_function
-        k = my_trap.k_0 * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
-        p = my_trap.p_0 * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+        k = festim.parameter_as_constant(my_trap, "k_0") * f.exp(
+            -festim.parameter_as_constant(my_trap, "E_k") / festim.k_B / self.my_temp.T
+        )
+        p = festim.parameter_as_constant(my_trap, "p_0") * f.exp(
+            -festim.parameter_as_constant(my_trap, "E_p") / festim.k_B / self.my_temp.T
+        )
         expected_form = (
             -k
             * self.my_mobile.solution
@@ -488,16 +552,24 @@ class TestCreateTrappingForm:
         expected_form = 0
         for mat_id in [self.mat1.id, self.mat2.id]:
             expected_form += (
-                -my_trap.k_0
-                * f.exp(-my_trap.E_k / festim.k_B / self.my_temp.T)
+                -festim.parameter_as_constant(my_trap, "k_0")
+                * f.exp(
+                    -festim.parameter_as_constant(my_trap, "E_k")
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * self.my_mobile.solution
                 * (my_trap.density[0] - my_trap.solution)
                 * v
                 * self.dx(mat_id)
             )
             expected_form += (
-                my_trap.p_0
-                * f.exp(-my_trap.E_p / festim.k_B / self.my_temp.T)
+                festim.parameter_as_constant(my_trap, "p_0")
+                * f.exp(
+                    -festim.parameter_as_constant(my_trap, "E_p")
+                    / festim.k_B
+                    / self.my_temp.T
+                )
                 * my_trap.solution
                 * v
                 * self.dx(mat_id)